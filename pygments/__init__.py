@@ -38,8 +38,13 @@ __all__ = ['lex', 'format', 'highlight']
 def lex(code, lexer):
     """
     Lex ``code`` with ``lexer`` and return an iterable of tokens.
+
+    ``code`` can also be a file object (an object with a ``read`` method),
+    which is then lexed while it is read.
     """
     try:
+        if hasattr(code, 'read'):
+            return lexer.get_tokens_from_file(code)
         return lexer.get_tokens(code)
     except TypeError as err:
         if (isinstance(err.args[0], str) and
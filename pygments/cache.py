@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+    pygments.cache
+    ~~~~~~~~~~~~~~
+
+    A cache for the output of `highlight`, for applications that highlight
+    the same code many times.
+
+    :copyright: Copyright 2006-2017 by the Pygments team, see AUTHORS.
+    :license: BSD, see LICENSE for details.
+"""
+
+import os
+import sys
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+
+from pygments import __version__, highlight
+from pygments.util import text_type, replace_file
+
+__all__ = ['HighlightCache']
+
+
+class HighlightCache(object):
+    """
+    Keeps the output of `highlight()` for combinations of code, lexer and
+    formatter, so that highlighting the same code again returns the output
+    without lexing and formatting it.
+
+    The outputs are held in memory up to a total size of `maxsize` bytes
+    (characters for formatters without an encoding), dropping the least
+    recently used ones when it is exceeded.  If `directory` is given, outputs
+    are also stored there, one file per output, and found there by later
+    instances and processes.  Files in the directory are never removed by
+    the cache.  Since the key includes digests of the source files defining
+    the lexer, filter, formatter and style classes, outputs are only stored
+    in the directory if those files can be read.
+
+    The lexer and formatter are identified by their class, their options
+    and their filters, and the formatter additionally by its style and
+    encoding.  Lexers and formatters whose output depends on anything else,
+    or that have side effects (like `HtmlFormatter` writing a `cssfile`),
+    shouldn't be used with the cache.
+
+    .. versionadded:: 2.3
+    """
+
+    version = '%s-%d' % (__version__, sys.version_info[0])
+
+    def __init__(self, maxsize=32 * 1024 * 1024, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.size = 0
+        #: number of outputs returned from the cache
+        self.hits = 0
+        #: number of outputs that had to be produced
+        self.misses = 0
+        self._outputs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def highlight(self, code, lexer, formatter, outfile=None):
+        """
+        Like `pygments.highlight()`, but return the output from the cache if
+        the same code was highlighted with an equal lexer and formatter
+        before.
+        """
+        key = self.get_key(code, lexer, formatter)
+        persistent = _sources(lexer, formatter) is not None
+        output = self._get(key, persistent)
+        if output is None:
+            self.misses += 1
+            output = highlight(code, lexer, formatter)
+            self._put(key, output, persistent)
+        else:
+            self.hits += 1
+        if not outfile:
+            return output
+        outfile.write(output)
+
+    def get_key(self, code, lexer, formatter):
+        """Return the key under which the output is cached."""
+        if isinstance(code, text_type):
+            code = b'u' + code.encode('utf-8')
+        else:
+            code = b'b' + code
+        settings = [self.version,
+                    _describe(lexer), sorted(lexer.options.items()),
+                    [(_describe(f), sorted(f.options.items()))
+                     for f in lexer.filters],
+                    _describe(formatter), sorted(formatter.options.items()),
+                    _describe(formatter.style),
+                    sorted(formatter.style.styles.items()),
+                    formatter.encoding, _sources(lexer, formatter)]
+        digest = hashlib.sha1(repr(settings).encode('utf-8'))
+        digest.update(code)
+        return digest.hexdigest()
+
+    def clear(self):
+        """Drop all outputs held in memory."""
+        with self._lock:
+            self._outputs.clear()
+            self.size = 0
+
+    def _get(self, key, persistent):
+        with self._lock:
+            output = self._outputs.pop(key, None)
+            if output is not None:
+                self._outputs[key] = output
+                return output
+        if not persistent:
+            return None
+        output = self._read(key)
+        if output is not None:
+            self._remember(key, output)
+        return output
+
+    def _put(self, key, output, persistent):
+        self._remember(key, output)
+        if persistent:
+            self._write(key, output)
+
+    def _remember(self, key, output):
+        if len(output) > self.maxsize:
+            return
+        with self._lock:
+            if key in self._outputs:
+                return
+            self._outputs[key] = output
+            self.size += len(output)
+            while self.size > self.maxsize:
+                _, dropped = self._outputs.popitem(last=False)
+                self.size -= len(dropped)
+
+    def _filename(self, key):
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def _read(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._filename(key), 'rb') as fp:
+                data = fp.read()
+        except (IOError, OSError):
+            return None
+        if data[:1] == b'u':
+            return data[1:].decode('utf-8')
+        elif data[:1] == b'b':
+            return data[1:]
+
+    def _write(self, key, output):
+        if not self.directory:
+            return
+        if isinstance(output, text_type):
+            data = b'u' + output.encode('utf-8')
+        else:
+            data = b'b' + output
+        filename = self._filename(key)
+        tmpname = '%s.%d.tmp' % (filename, os.getpid())
+        try:
+            if not os.path.isdir(os.path.dirname(filename)):
+                os.makedirs(os.path.dirname(filename))
+            with open(tmpname, 'wb') as fp:
+                fp.write(data)
+            replace_file(tmpname, filename)
+        except (IOError, OSError):
+            pass
+
+
+def _describe(obj):
+    """Return the qualified name of the class of `obj`, or of `obj` itself
+    if it is a class."""
+    cls = obj if isinstance(obj, type) else type(obj)
+    return '%s.%s' % (cls.__module__, cls.__name__)
+
+
+_source_digests = {}
+
+
+def _source_digest(modname):
+    """Return the SHA1 digest of the source file of the module `modname`,
+    or None if it cannot be read."""
+    if modname not in _source_digests:
+        digest = None
+        try:
+            filename = inspect.getsourcefile(sys.modules[modname])
+            with open(filename, 'rb') as fp:
+                digest = hashlib.sha1(fp.read()).hexdigest()
+        except (KeyError, TypeError, IOError, OSError):
+            pass
+        _source_digests[modname] = digest
+    return _source_digests[modname]
+
+
+def _sources(lexer, formatter):
+    """Return the digests of the source files defining the classes of the
+    lexer, its filters, the formatter and its style, and their bases, or
+    None if one of them cannot be read."""
+    digests = []
+    for obj in [lexer, formatter, formatter.style] + list(lexer.filters):
+        cls = obj if isinstance(obj, type) else type(obj)
+        for base in inspect.getmro(cls):
+            if base.__module__ in ('builtins', '__builtin__'):
+                continue
+            digest = _source_digest(base.__module__)
+            if digest is None:
+                return None
+            digests.append(digest)
+    return sorted(set(digests))
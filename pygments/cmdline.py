@@ -11,17 +11,22 @@
 
 from __future__ import print_function
 
+import io
 import os
+import codecs
 import sys
 import getopt
+import multiprocessing
 from textwrap import dedent
 
 from pygments import __version__, highlight
+from pygments.lexer import LexedStream, _clock
 from pygments.util import ClassNotFound, OptionError, docstring_headline, \
-    guess_decode, guess_decode_from_terminal, terminal_encoding
+    guess_decode, guess_decode_from_terminal, guess_encoding, \
+    terminal_encoding
 from pygments.lexers import get_all_lexers, get_lexer_by_name, guess_lexer, \
     load_lexer_from_file, get_lexer_for_filename, find_lexer_class_for_filename
-from pygments.lexers.special import TextLexer
+from pygments.lexers.special import TextLexer, BinaryTokenLexer
 from pygments.formatters.latex import LatexEmbeddedLexer, LatexFormatter
 from pygments.formatters import get_all_formatters, get_formatter_by_name, \
     load_formatter_from_file, get_formatter_for_filename, find_formatter_class
@@ -31,10 +36,23 @@ from pygments.filters import get_all_filters, find_filter_class
 from pygments.styles import get_all_styles, get_style_by_name
 
 
+# size of the pieces input files are lexed in when the lexer is known before
+# reading them (the default of Lexer.get_tokens_from_file)
+STREAM_CHUNKSIZE = 262144
+
+# with -s, the output is flushed when no more input is waiting, or at the
+# latest after this many seconds
+STREAM_FLUSH_INTERVAL = 0.1
+
 USAGE = """\
 Usage: %s [-l <lexer> | -g] [-F <filter>[:<options>]] [-f <formatter>]
           [-O <options>] [-P <option=value>] [-s] [-v] [-x] [-o <outfile>] [<infile>]
 
+       %s -b [-j <jobs>] [-l <lexer>] [-g] [-F <filter>[:<options>]] [-f <formatter>]
+          [-O <options>] [-P <option=value>] [-x] -o <outdir|template> <infile> ...
+       %s --serve <address>
+       %s --connect <address> [-l <lexer> | -g] [-F <filter>[:<options>]]
+          [-f <formatter>] [-O <options>] [-P <option=value>] [-o <outfile>] [<infile>]
        %s -S <style> -f <formatter> [-a <arg>] [-O <options>] [-P <option=value>]
        %s -L [<which> ...]
        %s -N <filename>
@@ -45,9 +63,11 @@ Highlight the input file and write the result to <outfile>.
 
 If no input file is given, use stdin, if -o is not given, use stdout.
 
-If -s is passed, lexing will be done in "streaming" mode, reading and
-highlighting one line at a time.  This will only work properly with
-lexers that have no constructs spanning multiple lines!
+If -s is passed, lexing will be done in "streaming" mode, highlighting
+each line as soon as it is read.  Lexers that keep track of multi-line
+constructs with states (most lexers based on regular expressions)
+continue with the state of the previous lines; for other lexers this only
+works properly if there are no constructs spanning multiple lines!
 
 <lexer> is a lexer name (query all lexer names with -L). If -l is not
 given, the lexer is guessed from the extension of the input file name
@@ -96,11 +116,31 @@ If no specific lexer can be determined "text" is returned.
 The -H option prints detailed help for the object <name> of type <type>,
 where <type> is one of "lexer", "formatter" or "filter".
 
-The -s option processes lines one at a time until EOF, rather than
+The -s option processes lines as they come in until EOF, rather than
 waiting to process the entire file.  This only works for stdin, and
-is intended for streaming input such as you get from 'tail -f'.
+is intended for streaming input such as you get from 'tail -f'.  The
+output is flushed whenever no more input is waiting, and at least every
+0.1 seconds.
 Example usage: "tail -f sql.log | pygmentize -s -l sql"
 
+The -b option highlights many input files in one run ("batch mode").
+An input file name starting with "@" names a file listing one input file
+per line.  -o is required and gives either the output directory, in which
+files are written with the extension of the formatter appended to their
+name, or a template for the output file names with the placeholders
+%%(path)s (the input file name), %%(name)s (its last component) and
+%%(base)s (the last component without extension).  It is an error if
+two input files would be written to the same output file.  The files are
+highlighted by <jobs> worker processes, by default one per CPU.  Files
+that cannot be highlighted are reported, and don't stop the others.
+
+The --serve option starts a server that highlights code sent to it by
+"pygmentize --connect" on the same <address>, which is either host:port
+or the path of a Unix socket.  The server keeps the lexers and formatters
+it used, so that only the first request for them pays for loading them.
+With --connect, pygmentize highlights the input file like it does without,
+but lets the server do the work.
+
 The -v option prints a detailed traceback on unhandled exceptions,
 which is useful for debugging and bug reports.
 
@@ -109,6 +149,54 @@ The -V option prints the package version.
 """
 
 
+def _input_waiting(infile):
+    """Return whether more input can be read from `infile` right away,
+    False if that can't be determined."""
+    try:
+        import select
+        return bool(select.select([infile], [], [], 0)[0])
+    except Exception:
+        return False
+
+
+def _highlight_stream(infile, lexer, fmter, outfile, inencoding):
+    """
+    Highlight the lines coming from the binary file `infile` as they are
+    read, keeping the lexer state from one line to the next.
+    """
+    # read whatever is available, without waiting for a full buffer
+    read = getattr(infile, 'read1', None)
+    if read is None:
+        read = lambda size: infile.readline()
+    stream = LexedStream(lexer)
+    decode = None
+    if inencoding:
+        decode = codecs.getincrementaldecoder(inencoding)().decode
+    last_flush = _clock()
+    while True:
+        data = read(65536)
+        if decode is None and data:
+            # guess from complete lines if possible
+            _, encoding = guess_decode_from_terminal(
+                data[:data.rfind(b'\n') + 1] or data, sys.stdin)
+            decode = codecs.getincrementaldecoder(encoding)('replace').decode
+        if not data:
+            tokens = stream.feed(decode(b'', True)) if decode else []
+            tokens.extend(stream.close())
+        else:
+            tokens = stream.feed(decode(data))
+        if tokens:
+            fmter.format(tokens, outfile)
+        now = _clock()
+        if not data or now - last_flush >= STREAM_FLUSH_INTERVAL or \
+           not _input_waiting(infile):
+            if hasattr(outfile, 'flush'):
+                outfile.flush()
+            last_flush = now
+        if not data:
+            break
+
+
 def _parse_options(o_strs):
     opts = {}
     if not o_strs:
@@ -214,6 +302,332 @@ def _print_list(what):
             print("    %s" % docstring_headline(cls))
 
 
+def _get_lexer(lexername, allow_custom, options):
+    """Return the lexer selected with ``-l``."""
+    # custom lexer, located relative to user's cwd
+    if allow_custom and '.py' in lexername:
+        if ':' in lexername:
+            filename, name = lexername.rsplit(':', 1)
+            return load_lexer_from_file(filename, name, **options)
+        return load_lexer_from_file(lexername, **options)
+    return get_lexer_by_name(lexername, **options)
+
+
+def _get_formatter(fmtername, allow_custom, options):
+    """Return the formatter selected with ``-f``."""
+    # custom formatter, located relative to user's cwd
+    if allow_custom and '.py' in fmtername:
+        if ':' in fmtername:
+            filename, name = fmtername.rsplit(':', 1)
+            return load_formatter_from_file(filename, name, **options)
+        return load_formatter_from_file(fmtername, **options)
+    return get_formatter_by_name(fmtername, **options)
+
+
+class _BatchWorker(object):
+    """
+    Highlights the files of a batch.  Lexers and formatters are created
+    once and reused for all files they are needed for.
+    """
+
+    def __init__(self, settings):
+        (self.lexername, self.fmtername, self.allow_custom, self.options,
+         self.filters, self.guess) = settings
+        self.inencoding = self.options.get('inencoding',
+                                           self.options.get('encoding'))
+        self.outencoding = self.options.get('outencoding',
+                                            self.options.get('encoding'))
+        self.lexers = {}
+        self.formatters = {}
+
+    def get_lexer(self, infn, code):
+        if self.lexername:
+            cls = None
+        else:
+            cls = find_lexer_class_for_filename(infn, code)
+            if cls is None:
+                if not self.guess:
+                    raise ClassNotFound('no lexer for filename %r found' % infn)
+                try:
+                    cls = type(guess_lexer(code, **self.options))
+                except ClassNotFound:
+                    cls = TextLexer
+        lexer = self.lexers.get(cls)
+        if lexer is None:
+            if cls is None:
+                lexer = _get_lexer(self.lexername, self.allow_custom,
+                                   self.options)
+            else:
+                lexer = cls(**self.options)
+            for fname, fopts in self.filters:
+                lexer.add_filter(fname, **fopts)
+            self.lexers[cls] = lexer
+        return lexer
+
+    def get_formatter(self, outfn):
+        if self.fmtername:
+            key = None
+        else:
+            key = os.path.splitext(outfn)[1]
+        fmter = self.formatters.get(key)
+        if fmter is None:
+            if self.fmtername:
+                fmter = _get_formatter(self.fmtername, self.allow_custom,
+                                       self.options)
+            else:
+                fmter = get_formatter_for_filename(outfn, **self.options)
+            self.formatters[key] = fmter
+        return fmter
+
+    def highlight(self, infn, outfn):
+        with open(infn, 'rb') as infp:
+            code = infp.read()
+        inencoding = self.inencoding
+        if not inencoding:
+            code, inencoding = guess_decode(code)
+        lexer = self.get_lexer(infn, code)
+        fmter = self.get_formatter(outfn)
+        if not self.outencoding:
+            fmter.encoding = inencoding
+        escapeinside = self.options.get('escapeinside', '')
+        if len(escapeinside) == 2 and isinstance(fmter, LatexFormatter):
+            lexer = LatexEmbeddedLexer(escapeinside[0], escapeinside[1], lexer)
+        outdir = os.path.dirname(outfn)
+        if outdir and not os.path.isdir(outdir):
+            try:
+                os.makedirs(outdir)
+            except OSError:
+                # another worker may have created it in the meantime
+                if not os.path.isdir(outdir):
+                    raise
+        with open(outfn, 'wb') as outfile:
+            highlight(code, lexer, fmter, outfile)
+
+    def __call__(self, job):
+        """
+        Highlight the input file of *job* into its output file.  Return the
+        input file name and an error message, or None on success.
+        """
+        infn, outfn = job
+        try:
+            self.highlight(infn, outfn)
+        except (IOError, OSError, ClassNotFound, OptionError) as err:
+            return infn, str(err)
+        except Exception as err:
+            return infn, '%s: %s' % (err.__class__.__name__, err)
+        return infn, None
+
+
+_batch_worker = None
+
+
+def _init_batch_worker(settings):
+    global _batch_worker
+    _batch_worker = _BatchWorker(settings)
+
+
+def _run_batch_job(job):
+    return _batch_worker(job)
+
+
+def _batch_outfile(template, ext, infn):
+    """Return the output file name for *infn* given with ``-o``."""
+    name = os.path.basename(infn)
+    if '%' in template:
+        return template % {'path': infn, 'name': name,
+                           'base': os.path.splitext(name)[0]}
+    return os.path.join(template, name + ext)
+
+
+def _main_batch(opts, args, usage, parsed_opts, F_opts, allow_custom):
+    """Handle ``pygmentize -b``."""
+    jobs = opts.pop('-j', None)
+    if jobs is not None:
+        try:
+            jobs = int(jobs)
+        except ValueError:
+            jobs = 0
+        if jobs < 1:
+            print(usage, file=sys.stderr)
+            return 2
+    template = opts.pop('-o', None)
+    lexername = opts.pop('-l', None)
+    fmtername = opts.pop('-f', None)
+    guess = opts.pop('-g', None) is not None
+    opts.pop('-v', None)
+    if opts or not args or not template:
+        print(usage, file=sys.stderr)
+        return 2
+
+    infiles = []
+    for arg in args:
+        if arg.startswith('@'):
+            try:
+                with open(arg[1:]) as manifest:
+                    infiles.extend(line.strip() for line in manifest
+                                   if line.strip())
+            except Exception as err:
+                print('Error: cannot read manifest:', err, file=sys.stderr)
+                return 1
+        else:
+            infiles.append(arg)
+
+    # check the options once here, instead of failing for every file
+    try:
+        if lexername:
+            _get_lexer(lexername, allow_custom, parsed_opts)
+        lexer = TextLexer()
+        for fname, fopts in F_opts:
+            lexer.add_filter(fname, **fopts)
+        ext = ''
+        if fmtername:
+            fmter = _get_formatter(fmtername, allow_custom, parsed_opts)
+            ext = fmter.filenames and fmter.filenames[0].lstrip('*') or '.txt'
+        elif '%' not in template:
+            print('Error: -f is required when -o is a directory',
+                  file=sys.stderr)
+            return 2
+    except (OptionError, ClassNotFound) as err:
+        print('Error:', err, file=sys.stderr)
+        return 1
+
+    try:
+        outfiles = [_batch_outfile(template, ext, infn) for infn in infiles]
+    except KeyError as err:
+        print('Error: unknown placeholder %s in output file name template' %
+              err, file=sys.stderr)
+        return 1
+    except (ValueError, TypeError) as err:
+        print('Error: invalid output file name template:', err,
+              file=sys.stderr)
+        return 1
+
+    # don't let one result silently overwrite another
+    batch = []
+    seen = {}
+    for infn, outfn in zip(infiles, outfiles):
+        key = os.path.normcase(os.path.abspath(outfn))
+        if key in seen:
+            if os.path.normcase(os.path.abspath(seen[key])) == \
+               os.path.normcase(os.path.abspath(infn)):
+                continue  # the same input file given twice
+            print('Error: %s and %s would both be written to %s' %
+                  (seen[key], infn, outfn), file=sys.stderr)
+            return 1
+        seen[key] = infn
+        batch.append((infn, outfn))
+    settings = (lexername, fmtername, allow_custom, parsed_opts, F_opts, guess)
+    if jobs is None:
+        try:
+            jobs = multiprocessing.cpu_count()
+        except NotImplementedError:
+            jobs = 1
+    jobs = min(jobs, len(batch))
+
+    failed = 0
+    if jobs == 1:
+        worker = _BatchWorker(settings)
+        results = (worker(job) for job in batch)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(jobs, _init_batch_worker, (settings,))
+        chunksize = max(1, min(len(batch) // (jobs * 4), 32))
+        results = pool.imap_unordered(_run_batch_job, batch, chunksize)
+    try:
+        for infn, error in results:
+            if error is not None:
+                print('Error: %s: %s' % (infn, error), file=sys.stderr)
+                failed += 1
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    if failed:
+        print('Error: %d of %d files could not be highlighted' %
+              (failed, len(batch)), file=sys.stderr)
+        return 1
+    return 0
+
+
+def _main_serve(address):
+    """Handle ``pygmentize --serve``."""
+    from pygments.server import HighlightServer
+    try:
+        server = HighlightServer(address)
+    except (ValueError, EnvironmentError) as err:
+        print('Error: cannot listen on %s:' % address, err, file=sys.stderr)
+        return 1
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:  # pragma: no cover
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _main_connect(address, opts, args, usage, parsed_opts, F_opts):
+    """Handle ``pygmentize --connect``."""
+    from pygments.server import HighlightClient, ServerError
+    request = {'options': parsed_opts, 'filters': F_opts,
+               'lexer': opts.pop('-l', None),
+               'formatter': opts.pop('-f', None),
+               'guess': opts.pop('-g', None) is not None}
+    outfn = opts.pop('-o', None)
+    opts.pop('-v', None)
+    if opts or len(args) > 1:
+        print(usage, file=sys.stderr)
+        return 2
+
+    if args:
+        request['filename'] = args[0]
+        try:
+            with open(args[0], 'rb') as infp:
+                code = infp.read()
+        except Exception as err:
+            print('Error: cannot read infile:', err, file=sys.stderr)
+            return 1
+    elif sys.version_info > (3,):
+        code = sys.stdin.buffer.read()
+    else:
+        code = sys.stdin.read()
+
+    if outfn:
+        request['outfilename'] = outfn
+    else:
+        if not request['formatter']:
+            if '256' in os.environ.get('TERM', ''):
+                request['formatter'] = 'terminal256'
+            else:
+                request['formatter'] = 'terminal'
+        if 'outencoding' not in parsed_opts and \
+           'encoding' not in parsed_opts:
+            parsed_opts['outencoding'] = terminal_encoding(sys.stdout)
+
+    try:
+        with HighlightClient(address) as client:
+            output = client.highlight(code, **request)
+    except (ValueError, EnvironmentError) as err:
+        print('Error: cannot connect to %s:' % address, err, file=sys.stderr)
+        return 1
+    except ServerError as err:
+        print('Error:', err, file=sys.stderr)
+        return 1
+
+    if outfn:
+        try:
+            with open(outfn, 'wb') as outfile:
+                outfile.write(output)
+        except Exception as err:
+            print('Error: cannot open outfile:', err, file=sys.stderr)
+            return 1
+    elif sys.version_info > (3,):
+        sys.stdout.buffer.write(output)
+    else:
+        sys.stdout.write(output)
+    return 0
+
+
 def main_inner(popts, args, usage):
     opts = {}
     O_opts = []
@@ -251,6 +665,15 @@ def main_inner(popts, args, usage):
             _print_list(arg.rstrip('s'))
         return 0
 
+    # handle ``pygmentize --serve``
+    serve_address = opts.pop('--serve', None)
+    if serve_address is not None:
+        opts.pop('-v', None)
+        if opts or args:
+            print(usage, file=sys.stderr)
+            return 2
+        return _main_serve(serve_address)
+
     # handle ``pygmentize -H``
     H_opt = opts.pop('-H', None)
     if H_opt is not None:
@@ -329,33 +752,39 @@ def main_inner(popts, args, usage):
     if opts.pop('-x', None) is not None:
         allow_custom_lexer_formatter = True
 
+    # handle ``pygmentize --connect``
+    connect_address = opts.pop('--connect', None)
+    if connect_address is not None:
+        if allow_custom_lexer_formatter:
+            print('Error: -x is not supported with --connect', file=sys.stderr)
+            return 2
+        return _main_connect(connect_address, opts, args, usage,
+                             parsed_opts, F_opts)
+
+    # handle ``pygmentize -b``
+    if opts.pop('-b', None) is not None:
+        return _main_batch(opts, args, usage, parsed_opts, F_opts,
+                           allow_custom_lexer_formatter)
+    if '-j' in opts:
+        print(usage, file=sys.stderr)
+        return 2
+
     # select lexer
     lexer = None
 
     # given by name?
     lexername = opts.pop('-l', None)
     if lexername:
-        # custom lexer, located relative to user's cwd
-        if allow_custom_lexer_formatter and '.py' in lexername:
-            try:
-                if ':' in lexername:
-                    filename, name = lexername.rsplit(':', 1)
-                    lexer = load_lexer_from_file(filename, name,
-                                                 **parsed_opts)
-                else:
-                    lexer = load_lexer_from_file(lexername, **parsed_opts)
-            except ClassNotFound as err:
-                print('Error:', err, file=sys.stderr)
-                return 1
-        else:
-            try:
-                lexer = get_lexer_by_name(lexername, **parsed_opts)
-            except (OptionError, ClassNotFound) as err:
-                print('Error:', err, file=sys.stderr)
-                return 1
+        try:
+            lexer = _get_lexer(lexername, allow_custom_lexer_formatter,
+                               parsed_opts)
+        except (OptionError, ClassNotFound) as err:
+            print('Error:', err, file=sys.stderr)
+            return 1
 
     # read input code
     code = None
+    instream = None
 
     if args:
         if len(args) > 1:
@@ -368,17 +797,28 @@ def main_inner(popts, args, usage):
             return 2
 
         infn = args[0]
-        try:
-            with open(infn, 'rb') as infp:
-                code = infp.read()
-        except Exception as err:
-            print('Error: cannot read infile:', err, file=sys.stderr)
-            return 1
-        if not inencoding:
-            code, inencoding = guess_decode(code)
+        if lexer:
+            # no need to look at the code first, so lex it while reading
+            try:
+                instream = io.open(infn, 'rb', buffering=STREAM_CHUNKSIZE)
+            except Exception as err:
+                print('Error: cannot read infile:', err, file=sys.stderr)
+                return 1
+            if not inencoding and not isinstance(lexer, BinaryTokenLexer):
+                # the lexer guesses from the same first chunk
+                inencoding = guess_encoding(
+                    instream.peek(STREAM_CHUNKSIZE))
+        else:
+            try:
+                with open(infn, 'rb') as infp:
+                    code = infp.read()
+            except Exception as err:
+                print('Error: cannot read infile:', err, file=sys.stderr)
+                return 1
+            if not inencoding:
+                code, inencoding = guess_decode(code)
 
-        # do we have to guess the lexer?
-        if not lexer:
+            # we have to guess the lexer
             try:
                 lexer = get_lexer_for_filename(infn, code, **parsed_opts)
             except ClassNotFound as err:
@@ -402,7 +842,7 @@ def main_inner(popts, args, usage):
             code = sys.stdin.buffer.read()
         else:
             code = sys.stdin.read()
-        if not inencoding:
+        if not inencoding and not isinstance(lexer, BinaryTokenLexer):
             code, inencoding = guess_decode_from_terminal(code, sys.stdin)
             # else the lexer will do the decoding
         if not lexer:
@@ -429,24 +869,12 @@ def main_inner(popts, args, usage):
     outfn = opts.pop('-o', None)
     fmter = opts.pop('-f', None)
     if fmter:
-        # custom formatter, located relative to user's cwd
-        if allow_custom_lexer_formatter and '.py' in fmter:
-            try:
-                if ':' in fmter:
-                    file, fmtername = fmter.rsplit(':', 1)
-                    fmter = load_formatter_from_file(file, fmtername,
-                                                     **parsed_opts)
-                else:
-                    fmter = load_formatter_from_file(fmter, **parsed_opts)
-            except ClassNotFound as err:
-                print('Error:', err, file=sys.stderr)
-                return 1
-        else:
-            try:
-                fmter = get_formatter_by_name(fmter, **parsed_opts)
-            except (OptionError, ClassNotFound) as err:
-                print('Error:', err, file=sys.stderr)
-                return 1
+        try:
+            fmter = _get_formatter(fmter, allow_custom_lexer_formatter,
+                                   parsed_opts)
+        except (OptionError, ClassNotFound) as err:
+            print('Error:', err, file=sys.stderr)
+            return 1
 
     if outfn:
         if not fmter:
@@ -472,74 +900,85 @@ def main_inner(popts, args, usage):
         else:
             outfile = sys.stdout
 
-    # determine output encoding if not explicitly selected
-    if not outencoding:
-        if outfn:
-            # output file? use lexer encoding for now (can still be None)
-            fmter.encoding = inencoding
-        else:
-            # else use terminal encoding
-            fmter.encoding = terminal_encoding(sys.stdout)
-
-    # provide coloring under Windows, if possible
-    if not outfn and sys.platform in ('win32', 'cygwin') and \
-       fmter.name in ('Terminal', 'Terminal256'):  # pragma: no cover
-        # unfortunately colorama doesn't support binary streams on Py3
-        if sys.version_info > (3,):
-            from pygments.util import UnclosingTextIOWrapper
-            outfile = UnclosingTextIOWrapper(outfile, encoding=fmter.encoding)
-            fmter.encoding = None
-        try:
-            import colorama.initialise
-        except ImportError:
-            pass
+    try:
+        # determine output encoding if not explicitly selected
+        if not outencoding:
+            if outfn:
+                # output file? use lexer encoding for now (can still be None)
+                fmter.encoding = inencoding
+                if not inencoding and isinstance(lexer, BinaryTokenLexer):
+                    # the token values are stored as UTF-8
+                    fmter.encoding = 'utf-8'
+            else:
+                # else use terminal encoding
+                fmter.encoding = terminal_encoding(sys.stdout)
+
+        # provide coloring under Windows, if possible
+        if not outfn and sys.platform in ('win32', 'cygwin') and \
+           fmter.name in ('Terminal', 'Terminal256'):  # pragma: no cover
+            # unfortunately colorama doesn't support binary streams on Py3
+            if sys.version_info > (3,):
+                from pygments.util import UnclosingTextIOWrapper
+                outfile = UnclosingTextIOWrapper(outfile,
+                                                 encoding=fmter.encoding)
+                fmter.encoding = None
+            try:
+                import colorama.initialise
+            except ImportError:
+                pass
+            else:
+                outfile = colorama.initialise.wrap_stream(
+                    outfile, convert=None, strip=None, autoreset=False,
+                    wrap=True)
+
+        # When using the LaTeX formatter and the option `escapeinside` is
+        # specified, we need a special lexer which collects escaped text
+        # before running the chosen language lexer.
+        escapeinside = parsed_opts.get('escapeinside', '')
+        if len(escapeinside) == 2 and isinstance(fmter, LatexFormatter):
+            left = escapeinside[0]
+            right = escapeinside[1]
+            lexer = LatexEmbeddedLexer(left, right, lexer)
+
+        # ... and do it!
+        if instream is not None:
+            # lex the input file piece by piece...
+            try:
+                highlight(instream, lexer, fmter, outfile)
+            finally:
+                instream.close()
+            return 0
+        elif '-s' not in opts:
+            # process whole input as per normal...
+            highlight(code, lexer, fmter, outfile)
+            return 0
         else:
-            outfile = colorama.initialise.wrap_stream(
-                outfile, convert=None, strip=None, autoreset=False, wrap=True)
-
-    # When using the LaTeX formatter and the option `escapeinside` is
-    # specified, we need a special lexer which collects escaped text
-    # before running the chosen language lexer.
-    escapeinside = parsed_opts.get('escapeinside', '')
-    if len(escapeinside) == 2 and isinstance(fmter, LatexFormatter):
-        left = escapeinside[0]
-        right = escapeinside[1]
-        lexer = LatexEmbeddedLexer(left, right, lexer)
-
-    # ... and do it!
-    if '-s' not in opts:
-        # process whole input as per normal...
-        highlight(code, lexer, fmter, outfile)
-        return 0
-    else:
-        # line by line processing of stdin (eg: for 'tail -f')...
-        try:
-            while 1:
+            # line by line processing of stdin (eg: for 'tail -f')...
+            try:
                 if sys.version_info > (3,):
                     # Python 3: we have to use .buffer to get a binary stream
-                    line = sys.stdin.buffer.readline()
+                    _highlight_stream(sys.stdin.buffer, lexer, fmter, outfile,
+                                      inencoding)
                 else:
-                    line = sys.stdin.readline()
-                if not line:
-                    break
-                if not inencoding:
-                    line = guess_decode_from_terminal(line, sys.stdin)[0]
-                highlight(line, lexer, fmter, outfile)
-                if hasattr(outfile, 'flush'):
-                    outfile.flush()
-            return 0
-        except KeyboardInterrupt:  # pragma: no cover
-            return 0
+                    _highlight_stream(sys.stdin, lexer, fmter, outfile,
+                                      inencoding)
+                return 0
+            except KeyboardInterrupt:  # pragma: no cover
+                return 0
+    finally:
+        if outfn:
+            outfile.close()
 
 
 def main(args=sys.argv):
     """
     Main command line entry point.
     """
-    usage = USAGE % ((args[0],) * 6)
+    usage = USAGE % ((args[0],) * 9)
 
     try:
-        popts, args = getopt.getopt(args[1:], "l:f:F:o:O:P:LS:a:N:vhVHgsx")
+        popts, args = getopt.getopt(args[1:], "l:f:F:o:O:P:LS:a:N:vhVHgsxbj:",
+                                    ["serve=", "connect="])
     except getopt.GetoptError:
         print(usage, file=sys.stderr)
         return 2
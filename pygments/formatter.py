@@ -10,11 +10,12 @@
 """
 
 import codecs
+from itertools import chain, islice
 
-from pygments.util import get_bool_opt, string_types
+from pygments.util import get_bool_opt, string_types, StringIO
 from pygments.styles import get_style_by_name
 
-__all__ = ['Formatter']
+__all__ = ['Formatter', 'BufferedOutput']
 
 
 def _lookup_style(style):
@@ -88,8 +89,76 @@ class Formatter(object):
         """
         Format ``tokensource``, an iterable of ``(tokentype, tokenstring)``
         tuples and write it into ``outfile``.
+
+        If an encoding is set, ``format_unencoded`` writes to a
+        `BufferedOutput`, which encodes the output and writes it to
+        ``outfile`` in large blocks.  Otherwise it writes to ``outfile``
+        directly, which is expected to buffer text itself.
+        """
+        if not self.encoding:
+            return self.format_unencoded(tokensource, outfile)
+        output = BufferedOutput(outfile, self.encoding)
+        result = self.format_unencoded(output.tokens(tokensource), output)
+        output.drain()
+        return result
+
+
+class BufferedOutput(object):
+    """
+    A file-like object that collects the text written to it, and writes it
+    to `outfile` in large blocks, encoded with `encoding` if it is given.
+    Other attributes are those of `outfile`.
+
+    The buffer is written out by `drain` and `flush`, and while iterating
+    over the tokens returned by `tokens` when it holds more than `bufsize`
+    characters.
+
+    .. versionadded:: 2.3
+    """
+
+    def __init__(self, outfile, encoding=None, bufsize=65536):
+        self.outfile = outfile
+        self.bufsize = bufsize
+        self._encode = encoding and \
+            codecs.getincrementalencoder(encoding)().encode
+        self._buffer = StringIO()
+        # the methods of the buffer itself, so that every write doesn't go
+        # through a Python function
+        self.write = self._buffer.write
+        self.writelines = self._buffer.writelines
+
+    def tokens(self, tokensource, chunksize=256):
+        """
+        Return an iterator over `tokensource` that writes out the buffer
+        when it is full, checking every `chunksize` tokens.
         """
-        if self.encoding:
-            # wrap the outfile in a StreamWriter
-            outfile = codecs.lookup(self.encoding)[3](outfile)
-        return self.format_unencoded(tokensource, outfile)
+        return chain.from_iterable(self._chunks(iter(tokensource), chunksize))
+
+    def _chunks(self, tokensource, chunksize):
+        tell = self._buffer.tell
+        while True:
+            if tell() >= self.bufsize:
+                self.drain()
+            chunk = list(islice(tokensource, chunksize))
+            if not chunk:
+                return
+            yield chunk
+
+    def drain(self):
+        """Write the buffered text to the output file."""
+        data = self._buffer.getvalue()
+        if data:
+            self._buffer.seek(0)
+            self._buffer.truncate()
+            if self._encode:
+                data = self._encode(data)
+            self.outfile.write(data)
+
+    def flush(self):
+        """Write the buffered text and flush the output file."""
+        self.drain()
+        if hasattr(self.outfile, 'flush'):
+            self.outfile.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.outfile, name)
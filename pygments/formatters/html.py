@@ -444,6 +444,20 @@ class HtmlFormatter(Formatter):
             cls = self._get_css_class(ttype) + ' ' + cls
         return cls
 
+    def _get_css_span(self, ttype):
+        """Return the opening span tag for tokens of this token type, or
+        an empty string if they are not styled."""
+        if self.noclasses:
+            getcls = self.ttype2class.get
+            cclass = getcls(ttype)
+            while cclass is None:
+                ttype = ttype.parent
+                cclass = getcls(ttype)
+            return cclass and '<span style="%s">' % \
+                self.class2style[cclass][0] or ''
+        cls = self._get_css_classes(ttype)
+        return cls and '<span class="%s">' % cls or ''
+
     def _create_stylesheet(self):
         t2c = self.ttype2class = {Token: ''}
         c2s = self.class2style = {}
@@ -467,6 +481,10 @@ class HtmlFormatter(Formatter):
                 # save len(ttype) to enable ordering the styles by
                 # hierarchy (necessary for CSS cascading rules!)
                 c2s[name] = (style[:-2], ttype, len(ttype))
+        # opening span tags per token type; other types are added by
+        # _format_lines when they first occur
+        self.ttype2span = dict((ttype, self._get_css_span(ttype))
+                               for ttype, _ in self.style)
 
     def get_style_defs(self, arg=None):
         """
@@ -714,26 +732,18 @@ class HtmlFormatter(Formatter):
         Just format the tokens, without any wrapping tags.
         Yield individual lines.
         """
-        nocls = self.noclasses
         lsep = self.lineseparator
-        # for <span style=""> lookup only
-        getcls = self.ttype2class.get
-        c2s = self.class2style
+        t2s = self.ttype2span
         escape_table = _escape_html_table
         tagsfile = self.tagsfile
 
         lspan = ''
         line = []
         for ttype, value in tokensource:
-            if nocls:
-                cclass = getcls(ttype)
-                while cclass is None:
-                    ttype = ttype.parent
-                    cclass = getcls(ttype)
-                cspan = cclass and '<span style="%s">' % c2s[cclass][0] or ''
-            else:
-                cls = self._get_css_classes(ttype)
-                cspan = cls and '<span class="%s">' % cls or ''
+            try:
+                cspan = t2s[ttype]
+            except KeyError:
+                cspan = t2s[ttype] = self._get_css_span(ttype)
 
             parts = value.translate(escape_table).split('\n')
 
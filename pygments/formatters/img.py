@@ -10,7 +10,13 @@
 """
 
 import os
+import re
 import sys
+import zlib
+import struct
+import multiprocessing
+from bisect import bisect_left
+from itertools import islice
 
 from pygments.formatter import Formatter
 from pygments.util import get_bool_opt, get_int_opt, get_list_opt, \
@@ -51,6 +57,80 @@ DEFAULT_FONT_NAME_WIN = 'Courier New'
 DEFAULT_FONT_NAME_MAC = 'Courier New'
 
 
+# The fonts looked up and loaded so far, shared by all FontManager
+# instances: the sets of fonts by font name and size, the fonts by file and
+# size, and the font files by (name, style) on *nix.
+_font_sets = {}
+_fonts = {}
+_font_paths = {}
+
+# The font files known to fontconfig by (family, style), from a single
+# fc-list call; None if not listed yet, empty if that didn't work.
+_nix_font_index = None
+
+# The TrueType files in the Mac font directories by lower case name.
+_mac_font_map = None
+
+
+# separates the names in the fc-list output, which escapes commas in names
+_fc_list_names_re = re.compile(r'(?<!\\),')
+
+
+def _normalize_font_name(name):
+    # fontconfig compares names ignoring case and blanks
+    return name.replace('\\', '').replace(' ', '').lower()
+
+
+def _parse_fc_list(output):
+    """
+    Return a dict mapping (family, style) pairs to font files, from the
+    output of ``fc-list --format '%{file}\\t%{family}\\t%{style}\\n'``.
+    Fonts have several comma separated (e.g. localized) family and style
+    names; each combination is entered, the first font listed winning.
+    """
+    index = {}
+    for line in output.splitlines():
+        fields = line.decode('utf-8', 'replace').split('\t')
+        if len(fields) != 3:
+            continue
+        path, families, styles = fields
+        for family in _fc_list_names_re.split(families):
+            for style in _fc_list_names_re.split(styles):
+                index.setdefault((_normalize_font_name(family),
+                                  _normalize_font_name(style)), path)
+    return index
+
+
+def _get_nix_font_index():
+    global _nix_font_index
+    if _nix_font_index is None:
+        try:
+            proc = subprocess.Popen(
+                ['fc-list', '--format', '%{file}\\t%{family}\\t%{style}\\n'],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            stdout, _ = proc.communicate()
+        except OSError:
+            _nix_font_index = {}
+        else:
+            _nix_font_index = proc.returncode == 0 and \
+                _parse_fc_list(stdout) or {}
+    return _nix_font_index
+
+
+def _truetype(path, size):
+    """Load the font in `path` with `size`, or return it if it was loaded
+    before."""
+    font = _fonts.get((path, size))
+    if font is None:
+        font = _fonts[path, size] = ImageFont.truetype(path, size)
+    return font
+
+
+# characters that are drawn at their own width, which needn't be a multiple
+# of the width of ASCII characters
+_non_ascii_re = re.compile(u'[^\x00-\x7f]')
+
+
 class PilNotAvailable(ImportError):
     """When Python imaging library is not available"""
 
@@ -72,17 +152,35 @@ class FontManager(object):
         if sys.platform.startswith('win'):
             if not font_name:
                 self.font_name = DEFAULT_FONT_NAME_WIN
-            self._create_win()
+            create = self._create_win
         elif sys.platform.startswith('darwin'):
             if not font_name:
                 self.font_name = DEFAULT_FONT_NAME_MAC
-            self._create_mac()
+            create = self._create_mac
         else:
             if not font_name:
                 self.font_name = DEFAULT_FONT_NAME_NIX
-            self._create_nix()
+            create = self._create_nix
+        # the fonts are looked up once per process for each name and size
+        key = (self.font_name, font_size)
+        if key not in _font_sets:
+            create()
+            _font_sets[key] = self.fonts
+        self.fonts = dict(_font_sets[key])
 
     def _get_nix_font_path(self, name, style):
+        key = (name, style)
+        if key not in _font_paths:
+            index = _get_nix_font_index()
+            if index:
+                _font_paths[key] = index.get((_normalize_font_name(name),
+                                              _normalize_font_name(style)))
+            else:
+                # fc-list doesn't support --format, ask for the style
+                _font_paths[key] = self._query_nix_font_path(name, style)
+        return _font_paths[key]
+
+    def _query_nix_font_path(self, name, style):
         proc = subprocess.Popen(['fc-list', "%s:style=%s" % (name, style), 'file'],
                                 stdout=subprocess.PIPE, stderr=None)
         stdout, _ = proc.communicate()
@@ -100,7 +198,7 @@ class FontManager(object):
         for name in STYLES['NORMAL']:
             path = self._get_nix_font_path(self.font_name, name)
             if path is not None:
-                self.fonts['NORMAL'] = ImageFont.truetype(path, self.font_size)
+                self.fonts['NORMAL'] = _truetype(path, self.font_size)
                 break
         else:
             raise FontNotFound('No usable fonts named: "%s"' %
@@ -109,7 +207,7 @@ class FontManager(object):
             for stylename in STYLES[style]:
                 path = self._get_nix_font_path(self.font_name, stylename)
                 if path is not None:
-                    self.fonts[style] = ImageFont.truetype(path, self.font_size)
+                    self.fonts[style] = _truetype(path, self.font_size)
                     break
             else:
                 if style == 'BOLDITALIC':
@@ -121,17 +219,20 @@ class FontManager(object):
         return font_map.get((name + ' ' + style).strip().lower())
 
     def _create_mac(self):
-        font_map = {}
-        for font_dir in (os.path.join(os.getenv("HOME"), 'Library/Fonts/'),
-                         '/Library/Fonts/', '/System/Library/Fonts/'):
-            font_map.update(
-                ((os.path.splitext(f)[0].lower(), os.path.join(font_dir, f))
-                    for f in os.listdir(font_dir) if f.lower().endswith('ttf')))
+        global _mac_font_map
+        if _mac_font_map is None:
+            _mac_font_map = {}
+            for font_dir in (os.path.join(os.getenv("HOME"), 'Library/Fonts/'),
+                             '/Library/Fonts/', '/System/Library/Fonts/'):
+                _mac_font_map.update(
+                    ((os.path.splitext(f)[0].lower(), os.path.join(font_dir, f))
+                        for f in os.listdir(font_dir) if f.lower().endswith('ttf')))
+        font_map = _mac_font_map
 
         for name in STYLES['NORMAL']:
             path = self._get_mac_font_path(font_map, self.font_name, name)
             if path is not None:
-                self.fonts['NORMAL'] = ImageFont.truetype(path, self.font_size)
+                self.fonts['NORMAL'] = _truetype(path, self.font_size)
                 break
         else:
             raise FontNotFound('No usable fonts named: "%s"' %
@@ -140,7 +241,7 @@ class FontManager(object):
             for stylename in STYLES[style]:
                 path = self._get_mac_font_path(font_map, self.font_name, stylename)
                 if path is not None:
-                    self.fonts[style] = ImageFont.truetype(path, self.font_size)
+                    self.fonts[style] = _truetype(path, self.font_size)
                     break
             else:
                 if style == 'BOLDITALIC':
@@ -177,11 +278,11 @@ class FontManager(object):
                 raise FontNotFound('Can\'t open Windows font registry key')
         try:
             path = self._lookup_win(key, self.font_name, STYLES['NORMAL'], True)
-            self.fonts['NORMAL'] = ImageFont.truetype(path, self.font_size)
+            self.fonts['NORMAL'] = _truetype(path, self.font_size)
             for style in ('ITALIC', 'BOLD', 'BOLDITALIC'):
                 path = self._lookup_win(key, self.font_name, STYLES[style])
                 if path:
-                    self.fonts[style] = ImageFont.truetype(path, self.font_size)
+                    self.fonts[style] = _truetype(path, self.font_size)
                 else:
                     if style == 'BOLDITALIC':
                         self.fonts[style] = self.fonts['BOLD']
@@ -316,6 +417,21 @@ class ImageFormatter(Formatter):
         .. versionadded:: 1.2
 
         Default: highlight color of the selected style
+
+    `render_processes`
+        The image is painted in horizontal bands; if greater than 1, that
+        many worker processes paint them in parallel.  PNG images are
+        encoded band by band as well, so that the whole image is never in
+        memory.  Where new processes are started by running Python again
+        (on Windows, and by default on macOS since Python 3.8), the main
+        script has to protect its code with ``if __name__ == '__main__':``,
+        as described in the `multiprocessing` documentation.  If the worker
+        processes cannot be started, the bands are painted in the current
+        process.
+
+        .. versionadded:: 2.3
+
+        Default: 1
     """
 
     # Required by the pygments mapper
@@ -327,6 +443,9 @@ class ImageFormatter(Formatter):
 
     default_image_format = 'png'
 
+    #: The height of the bands the image is painted in, in pixels.
+    band_height = 512
+
     def __init__(self, **options):
         """
         See the class docstring for explanation of options.
@@ -381,6 +500,7 @@ class ImageFormatter(Formatter):
                 pass
         self.hl_color = options.get('hl_color',
                                     self.style.highlight_color) or '#f90'
+        self.render_processes = get_int_opt(options, 'render_processes', 1)
         self.drawables = []
 
     def get_style_defs(self, arg=''):
@@ -439,6 +559,12 @@ class ImageFormatter(Formatter):
         """
         return self.fonts.get_font(style['bold'], style['italic'])
 
+    def _get_style_font_flags(self, style):
+        """
+        Get the ``(bold, italic)`` flags selecting the font for the style.
+        """
+        return style['bold'], style['italic']
+
     def _get_image_size(self, maxcharno, maxlineno):
         """
         Get the required image size.
@@ -453,26 +579,32 @@ class ImageFormatter(Formatter):
         self._draw_text(
             self._get_linenumber_pos(posno),
             str(lineno).rjust(self.line_number_chars),
-            font=self.fonts.get_font(self.line_number_bold,
-                                     self.line_number_italic),
+            font=(self.line_number_bold, self.line_number_italic),
             fill=self.line_number_fg,
         )
 
     def _draw_text(self, pos, text, font, **kw):
         """
-        Remember a single drawable tuple to paint later.
+        Remember a single drawable tuple to paint later.  `font` is either
+        the ``(bold, italic)`` pair selecting the font, or the font itself.
         """
         self.drawables.append((pos, text, font, kw))
 
     def _create_drawables(self, tokensource):
         """
-        Create drawables for the token content.
+        Create drawables for the token content.  Adjacent text of the same
+        line and style is joined into one drawable; spaces aren't drawn.
         """
         lineno = charno = maxcharno = 0
+        # the text of the current line not drawn yet: its start, the text
+        # (with the spaces between its parts), the font and the color
+        run = None
         for ttype, value in tokensource:
             while ttype not in self.styles:
                 ttype = ttype.parent
             style = self.styles[ttype]
+            font = self._get_style_font_flags(style)
+            fill = self._get_text_color(style)
             # TODO: make sure tab expansion happens earlier in the chain.  It
             # really ought to be done on the input, as to do it right here is
             # quite complex.
@@ -481,22 +613,35 @@ class ImageFormatter(Formatter):
             # print lines
             for i, line in enumerate(lines):
                 temp = line.rstrip('\n')
-                if temp:
-                    self._draw_text(
-                        self._get_text_pos(charno, lineno),
-                        temp,
-                        font = self._get_style_font(style),
-                        fill = self._get_text_color(style)
-                    )
-                    charno += len(temp)
-                    maxcharno = max(maxcharno, charno)
+                if temp.strip(' '):
+                    if run is not None and run[2] == font and \
+                       run[3] == fill and not _non_ascii_re.search(temp):
+                        run[1] += ' ' * (charno - run[0] - len(run[1])) + temp
+                    else:
+                        self._draw_run(run, lineno)
+                        run = [charno, temp, font, fill]
+                        if _non_ascii_re.search(temp):
+                            # don't join text after it
+                            self._draw_run(run, lineno)
+                            run = None
+                charno += len(temp)
+                maxcharno = max(maxcharno, charno)
                 if line.endswith('\n'):
                     # add a line for each extra line in the value
+                    self._draw_run(run, lineno)
+                    run = None
                     charno = 0
                     lineno += 1
+        self._draw_run(run, lineno)
         self.maxcharno = maxcharno
         self.maxlineno = lineno
 
+    def _draw_run(self, run, lineno):
+        if run is not None:
+            charno, text, font, fill = run
+            self._draw_text(self._get_text_pos(charno, lineno), text,
+                            font=font, fill=fill)
+
     def _draw_line_numbers(self):
         """
         Create drawables for the line numbers.
@@ -508,21 +653,41 @@ class ImageFormatter(Formatter):
             if (n % self.line_number_step) == 0:
                 self._draw_linenumber(p, n)
 
-    def _paint_line_number_bg(self, im):
+    def _create_painter(self, size):
         """
-        Paint the line number background on the image.
+        Create the `_BandPainter` for an image of `size`.
         """
-        if not self.line_numbers:
-            return
-        if self.line_number_fg is None:
-            return
-        draw = ImageDraw.Draw(im)
-        recth = im.size[-1]
-        rectw = self.image_pad + self.line_number_width - self.line_number_pad
-        draw.rectangle([(0, 0), (rectw, recth)],
-                       fill=self.line_number_bg)
-        draw.line([(rectw, 0), (rectw, recth)], fill=self.line_number_fg)
-        del draw
+        painter = _BandPainter(self.fonts, size, self.background_color)
+        if self.line_numbers and self.line_number_fg is not None:
+            painter.line_number_bar = (
+                self.image_pad + self.line_number_width -
+                self.line_number_pad,
+                self.line_number_fg, self.line_number_bg)
+        # Highlight
+        if self.hl_lines:
+            x = self.image_pad + self.line_number_width - self.line_number_pad + 1
+            recth = self._get_line_height()
+            rectw = size[0] - x
+            for linenumber in self.hl_lines:
+                y = self._get_line_y(linenumber - 1)
+                painter.hl_rects.append((x, y, x + rectw, y + recth))
+            painter.hl_color = self.hl_color
+        return painter
+
+    def _get_band_jobs(self, height):
+        """
+        Yield the top, the height and the drawables of each band of the
+        image.
+        """
+        # glyphs can reach into the following lines
+        margin = 3 * self._get_line_height()
+        drawables = sorted(self.drawables, key=lambda d: d[0][1])
+        tops = [d[0][1] for d in drawables]
+        for top in xrange(0, height, self.band_height):
+            bottom = min(top + self.band_height, height)
+            yield (top, bottom - top,
+                   drawables[bisect_left(tops, top - margin):
+                             bisect_left(tops, bottom)])
 
     def format(self, tokensource, outfile):
         """
@@ -530,29 +695,159 @@ class ImageFormatter(Formatter):
         tuples and write it into ``outfile``.
 
         This implementation calculates where it should draw each token on the
-        pixmap, then calculates the required pixmap size and draws the items.
+        pixmap, then calculates the required pixmap size and paints the image
+        in horizontal bands.
         """
+        self.drawables = []
         self._create_drawables(tokensource)
         self._draw_line_numbers()
-        im = Image.new(
-            'RGB',
-            self._get_image_size(self.maxcharno, self.maxlineno),
-            self.background_color
-        )
-        self._paint_line_number_bg(im)
+        size = self._get_image_size(self.maxcharno, self.maxlineno)
+        painter = self._create_painter(size)
+        jobs = self._get_band_jobs(size[1])
+        pool = None
+        if self.render_processes > 1:
+            try:
+                pool = multiprocessing.Pool(self.render_processes,
+                                            _init_band_worker, (painter,))
+            except (RuntimeError, OSError, ImportError):
+                # e.g. no process support, or this process is still being
+                # started by multiprocessing itself
+                pass
+        if pool is not None:
+            bands = _imap_bounded(pool, _paint_band, jobs,
+                                  self.render_processes)
+        else:
+            bands = (painter.paint(*job) for job in jobs)
+        try:
+            if self.image_format == 'png':
+                writer = _PngWriter(outfile, size)
+                for data in bands:
+                    writer.write(data)
+                writer.close()
+            else:
+                im = Image.new('RGB', size)
+                for top, data in zip(xrange(0, size[1], self.band_height),
+                                     bands):
+                    height = min(self.band_height, size[1] - top)
+                    im.paste(Image.frombytes('RGB', (size[0], height), data),
+                             (0, top))
+                im.save(outfile, self.image_format.upper())
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+
+class _BandPainter(object):
+    """
+    Paints horizontal bands of an image of `size`.  Instances are sent to
+    the worker processes when painting in parallel; they load the fonts
+    again there.
+    """
+
+    def __init__(self, fonts, size, background_color):
+        self.fonts = fonts
+        self.size = size
+        self.background_color = background_color
+        #: the x coordinate, color and background color of the line number
+        #: bar, or None
+        self.line_number_bar = None
+        #: the highlighted rectangles, as (x1, y1, x2, y2)
+        self.hl_rects = []
+        self.hl_color = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['fonts'] = (self.fonts.font_name, self.fonts.font_size)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.fonts = FontManager(*state['fonts'])
+
+    def paint(self, top, height, drawables):
+        """
+        Paint the band of `height` pixels starting at `top` with
+        `drawables`, and return its pixels as RGB bytes.
+        """
+        im = Image.new('RGB', (self.size[0], height), self.background_color)
         draw = ImageDraw.Draw(im)
-        # Highlight
-        if self.hl_lines:
-            x = self.image_pad + self.line_number_width - self.line_number_pad + 1
-            recth = self._get_line_height()
-            rectw = im.size[0] - x
-            for linenumber in self.hl_lines:
-                y = self._get_line_y(linenumber - 1)
-                draw.rectangle([(x, y), (x + rectw, y + recth)],
+        if self.line_number_bar is not None:
+            rectw, fg, bg = self.line_number_bar
+            draw.rectangle([(0, 0), (rectw, height)], fill=bg)
+            draw.line([(rectw, 0), (rectw, height)], fill=fg)
+        for x1, y1, x2, y2 in self.hl_rects:
+            if y1 < top + height and y2 >= top:
+                draw.rectangle([(x1, y1 - top), (x2, y2 - top)],
                                fill=self.hl_color)
-        for pos, value, font, kw in self.drawables:
-            draw.text(pos, value, font=font, **kw)
-        im.save(outfile, self.image_format.upper())
+        for (x, y), text, font, kw in drawables:
+            if isinstance(font, tuple):
+                font = self.fonts.get_font(*font)
+            draw.text((x, y - top), text, font=font, **kw)
+        del draw
+        return im.tobytes()
+
+
+# the painter of a worker process
+_band_painter = None
+
+
+def _init_band_worker(painter):
+    global _band_painter
+    _band_painter = painter
+
+
+def _paint_band(job):
+    return _band_painter.paint(*job)
+
+
+def _imap_bounded(pool, func, iterable, count):
+    """
+    Like ``pool.imap(func, iterable)``, but only hand out `count` items at a
+    time, so that the results don't pile up when they are consumed slowly.
+    """
+    iterable = iter(iterable)
+    while True:
+        items = list(islice(iterable, count))
+        if not items:
+            return
+        for result in pool.map(func, items):
+            yield result
+
+
+class _PngWriter(object):
+    """
+    Writes an RGB image of `size` as PNG to `outfile`, taking the pixels a
+    band of rows at a time.
+    """
+
+    def __init__(self, outfile, size):
+        self.outfile = outfile
+        self.stride = 3 * size[0]
+        self.compressor = zlib.compressobj()
+        outfile.write(b'\x89PNG\r\n\x1a\n')
+        # 8 bit RGB, no interlacing
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', size[0], size[1],
+                                               8, 2, 0, 0, 0))
+
+    def _write_chunk(self, tag, data):
+        self.outfile.write(struct.pack('>I', len(data)) + tag + data +
+                           struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+    def write(self, data):
+        """Add the rows in `data`, the RGB bytes of a band of the image."""
+        stride = self.stride
+        # every row starts with its filter type, here "None"
+        data = b''.join([b'\x00' + data[i:i + stride]
+                         for i in xrange(0, len(data), stride)])
+        compressed = self.compressor.compress(data)
+        if compressed:
+            self._write_chunk(b'IDAT', compressed)
+
+    def close(self):
+        """Finish the image."""
+        self._write_chunk(b'IDAT', self.compressor.flush())
+        self._write_chunk(b'IEND', b'')
 
 
 # Add one formatter per format, so that the "-f gif" option gives the correct result
@@ -3,18 +3,20 @@
     pygments.formatters.other
     ~~~~~~~~~~~~~~~~~~~~~~~~~
 
-    Other formatters: NullFormatter, RawTokenFormatter.
+    Other formatters: NullFormatter, RawTokenFormatter, BinaryTokenFormatter.
 
     :copyright: Copyright 2006-2017 by the Pygments team, see AUTHORS.
     :license: BSD, see LICENSE for details.
 """
 
-from pygments.formatter import Formatter
+from pygments.formatter import Formatter, BufferedOutput
 from pygments.util import OptionError, get_choice_opt
 from pygments.token import Token
 from pygments.console import colorize
+from pygments.tokenfile import TokenFileWriter
 
-__all__ = ['NullFormatter', 'RawTokenFormatter', 'TestcaseFormatter']
+__all__ = ['NullFormatter', 'RawTokenFormatter', 'BinaryTokenFormatter',
+           'TestcaseFormatter']
 
 
 class NullFormatter(Formatter):
@@ -25,13 +27,9 @@ class NullFormatter(Formatter):
     aliases = ['text', 'null']
     filenames = ['*.txt']
 
-    def format(self, tokensource, outfile):
-        enc = self.encoding
+    def format_unencoded(self, tokensource, outfile):
         for ttype, value in tokensource:
-            if enc:
-                outfile.write(value.encode(enc))
-            else:
-                outfile.write(value)
+            outfile.write(value)
 
 
 class RawTokenFormatter(Formatter):
@@ -87,22 +85,12 @@ class RawTokenFormatter(Formatter):
         if self.compress == 'gz':
             import gzip
             outfile = gzip.GzipFile('', 'wb', 9, outfile)
-            def write(text):
-                outfile.write(text.encode())
-            flush = outfile.flush
         elif self.compress == 'bz2':
-            import bz2
-            compressor = bz2.BZ2Compressor(9)
-            def write(text):
-                outfile.write(compressor.compress(text.encode()))
-            def flush():
-                outfile.write(compressor.flush())
-                outfile.flush()
-        else:
-            def write(text):
-                outfile.write(text.encode())
-            flush = outfile.flush
+            outfile = _BZ2Writer(outfile)
+        output = BufferedOutput(outfile, 'utf-8')
+        write = output.write
 
+        tokensource = output.tokens(tokensource)
         if self.error_color:
             for ttype, value in tokensource:
                 line = "%s\t%r\n" % (ttype, value)
@@ -113,7 +101,61 @@ class RawTokenFormatter(Formatter):
         else:
             for ttype, value in tokensource:
                 write("%s\t%r\n" % (ttype, value))
-        flush()
+        output.flush()
+
+
+class _BZ2Writer(object):
+    """Compresses the data written to it with bz2 into `outfile`."""
+
+    def __init__(self, outfile):
+        import bz2
+        self.outfile = outfile
+        self.compressor = bz2.BZ2Compressor(9)
+
+    def write(self, data):
+        self.outfile.write(self.compressor.compress(data))
+
+    def flush(self):
+        self.outfile.write(self.compressor.flush())
+        self.outfile.flush()
+
+
+class BinaryTokenFormatter(Formatter):
+    """
+    Format tokens in a compact binary representation for storing token
+    streams.  It is much smaller and faster to read back than the output of
+    the `RawTokenFormatter`; use the `BinaryTokenLexer` to convert it to a
+    token stream again.  The format is described in `pygments.tokenfile`.
+
+    No options are accepted.
+
+    .. versionadded:: 2.3
+    """
+    name = 'Binary tokens'
+    aliases = ['binarytokens']
+    filenames = []
+
+    unicodeoutput = False
+
+    def __init__(self, **options):
+        Formatter.__init__(self, **options)
+        # the values are always stored as UTF-8, whatever the encoding
+        # option says; setting it lets pygments.format() use a binary file
+        self.encoding = 'utf-8'
+
+    def format(self, tokensource, outfile):
+        try:
+            outfile.write(b'')
+        except TypeError:
+            raise TypeError('The binary tokens formatter needs a binary '
+                            'output file')
+        writer = TokenFileWriter(outfile)
+        write = writer.write
+        for ttype, value in tokensource:
+            write(ttype, value)
+        writer.close()
+        outfile.flush()
+
 
 TESTCASE_BEFORE = u'''\
     def testNeedsName(self):
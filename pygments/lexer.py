@@ -11,20 +11,37 @@
 
 from __future__ import print_function
 
+import os
 import re
 import sys
+import json
+import codecs
 import time
-
+import hashlib
+from collections import deque
+from bisect import bisect_left, bisect_right
+from copy import deepcopy
+from itertools import chain
+
+try:
+    from re import _compiler as sre_compile, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_compile
+    import sre_parse
+
+from pygments import __version__
 from pygments.filter import apply_filters, Filter
 from pygments.filters import get_filter_by_name
-from pygments.token import Error, Text, Other, _TokenType
+from pygments.token import Error, Text, Other, _TokenType, TokenBuffer
 from pygments.util import get_bool_opt, get_int_opt, get_list_opt, \
-    make_analysator, text_type, add_metaclass, iteritems, Future, guess_decode
-from pygments.regexopt import regex_opt
+    get_choice_opt, make_analysator, text_type, add_metaclass, iteritems, \
+    Future, guess_decode, guess_encoding, unichr, OptionError, LexerTimeout, \
+    replace_file
+from pygments.regexopt import regex_opt, REGEX_OPT_VERSION
 
 __all__ = ['Lexer', 'RegexLexer', 'ExtendedRegexLexer', 'DelegatingLexer',
-           'LexerContext', 'include', 'inherit', 'bygroups', 'using', 'this',
-           'default', 'words']
+           'LexerContext', 'LexedText', 'LexedStream', 'include', 'inherit',
+           'bygroups', 'using', 'this', 'default', 'words']
 
 
 _encoding_map = [(b'\xef\xbb\xbf', 'utf-8'),
@@ -35,6 +52,21 @@ _encoding_map = [(b'\xef\xbb\xbf', 'utf-8'),
 
 _default_analyse = staticmethod(lambda x: 0.0)
 
+#: Directory in which the regexes generated for `words` are cached, so that
+#: they don't have to be generated again in every process.  None disables
+#: the cache.  Defaults to the ``PYGMENTS_CACHE_DIR`` environment variable.
+regex_cache_dir = os.environ.get('PYGMENTS_CACHE_DIR') or None
+
+_pattern_type = type(re.compile(''))
+
+# rules referring to groups by number cannot be moved into a larger regex
+_group_reference_re = re.compile(r'\\[1-9]|\(\?\(')
+
+try:
+    _clock = time.perf_counter
+except AttributeError:  # Python 2
+    _clock = time.time
+
 
 class LexerMeta(type):
     """
@@ -145,6 +177,38 @@ class Lexer(object):
         Also preprocess the text, i.e. expand tabs and strip it if
         wanted and applies registered filters.
         """
+        text = self._preprocess(text)
+
+        def streamer():
+            for _, t, v in self.get_tokens_unprocessed(text):
+                yield t, v
+        stream = streamer()
+        if not unfiltered:
+            stream = apply_filters(stream, self.filters, self)
+        return stream
+
+    def get_token_buffer(self, text, unfiltered=False):
+        """
+        Like `get_tokens`, but return the tokens in a `TokenBuffer`, which
+        refers to the preprocessed text instead of holding a string for
+        every token.
+
+        .. versionadded:: 2.3
+        """
+        text = self._preprocess(text)
+        tokens = TokenBuffer(text)
+        if unfiltered or not self.filters:
+            tokens.extend_unprocessed(self.get_tokens_unprocessed(text))
+        else:
+            stream = ((t, v) for _, t, v in self.get_tokens_unprocessed(text))
+            tokens.extend(apply_filters(stream, self.filters, self))
+        return tokens
+
+    def _preprocess(self, text):
+        """
+        Decode `text` if necessary, and normalize newlines, strip it and
+        expand tabs as requested by the options.
+        """
         if not isinstance(text, text_type):
             if self.encoding == 'guess':
                 text, _ = guess_decode(text)
@@ -186,24 +250,159 @@ class Lexer(object):
             text = text.expandtabs(self.tabsize)
         if self.ensurenl and not text.endswith('\n'):
             text += '\n'
+        return text
+
+    def get_tokens_unprocessed(self, text):
+        """
+        Return an iterable of (index, tokentype, value) pairs where "index"
+        is the starting position of the token within the input text.
+
+        In subclasses, implement this method as a generator to
+        maximize effectiveness.
+        """
+        raise NotImplementedError
+
+    def get_tokens_from_file(self, infile, unfiltered=False,
+                             chunksize=262144):
+        """
+        Like `get_tokens`, but read the text from the file object `infile`
+        in chunks of `chunksize` bytes or characters, and return the tokens
+        while reading.
+
+        Lexers based on `RegexLexer` and `ExtendedRegexLexer` that don't
+        override `get_tokens_unprocessed` only keep a window of about
+        `chunksize` characters of the text in memory; other lexers read the
+        whole text before lexing it.  The result is the same as that of
+        `get_tokens`, except that the encoding is guessed from the first
+        chunk, and that a construct spanning several lines that is longer
+        than an eighth of `chunksize` can be lexed differently if it isn't
+        terminated within the window.
+
+        .. versionadded:: 2.3
+        """
+        chunks = self._preprocess_chunks(self._read_chunks(infile, chunksize))
 
         def streamer():
-            for _, t, v in self.get_tokens_unprocessed(text):
+            for _, t, v in self._get_tokens_from_chunks(chunks, chunksize):
                 yield t, v
         stream = streamer()
         if not unfiltered:
             stream = apply_filters(stream, self.filters, self)
         return stream
 
-    def get_tokens_unprocessed(self, text):
+    def _read_chunks(self, infile, chunksize):
         """
-        Return an iterable of (index, tokentype, value) pairs where "index"
-        is the starting position of the token within the input text.
+        Read `infile` in chunks and yield the decoded text, like
+        `get_tokens` decodes it.
+        """
+        decode = None
+        first = True
+        while True:
+            data = infile.read(chunksize)
+            if first and data and decode is None and \
+               not isinstance(data, text_type):
+                decode = self._get_chunk_decoder(data)
+                if self.encoding == 'chardet':
+                    for bom, _ in _encoding_map:
+                        if data.startswith(bom):
+                            data = data[len(bom):]
+                            break
+            text = decode(data, not data) if decode is not None else data
+            if first and text:
+                first = False
+                if text.startswith(u'\ufeff') and (
+                        decode is None or
+                        self.encoding not in ('guess', 'chardet')):
+                    text = text[len(u'\ufeff'):]
+            if text:
+                yield text
+            if not data:
+                break
 
-        In subclasses, implement this method as a generator to
-        maximize effectiveness.
+    def _get_chunk_decoder(self, data):
         """
-        raise NotImplementedError
+        Return an incremental decoding function for the bytes of a file
+        starting with `data`.
+        """
+        if self.encoding == 'guess':
+            return codecs.getincrementaldecoder(
+                guess_encoding(data))('replace').decode
+        elif self.encoding == 'chardet':
+            try:
+                import chardet
+            except ImportError:
+                raise ImportError('To enable chardet encoding guessing, '
+                                  'please install the chardet library '
+                                  'from http://chardet.feedparser.org/')
+            # check for BOM first
+            for bom, encoding in _encoding_map:
+                if data.startswith(bom):
+                    break
+            # no BOM found, so use chardet
+            else:
+                encoding = chardet.detect(data[:1024]).get('encoding')
+            return codecs.getincrementaldecoder(
+                encoding or 'utf-8')('replace').decode
+        return codecs.getincrementaldecoder(self.encoding)().decode
+
+    def _preprocess_chunks(self, chunks):
+        """
+        Preprocess decoded chunks of text like `get_tokens` preprocesses the
+        whole text.  The chunks are yielded as soon as they end with a
+        complete line, so that tabs can be expanded and leading and trailing
+        newlines stripped.
+        """
+        if self.stripall:
+            strip = None
+        elif self.stripnl:
+            strip = '\n'
+        else:
+            strip = ''
+        buf = u''
+        carriage_return = False
+        started = emitted = False
+        for chunk in chain(chunks, [None]):
+            eof = chunk is None
+            if not eof:
+                if carriage_return:
+                    chunk = u'\r' + chunk
+                # a trailing "\r" can be the first half of a "\r\n"
+                carriage_return = chunk.endswith(u'\r')
+                if carriage_return:
+                    chunk = chunk[:-1]
+            elif carriage_return:
+                chunk = u'\r'
+            else:
+                chunk = u''
+            buf += chunk.replace(u'\r\n', u'\n').replace(u'\r', u'\n')
+            if not started:
+                buf = buf.lstrip(strip)
+                if not buf and not eof:
+                    continue
+                started = True
+            if not eof:
+                # keep back what may be stripped at the end of the text
+                end = buf.rfind(u'\n', 0, len(buf.rstrip(strip))) + 1
+                if not end:
+                    continue
+                text, buf = buf[:end], buf[end:]
+            else:
+                text = buf.rstrip(strip)
+                if self.ensurenl and not text.endswith(u'\n') and \
+                   (text or not emitted):
+                    text += u'\n'
+            if self.tabsize > 0:
+                text = text.expandtabs(self.tabsize)
+            emitted = True
+            yield text
+
+    def _get_tokens_from_chunks(self, chunks, chunksize):
+        """
+        Return an iterable of (index, tokentype, value) pairs for the text
+        consisting of `chunks`.  Lexers that can lex the text piece by piece,
+        holding about `chunksize` characters at a time, override this.
+        """
+        return self.get_tokens_unprocessed(u''.join(chunks))
 
 
 class DelegatingLexer(Lexer):
@@ -216,6 +415,10 @@ class DelegatingLexer(Lexer):
     The lexers from the ``template`` lexer package use this base lexer.
     """
 
+    #: Size of the windows in which a regex based root lexer lexes the text,
+    #: see `Lexer.get_tokens_from_file`.
+    _root_chunksize = 262144
+
     def __init__(self, _root_lexer, _language_lexer, _needle=Other, **options):
         self.root_lexer = _root_lexer(**options)
         self.language_lexer = _language_lexer(**options)
@@ -223,21 +426,107 @@ class DelegatingLexer(Lexer):
         Lexer.__init__(self, **options)
 
     def get_tokens_unprocessed(self, text):
-        buffered = ''
-        insertions = []
-        lng_buffer = []
-        for i, t, v in self.language_lexer.get_tokens_unprocessed(text):
-            if t is self.needle:
-                if lng_buffer:
-                    insertions.append((len(buffered), lng_buffer))
-                    lng_buffer = []
-                buffered += v
+        # For long texts, both lexers run at the same time: the root lexer
+        # is given the text of the needle tokens as the language lexer
+        # produces them, and the other tokens of the language lexer are
+        # kept only until the root tokens around them have been produced.
+        split = _SplitTokens(self.language_lexer.get_tokens_unprocessed(text),
+                             self.needle)
+        if len(text) <= self._root_chunksize:
+            # no need for windows, lex all root text at once
+            tokens = self.root_lexer.get_tokens_unprocessed(
+                u''.join(split.root_text()))
+        else:
+            tokens = self.root_lexer._get_tokens_from_chunks(
+                split.root_text(), self._root_chunksize)
+        return split.merge(tokens)
+
+
+class _SplitTokens(object):
+    """
+    Splits the tokens of the language lexer of a `DelegatingLexer` into the
+    text for the root lexer and the insertions, reading them only as far as
+    needed.
+    """
+
+    def __init__(self, tokens, needle):
+        self.tokens = iter(tokens)
+        self.needle = needle
+        self.done = False
+        # length of the root text so far, and the chunks of it not yet
+        # given to the root lexer
+        self.size = 0
+        self.chunks = deque()
+        # completed ``(index, tokens)`` insertions, and the one being built
+        self.insertions = deque()
+        self.current = None
+
+    def _advance(self):
+        """Process the next token of the language lexer."""
+        for item in self.tokens:
+            if item[1] is self.needle:
+                if self.current:
+                    self.insertions.append((self.size, self.current))
+                    self.current = None
+                self.chunks.append(item[2])
+                self.size += len(item[2])
+            elif self.current is None:
+                self.current = [item]
             else:
-                lng_buffer.append((i, t, v))
-        if lng_buffer:
-            insertions.append((len(buffered), lng_buffer))
-        return do_insertions(insertions,
-                             self.root_lexer.get_tokens_unprocessed(buffered))
+                self.current.append(item)
+            return
+        if self.current:
+            self.insertions.append((self.size, self.current))
+            self.current = None
+        self.done = True
+
+    def root_text(self):
+        """Yield the text for the root lexer in chunks."""
+        chunks = self.chunks
+        while True:
+            while not chunks:
+                if self.done:
+                    return
+                self._advance()
+            yield chunks.popleft()
+
+    def merge(self, tokens):
+        """
+        Yield the root lexer `tokens` with the insertions, split at the
+        insertion points.  This works like `do_insertions`, but only reads
+        the language lexer tokens up to the end of the current root token.
+        """
+        insertions = self.insertions
+        realpos = None
+        for i, t, v in tokens:
+            if realpos is None:
+                realpos = i
+            end = i + len(v)
+            while not self.done and self.size <= end:
+                self._advance()
+            oldi = 0
+            while insertions and insertions[0][0] <= end:
+                index, itokens = insertions.popleft()
+                tmpval = v[oldi:index - i]
+                yield realpos, t, tmpval
+                realpos += len(tmpval)
+                for _, it_token, it_value in itokens:
+                    yield realpos, it_token, it_value
+                    realpos += len(it_value)
+                oldi = index - i
+            yield realpos, t, v[oldi:]
+            realpos += len(v) - oldi
+
+        # insertions after the last root token
+        realpos = realpos or 0
+        while True:
+            while not insertions and not self.done:
+                self._advance()
+            if not insertions:
+                break
+            for _, it_token, it_value in insertions.popleft()[1]:
+                yield realpos, it_token, it_value
+                realpos += len(it_value)
 
 
 # ------------------------------------------------------------------------------
@@ -336,6 +625,75 @@ class _This(object):
 this = _This()
 
 
+def _freeze_option(value):
+    """Return a hashable equivalent of an option value."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_option(item) for item in value)
+    elif isinstance(value, dict):
+        return tuple(sorted((key, _freeze_option(item))
+                            for key, item in iteritems(value)))
+    elif isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+class _LexerPool(object):
+    """
+    Keeps idle lexer instances by class and options, so that lexers used for
+    parts of a text, e.g. by `using` callbacks, aren't created again for
+    every part.  An instance is only handed out while no one else uses it.
+    """
+
+    #: The maximum number of different class and option combinations kept.
+    maxkeys = 256
+
+    def __init__(self):
+        self._idle = {}
+
+    def tokens(self, cls, options, text, **kwargs):
+        """
+        Yield the result of ``get_tokens_unprocessed(text, **kwargs)`` of a
+        lexer of class `cls` with `options`.
+        """
+        try:
+            key = (cls, tuple(sorted((name, _freeze_option(value))
+                                     for name, value in iteritems(options))))
+            idle = self._idle.get(key)
+        except TypeError:  # unhashable option value
+            key = idle = None
+        try:
+            lexer = idle.pop()
+        except (AttributeError, IndexError):
+            lexer = cls(**options)
+        try:
+            for item in lexer.get_tokens_unprocessed(text, **kwargs):
+                yield item
+        finally:
+            if idle is not None:
+                idle.append(lexer)
+            elif key is not None and len(self._idle) < self.maxkeys:
+                self._idle.setdefault(key, []).append(lexer)
+
+
+_lexer_pool = _LexerPool()
+
+# frozensets of builtin names, shared by the lexer instances that use them
+_builtin_name_sets = {}
+
+
+def _builtin_names(key, build, *args):
+    """
+    Return a frozenset of the names ``build(*args)`` returns.  It is built
+    once per process for each `key`, which should name the lexer and the
+    options the names depend on, and shared by all instances.
+    """
+    try:
+        return _builtin_name_sets[key]
+    except KeyError:
+        names = _builtin_name_sets[key] = frozenset(build(*args))
+        return names
+
+
 def using(_other, **kwargs):
     """
     Callback that processes the match with a different lexer.
@@ -360,26 +718,27 @@ def using(_other, **kwargs):
     if _other is this:
         def callback(lexer, match, ctx=None):
             # if keyword arguments are given the callback
-            # function has to create a new lexer instance
+            # function has to use another lexer instance
             if kwargs:
-                # XXX: cache that somehow
-                kwargs.update(lexer.options)
-                lx = lexer.__class__(**kwargs)
+                options = dict(kwargs)
+                options.update(lexer.options)
+                tokens = _lexer_pool.tokens(lexer.__class__, options,
+                                            match.group(), **gt_kwargs)
             else:
-                lx = lexer
+                tokens = lexer.get_tokens_unprocessed(match.group(),
+                                                      **gt_kwargs)
             s = match.start()
-            for i, t, v in lx.get_tokens_unprocessed(match.group(), **gt_kwargs):
+            for i, t, v in tokens:
                 yield i + s, t, v
             if ctx:
                 ctx.pos = match.end()
     else:
         def callback(lexer, match, ctx=None):
-            # XXX: cache that somehow
-            kwargs.update(lexer.options)
-            lx = _other(**kwargs)
-
+            options = dict(kwargs)
+            options.update(lexer.options)
             s = match.start()
-            for i, t, v in lx.get_tokens_unprocessed(match.group(), **gt_kwargs):
+            for i, t, v in _lexer_pool.tokens(_other, options, match.group(),
+                                              **gt_kwargs):
                 yield i + s, t, v
             if ctx:
                 ctx.pos = match.end()
@@ -414,16 +773,781 @@ class words(Future):
         return regex_opt(self.words, prefix=self.prefix, suffix=self.suffix)
 
 
+class _RegexSourceCache(object):
+    """
+    A file in `regex_cache_dir` holding the regexes generated for the `words`
+    of the token definitions `name` of a lexer class.  The regexes are keyed
+    by a hash of the words, so changed word lists are simply not found.
+    Files written by another version of Pygments, of Python or of the
+    `regex_opt` algorithm are ignored.
+    """
+
+    version = '%s-%d-%d' % (__version__, sys.version_info[0],
+                            REGEX_OPT_VERSION)
+
+    def __init__(self, cls, name):
+        self.filename = os.path.join(regex_cache_dir, '%s.%s%s.json' % (
+            cls.__module__, cls.__name__, name and '-' + name))
+        self.sources = {}
+        self.used = {}
+        try:
+            with open(self.filename) as fp:
+                data = json.load(fp)
+            if data.get('version') == self.version:
+                self.sources = data['sources']
+        except (IOError, OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def get(self, future):
+        """Return the regex generated by `future`."""
+        if not isinstance(future, words):
+            return future.get()
+        key = hashlib.sha1(json.dumps([sorted(future.words), future.prefix,
+                                       future.suffix]).encode('utf-8'))
+        key = key.hexdigest()
+        source = self.sources.get(key)
+        if source is None:
+            source = future.get()
+        self.used[key] = source
+        return source
+
+    def save(self):
+        """Write the regexes used since loading, if they changed."""
+        if self.used == self.sources:
+            return
+        tmpname = '%s.%d.tmp' % (self.filename, os.getpid())
+        try:
+            if not os.path.isdir(regex_cache_dir):
+                os.makedirs(regex_cache_dir)
+            with open(tmpname, 'w') as fp:
+                json.dump({'version': self.version, 'sources': self.used}, fp)
+            replace_file(tmpname, self.filename)
+        except (IOError, OSError):
+            pass
+
+
+def _sequential_selector(rules):
+    """Return a rule selector that always tries all rules of a state."""
+    def select(text, pos, endpos=None):
+        return rules
+    return select
+
+
+def _combined_selector(rules):
+    """
+    Return a rule selector that merges the rules of a state into a single
+    alternation, so that the matching rule is found with one regex call.
+
+    Alternatives are tried from left to right, so the first alternative that
+    matches belongs to the rule that would have matched first when trying the
+    rules one by one.  Rules that cannot be merged (because they refer to
+    their groups by number, or use different flags) split the alternation
+    and are tried on their own.
+    """
+    segments = []
+    run = []
+    run_flags = None
+    for rule in rules:
+        rex = getattr(rule[0], '__self__', None)
+        if not isinstance(rex, _pattern_type) or \
+           _group_reference_re.search(rex.pattern):
+            segments.extend(_combine_rules(run, run_flags))
+            segments.append((rule[0], None, [rule]))
+            run = []
+            run_flags = None
+            continue
+        # flags don't matter for the empty regex of default()
+        if rex.pattern:
+            if run_flags is None:
+                run_flags = rex.flags
+            elif run_flags != rex.flags:
+                segments.extend(_combine_rules(run, run_flags))
+                run = []
+                run_flags = rex.flags
+        run.append(rule)
+    segments.extend(_combine_rules(run, run_flags))
+
+    def select(text, pos, endpos=sys.maxsize):
+        for match, winners, single in segments:
+            m = match(text, pos, endpos)
+            if m is not None:
+                # the group wrapping a rule is always the last one to close
+                return single or winners[m.lastindex]
+        return ()
+    return select
+
+
+def _combine_rules(rules, flags):
+    """
+    Compile a list of rules using the same `flags` into segments for
+    `_combined_selector`.
+    """
+    if len(rules) < 2:
+        return [(rule[0], None, [rule]) for rule in rules]
+    patterns = []
+    winners = [()]
+    for rule in rules:
+        rex = rule[0].__self__
+        patterns.append(rex.pattern)
+        # the group wrapping the rule, followed by the rule's own groups
+        winners.append([rule])
+        winners.extend([()] * rex.groups)
+    flags = flags or 0
+    # a trailing comment in verbose mode would swallow the closing paren
+    close = flags & re.VERBOSE and '\n)' or ')'
+    try:
+        match = re.compile('|'.join('(' + p + close for p in patterns),
+                           flags).match
+    except Exception:
+        # e.g. inline flags, which are only allowed at the start
+        return [(rule[0], None, [rule]) for rule in rules]
+    return [(match, winners, None)]
+
+
+_category_sources = {
+    sre_parse.CATEGORY_DIGIT: r'\d',
+    sre_parse.CATEGORY_NOT_DIGIT: r'\D',
+    sre_parse.CATEGORY_SPACE: r'\s',
+    sre_parse.CATEGORY_NOT_SPACE: r'\S',
+    sre_parse.CATEGORY_WORD: r'\w',
+    sre_parse.CATEGORY_NOT_WORD: r'\W',
+}
+
+_repeat_ops = tuple(getattr(sre_parse, name) for name in
+                    ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+                    if hasattr(sre_parse, name))
+
+
+def _charset_source(items):
+    """Rebuild a character class from its parsed `items`, or return None."""
+    parts = []
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            parts.append(re.escape(unichr(av)))
+        elif op == sre_parse.RANGE:
+            parts.append(re.escape(unichr(av[0])) + '-' +
+                         re.escape(unichr(av[1])))
+        elif op == sre_parse.NEGATE:
+            parts.insert(0, '^')
+        elif op == sre_parse.CATEGORY and av in _category_sources:
+            parts.append(_category_sources[av])
+        else:
+            return None
+    return '[' + ''.join(parts) + ']'
+
+
+def _first_char_sources(items):
+    """
+    Return a list of regexes that together match every character the parsed
+    regex `items` can start with (or None if that cannot be determined), and
+    whether `items` can match the empty string.
+    """
+    sources = []
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            sources.append(re.escape(unichr(av)))
+            return sources, False
+        elif op == sre_parse.NOT_LITERAL:
+            sources.append('[^' + re.escape(unichr(av)) + ']')
+            return sources, False
+        elif op == sre_parse.ANY:
+            sources.append('.')
+            return sources, False
+        elif op == sre_parse.IN:
+            source = _charset_source(av)
+            if source is None:
+                return None, True
+            sources.append(source)
+            return sources, False
+        elif op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            # zero-width, the next item decides
+            continue
+        elif op == sre_parse.SUBPATTERN:
+            # (group, add_flags, del_flags, pattern) since Python 3.6
+            if len(av) > 2 and (av[1] or av[2]):
+                return None, True
+            subitems = [av[-1]]
+        elif op == sre_parse.BRANCH:
+            subitems = av[1]
+        elif op in _repeat_ops:
+            subitems = [av[2]]
+        elif op == getattr(sre_parse, 'ATOMIC_GROUP', None):
+            subitems = [av]
+        else:
+            return None, True
+        nullable = False
+        for subpattern in subitems:
+            subsources, subnullable = _first_char_sources(subpattern)
+            if subsources is None:
+                return None, True
+            sources.extend(subsources)
+            nullable = nullable or subnullable
+        if op in _repeat_ops and av[0] == 0:
+            nullable = True
+        if not nullable:
+            return sources, False
+    return sources, True
+
+
+def _first_char_test(rex):
+    """
+    Return a function that tells if the compiled regex `rex` can match
+    starting with a given character, or None if it can start with anything.
+    """
+    try:
+        sources, nullable = _first_char_sources(sre_parse.parse(rex.pattern,
+                                                                rex.flags))
+    except Exception:
+        return None
+    if sources is None or nullable:
+        return None
+    # the sources are built without whitespace or comments
+    return re.compile('|'.join(sources), rex.flags & ~re.VERBOSE).match
+
+
+def _firstchar_selector(rules):
+    """
+    Return a rule selector that only tries the rules that can match starting
+    with the character at the current position.
+
+    The possible first characters of every rule are determined from its
+    parsed regex.  The lists of rules to try are computed the first time a
+    character is seen, and then looked up in a table keyed by character.
+    """
+    tests = []
+    for rule in rules:
+        rex = getattr(rule[0], '__self__', None)
+        tests.append((isinstance(rex, _pattern_type) and
+                      _first_char_test(rex) or None, rule))
+    if all(test is None for test, _ in tests):
+        return None
+    # rules that can match anything, including nothing at the end of input
+    always = [rule for test, rule in tests if test is None]
+    table = {}
+
+    def select(text, pos, endpos=sys.maxsize):
+        if pos >= endpos:
+            return always
+        try:
+            char = text[pos]
+        except IndexError:
+            return always
+        try:
+            return table[char]
+        except KeyError:
+            table[char] = candidates = [rule for test, rule in tests
+                                        if test is None or test(char)]
+            return candidates
+    return select
+
+
+_single_char_ops = (sre_parse.LITERAL, sre_parse.NOT_LITERAL, sre_parse.ANY,
+                    sre_parse.IN)
+
+
+def _subpattern_flags(av, flags):
+    """Return the flags in effect inside the parsed group `av`."""
+    # (group, add_flags, del_flags, pattern) since Python 3.6
+    if len(av) > 2:
+        return (flags | av[1]) & ~av[2]
+    return flags
+
+
+def _can_cross_line(items, flags):
+    """
+    Return whether the parsed regex `items` can match or look ahead at a
+    newline, so that a match attempt can go on with the next line.
+    """
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            if av == 10:
+                return True
+        elif op == sre_parse.NOT_LITERAL:
+            if av != 10:
+                return True
+        elif op == sre_parse.ANY:
+            if flags & re.DOTALL:
+                return True
+        elif op == sre_parse.IN:
+            source = _charset_source(av)
+            if source is None or re.match(source, u'\n'):
+                return True
+        elif op == sre_parse.AT:
+            continue
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            # lookbehinds only look at text before the attempt
+            if av[0] > 0 and _can_cross_line(av[1], flags):
+                return True
+        elif op == sre_parse.SUBPATTERN:
+            if _can_cross_line(av[-1], _subpattern_flags(av, flags)):
+                return True
+        elif op == sre_parse.BRANCH:
+            if any(_can_cross_line(alt, flags) for alt in av[1]):
+                return True
+        elif op in _repeat_ops:
+            if _can_cross_line(av[2], flags):
+                return True
+        elif op == getattr(sre_parse, 'GROUPREF_EXISTS', None):
+            if any(_can_cross_line(sub, flags) for sub in av[1:] if sub):
+                return True
+        elif op == getattr(sre_parse, 'ATOMIC_GROUP', None):
+            if _can_cross_line(av, flags):
+                return True
+        else:
+            # e.g. group references
+            return True
+    return False
+
+
+def _line_bounded(items, flags):
+    """
+    Return whether a failed match attempt of the parsed regex `items` never
+    looks beyond the end of the line it starts on.
+    """
+    items = list(items)
+    if any(_can_cross_line([item], flags) for item in items[:-1]):
+        return False
+    if not items or not _can_cross_line(items[-1:], flags):
+        return True
+    # only the last item can match a newline, e.g. ``[ \t]*\n``
+    op, av = items[-1]
+    if op in _single_char_ops:
+        return True
+    elif op in _repeat_ops:
+        # like ``\s+``, which can only fail at its first character
+        return av[0] <= 1 and len(av[2]) == 1 and \
+            av[2][0][0] in _single_char_ops
+    elif op == sre_parse.SUBPATTERN:
+        return _line_bounded(av[-1], _subpattern_flags(av, flags))
+    elif op == sre_parse.BRANCH:
+        return all(_line_bounded(alt, flags) for alt in av[1])
+    elif op == getattr(sre_parse, 'ATOMIC_GROUP', None):
+        return _line_bounded(av, flags)
+    return False
+
+
+def _within_line(items, flags):
+    """
+    Return whether the parsed regex `items` can match a newline only as the
+    last character it matches, so that no attempt looks beyond the line it
+    starts on.
+    """
+    items = list(items)
+    if not items or not _can_cross_line(items, flags):
+        return True
+    if _can_cross_line(items[:-1], flags):
+        return False
+    op, av = items[-1]
+    if op in _single_char_ops:
+        return True
+    elif op == sre_parse.SUBPATTERN:
+        return _within_line(av[-1], _subpattern_flags(av, flags))
+    elif op == sre_parse.BRANCH:
+        return all(_within_line(alt, flags) for alt in av[1])
+    elif op == getattr(sre_parse, 'ATOMIC_GROUP', None):
+        return _within_line(av, flags)
+    return False
+
+
+def _may_overshoot(items, flags, following=()):
+    """
+    Return whether a successful match of the parsed regex `items`, followed
+    by the parsed regex `following`, may have looked at text on a later
+    line beyond the character after its end, e.g. ``".*"`` with `re.DOTALL`,
+    which backtracks from the end of the text.
+    """
+    items = list(items)
+    for k, (op, av) in enumerate(items):
+        if op in _single_char_ops or not _can_cross_line([(op, av)], flags):
+            continue
+        follow = items[k+1:] + list(following)
+        if op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            # a lookahead like ``(?![^#])`` doesn't get beyond its line,
+            # and so not beyond the line the match ends on
+            if not _within_line(av[1], flags):
+                return True
+        elif op == sre_parse.SUBPATTERN:
+            if _may_overshoot(av[-1], _subpattern_flags(av, flags), follow):
+                return True
+        elif op == getattr(sre_parse, 'ATOMIC_GROUP', None):
+            if _may_overshoot(av, flags, follow):
+                return True
+        elif op in _repeat_ops:
+            if not _within_line(av[2], flags):
+                return True
+            # a lazy repeat stops at the first place the rest matches, and
+            # a greedy one only gives back repetitions if the rest can
+            # start where they do
+            if op != sre_parse.MIN_REPEAT and follow and av[0] != av[1] \
+               and not _disjoint_starts(av[2], follow, flags):
+                return True
+        elif op == getattr(sre_parse, 'GROUPREF_EXISTS', None):
+            if any(_may_overshoot(sub, flags, follow)
+                   for sub in av[1:] if sub):
+                return True
+        elif op == sre_parse.BRANCH:
+            # only the alternatives before the one that matches fail
+            if follow or \
+               not all(_within_line(alt, flags) for alt in av[1][:-1]) or \
+               any(_may_overshoot(alt, flags) for alt in av[1]):
+                return True
+        else:
+            return True
+    return False
+
+
+def _disjoint_starts(first, second, flags):
+    """
+    Return whether the parsed regexes `first` and `second` can't start with
+    the same character and `second` can't match the empty string.
+    """
+    first, _ = _first_char_sources(first)
+    second, nullable = _first_char_sources(second)
+    if first is None or second is None or nullable:
+        return False
+    for chars, others in ((first, second), (second, first)):
+        # the sources for single characters are escaped by `re.escape`
+        if all(len(source) == 1 and source != '.' or
+               len(source) == 2 and source[0] == '\\' for source in chars):
+            test = re.compile('|'.join(others), flags & ~re.VERBOSE).match
+            return not any(test(source[-1]) for source in chars)
+    return False
+
+
+def _subpatterns(op, av):
+    """Return the parsed regexes nested in the parsed regex item
+    ``(op, av)``."""
+    if op == sre_parse.SUBPATTERN:
+        return [av[-1]]
+    elif op == sre_parse.BRANCH:
+        return av[1]
+    elif op in _repeat_ops:
+        return [av[2]]
+    elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+        return [av[1]]
+    elif op == getattr(sre_parse, 'GROUPREF_EXISTS', None):
+        return [sub for sub in av[1:] if sub is not None]
+    elif op == getattr(sre_parse, 'ATOMIC_GROUP', None):
+        return [av]
+    return []
+
+
+def _group_items(items, groups=None):
+    """Return a dictionary mapping the group numbers in the parsed regex
+    `items` to the parsed regexes of the groups."""
+    if groups is None:
+        groups = {}
+    for op, av in items:
+        if op == sre_parse.SUBPATTERN and av[0] is not None:
+            groups[av[0]] = av[-1]
+        for subpattern in _subpatterns(op, av):
+            _group_items(subpattern, groups)
+    return groups
+
+
+def _refers_to_groups(items):
+    """Return whether the parsed regex `items` contains group references."""
+    for op, av in items:
+        if op in (sre_parse.GROUPREF,
+                  getattr(sre_parse, 'GROUPREF_EXISTS', None)):
+            return True
+        if any(_refers_to_groups(sub) for sub in _subpatterns(op, av)):
+            return True
+    return False
+
+
+class _PrefixMatcher(object):
+    """
+    Finds how far match attempts of a parsed regex can get, by running an
+    automaton for it that checks lookarounds, ignores anchors, follows
+    lookaheads as far as they can look and matches group references like
+    the groups.  Unlike the regex itself, this takes linear time.
+    """
+
+    # repeats with larger counts are treated as unbounded
+    max_count = 10
+
+    def __init__(self, items, flags, overshoots=False):
+        #: Whether successful attempts can look beyond the character after
+        #: their match (see `_may_overshoot`).
+        self.overshoots = overshoots
+        # each state is [character test, next state], [None, list of next
+        # states] if it doesn't consume a character, or [lookaround test,
+        # next state] for the states in `_assertions`
+        self._states = []
+        self._assertions = set()
+        self._any = self._add(lambda char: True, None)
+        self._states[self._any][1] = self._any
+        # where attempts end, having got through the text so far
+        self._end = self._add(lambda char: False, None)
+        self._tests = {}
+        # the states that continue lazy repeats of single characters
+        self._lazy_loops = {}
+        # the parser state needed to compile parts of the regex
+        self._parsed = getattr(items, 'state', getattr(items, 'pattern', None))
+        try:
+            start = self._build(items, _group_items(items), flags, self._end)
+            self._lazy = self._last_lazy_loop(items)
+        except Exception:
+            start, self._lazy = self._any, None
+        # nodes of the deterministic automaton map characters to the next
+        # node, None to its character states, 0 to the lookarounds on the
+        # way to further states, and the sets of lookarounds that hold to
+        # the node with those passed
+        self._nodes = {}
+        self._start = self._node([start])
+
+    def _add(self, test, target):
+        self._states.append([test, target])
+        return len(self._states) - 1
+
+    def _char_test(self, item, flags):
+        sources = _first_char_sources([item])[0]
+        if sources is None:
+            return self._states[self._any][0]
+        # the sources are built without whitespace or comments
+        key = (sources[0], flags & ~re.VERBOSE)
+        if key not in self._tests:
+            self._tests[key] = re.compile(*key).match
+        return self._tests[key]
+
+    def _lookaround_test(self, item, flags):
+        """Return a function that tells if the lookaround `item` holds at a
+        position of a text, or None if that cannot be determined."""
+        if self._parsed is None or flags & self._parsed.flags != \
+           self._parsed.flags:
+            return None
+        # groups matched before the lookaround are unknown here
+        if item[0] == sre_parse.ASSERT and _refers_to_groups(item[1][1]):
+            return None
+        try:
+            return sre_compile.compile(
+                sre_parse.SubPattern(self._parsed, [item]), flags).match
+        except Exception:
+            return None
+
+    def _build(self, items, groups, flags, state):
+        """Add the states for `items`, followed by `state`, and return the
+        first one."""
+        for op, av in reversed(list(items)):
+            state = self._build_item(op, av, groups, flags, state)
+        return state
+
+    def _build_item(self, op, av, groups, flags, state):
+        if op in _single_char_ops:
+            return self._add(self._char_test((op, av), flags), state)
+        elif op == sre_parse.AT:
+            return state
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            test = self._lookaround_test((op, av), flags)
+            if test is not None:
+                state = self._add(test, state)
+                self._assertions.add(state)
+            if av[0] < 0:
+                # lookbehinds only look at text before the attempt
+                return state
+            # what lookaheads look at counts as well
+            return self._add(None, [state, self._build(
+                av[1], groups, flags, self._end)])
+        elif op == sre_parse.SUBPATTERN:
+            return self._build(av[-1], groups, _subpattern_flags(av, flags),
+                               state)
+        elif op == sre_parse.BRANCH:
+            return self._add(None, [self._build(alt, groups, flags, state)
+                                    for alt in av[1]])
+        elif op in _repeat_ops:
+            low, high, body = av
+            if high == sre_parse.MAXREPEAT or high > self.max_count:
+                targets = [state]
+                state = self._add(None, targets)
+                targets.append(self._build(body, groups, flags, state))
+                if op == sre_parse.MIN_REPEAT and len(body) == 1 and \
+                   body[0][0] in _single_char_ops:
+                    self._lazy_loops[id(av)] = targets[1]
+                if low > self.max_count:
+                    low = 0
+            else:
+                for _ in range(high - low):
+                    state = self._add(None, [
+                        state, self._build(body, groups, flags, state)])
+            for _ in range(low):
+                state = self._build(body, groups, flags, state)
+            return state
+        elif op == sre_parse.GROUPREF and av in groups:
+            return self._build(groups[av], groups, flags, state)
+        elif op == getattr(sre_parse, 'GROUPREF_EXISTS', None):
+            return self._add(None, [
+                self._build(av[1], groups, flags, state),
+                self._build(av[2] or [], groups, flags, state)])
+        elif op == getattr(sre_parse, 'ATOMIC_GROUP', None):
+            return self._build(av, groups, flags, state)
+        return self._any
+
+    def _last_lazy_loop(self, items):
+        """
+        Return the state continuing the last lazy repeat of a single
+        character in `items` and the width of the items after it, or None
+        if there is no such repeat or the items after it can match text of
+        different widths or refer to groups.
+        """
+        items = list(items)
+        for k in range(len(items) - 1, -1, -1):
+            op, av = items[k]
+            if op == sre_parse.SUBPATTERN and len(av[-1]) == 1:
+                op, av = av[-1][0]
+            if op != sre_parse.MIN_REPEAT:
+                continue
+            rest = items[k + 1:]
+            if id(av) not in self._lazy_loops or self._parsed is None or \
+               _refers_to_groups(rest):
+                return None
+            low, high = sre_parse.SubPattern(self._parsed, rest).getwidth()
+            if low != high:
+                return None
+            return self._lazy_loops[id(av)], low
+        return None
+
+    def _closure(self, states, passed):
+        """Return the states reachable from `states` without consuming a
+        character, passing only the lookarounds in `passed`."""
+        reachable = set()
+        pending = list(states)
+        while pending:
+            state = pending.pop()
+            if state in reachable:
+                continue
+            reachable.add(state)
+            test, target = self._states[state]
+            if test is None:
+                pending.extend(target)
+            elif state in passed:
+                pending.append(target)
+        return reachable
+
+    def _node(self, states, passed=None):
+        """
+        Return the node for the states reachable from `states`, or None if
+        there are none.  If `passed` is None, no lookarounds are checked
+        yet, else it holds the ones that hold.
+        """
+        if passed is None:
+            assertions = self._assertions & self._closure(states,
+                                                          self._assertions)
+            passed = ()
+        else:
+            assertions = ()
+        chars = frozenset(state for state in self._closure(states, passed)
+                          if self._states[state][0] is not None and
+                          state not in self._assertions)
+        if not chars and not assertions:
+            return None
+        key = (chars, frozenset(assertions))
+        if key not in self._nodes:
+            self._nodes[key] = {None: chars, 0: tuple(assertions)}
+        return self._nodes[key]
+
+    def reach(self, text, pos, matchend=None):
+        """
+        Return the farthest end of the text that match attempts at `pos` can
+        get to.  If an attempt matched up to `matchend`, no attempt continued
+        the last lazy repeat across the character where the successful one
+        left it, since the rest of the regex matches from there whichever
+        way the attempt got there.
+        """
+        node = self._start
+        end = len(text)
+        blocked = lazy = None
+        if matchend is not None and self._lazy is not None:
+            lazy, width = self._lazy
+            blocked = matchend - width
+        while node is not None:
+            if node[0]:
+                passed = frozenset(state for state in node[0]
+                                   if self._states[state][0](text, pos))
+                try:
+                    node = node[passed]
+                except KeyError:
+                    node[passed] = node = self._node(
+                        list(node[None]) +
+                        [self._states[state][1] for state in passed], passed)
+                continue
+            if pos == end:
+                break
+            char = text[pos]
+            if pos == blocked:
+                following = self._node([
+                    self._states[state][1] for state in node[None]
+                    if state != lazy and self._states[state][0](char)])
+            elif char in node:
+                following = node[char]
+            else:
+                node[char] = following = self._node([
+                    target for test, target in
+                    (self._states[state] for state in node[None])
+                    if test(char)])
+            if following is None:
+                break
+            node = following
+            pos += 1
+        return pos
+
+
+def _lookahead_matcher(rex):
+    """
+    Return None if a failed match attempt of the compiled regex `rex` never
+    looks beyond the end of the line it starts on.  Otherwise, return a
+    `_PrefixMatcher` for it.
+    """
+    try:
+        items = sre_parse.parse(rex.pattern, rex.flags)
+        if _line_bounded(items, rex.flags):
+            return None
+        overshoots = _may_overshoot(items, rex.flags)
+    except Exception:
+        # an unknown item gets anywhere
+        items, overshoots = [(None, None)], True
+    return _PrefixMatcher(items, rex.flags, overshoots)
+
+
+def _lookahead_end(reach, text, pos, end, matchend=None):
+    """
+    Return the end of the text match attempts at `pos` may have looked at,
+    if the `_PrefixMatcher.reach` function `reach` shows that they can get
+    from `pos` to `end`.  `matchend` is passed on to `reach`.
+    """
+    if matchend is None:
+        reached = reach(text, pos)
+    else:
+        reached = reach(text, pos, matchend)
+    if reached < end:
+        return None
+    # the attempt looked at the next character, and `$` at one more
+    return reached + 2
+
+
+_rule_selector_factories = {
+    'sequential': None,
+    'combined': _combined_selector,
+    'firstchar': _firstchar_selector,
+}
+
+
 class RegexLexerMeta(LexerMeta):
     """
     Metaclass for RegexLexer, creates the self._tokens attribute from
     self.tokens on the first instantiation.
     """
 
+    #: The `_RegexSourceCache` used while processing token definitions.
+    _regex_sources = None
+
     def _process_regex(cls, regex, rflags, state):
         """Preprocess the regular expression component of a token definition."""
         if isinstance(regex, Future):
-            regex = regex.get()
+            if cls._regex_sources is not None:
+                regex = cls._regex_sources.get(regex)
+            else:
+                regex = regex.get()
         return re.compile(regex, rflags).match
 
     def _process_token(cls, token):
@@ -515,8 +1639,15 @@ class RegexLexerMeta(LexerMeta):
         """Preprocess a dictionary of token definitions."""
         processed = cls._all_tokens[name] = {}
         tokendefs = tokendefs or cls.tokens[name]
-        for state in list(tokendefs):
-            cls._process_state(tokendefs, processed, state)
+        if regex_cache_dir:
+            cls._regex_sources = _RegexSourceCache(cls, name)
+        try:
+            for state in list(tokendefs):
+                cls._process_state(tokendefs, processed, state)
+        finally:
+            if cls._regex_sources is not None:
+                cls._regex_sources.save()
+                cls._regex_sources = None
         return processed
 
     def get_tokendefs(cls):
@@ -568,10 +1699,77 @@ class RegexLexerMeta(LexerMeta):
 
         return tokens
 
-    def __call__(cls, *args, **kwds):
-        """Instantiate cls after preprocessing its token definitions."""
+    def get_rule_selectors(cls, tokendefs, mode):
+        """
+        Return a dictionary mapping the states of the processed `tokendefs`
+        to functions that, given the text and the current position, return
+        the rules worth trying at that position.
+
+        `mode` is one of the choices for the ``rulematching`` option.  The
+        result is computed only once per class and token definitions.
+        """
+        key = (id(tokendefs), mode)
+        if key not in cls._rule_selectors:
+            factory = _rule_selector_factories[mode]
+            selectors = {}
+            for state, rules in iteritems(tokendefs):
+                selectors[state] = (factory and factory(rules) or
+                                    _sequential_selector(rules))
+            # keep the token definitions alive so that the id stays unique
+            cls._rule_selectors[key] = (tokendefs, selectors)
+        return cls._rule_selectors[key][1]
+
+    def get_lookahead_tests(cls, tokendefs, state):
+        """
+        Return a function that, given the match function of a rule in
+        `state` of the processed `tokendefs` (None for all rules) and the
+        character at the current position, returns `_PrefixMatcher.reach`
+        functions for the rules before it that can look beyond the end of
+        the line and start with that character, and a dictionary mapping
+        the match functions of the rules whose matches can look beyond the
+        character after them to their `_PrefixMatcher.reach` functions.
+
+        The results are computed only once per class, token definitions and
+        state.
+        """
+        key = (id(tokendefs), state)
+        if key not in cls._lookahead_tests:
+            rules = []
+            counts = {}
+            matched = {}
+            for rule in tokendefs[state]:
+                counts.setdefault(rule[0], len(rules))
+                rex = getattr(rule[0], '__self__', None)
+                if not isinstance(rex, _pattern_type):
+                    rules.append((None, lambda text, pos: len(text)))
+                    continue
+                matcher = _lookahead_matcher(rex)
+                if matcher is not None:
+                    rules.append((_first_char_test(rex), matcher.reach))
+                    if matcher.overshoots:
+                        matched[rule[0]] = matcher.reach
+            tables = {}
+
+            def get_tests(rexmatch, char):
+                count = counts.get(rexmatch, len(rules))
+                table = tables.setdefault(count, {})
+                try:
+                    return table[char]
+                except KeyError:
+                    table[char] = tests = [test for first, test in
+                                           rules[:count]
+                                           if first is None or first(char)]
+                    return tests
+            # keep the token definitions alive so that the id stays unique
+            cls._lookahead_tests[key] = (tokendefs, get_tests, matched)
+        return cls._lookahead_tests[key][1:]
+
+    def _preprocess_tokens(cls):
+        """Preprocess the token definitions if not done yet."""
         if '_tokens' not in cls.__dict__:
             cls._all_tokens = {}
+            cls._rule_selectors = {}
+            cls._lookahead_tests = {}
             cls._tmpname = 0
             if hasattr(cls, 'token_variants') and cls.token_variants:
                 # don't process yet
@@ -579,6 +1777,9 @@ class RegexLexerMeta(LexerMeta):
             else:
                 cls._tokens = cls.process_tokendef('', cls.get_tokendefs())
 
+    def __call__(cls, *args, **kwds):
+        """Instantiate cls after preprocessing its token definitions."""
+        cls._preprocess_tokens()
         return type.__call__(cls, *args, **kwds)
 
 
@@ -588,6 +1789,35 @@ class RegexLexer(Lexer):
     Base for simple stateful regular expression-based lexers.
     Simplifies the lexing process so that you need only
     provide a list of states and regular expressions.
+
+    Additional options recognized:
+    ``rulematching``
+        How to find the rule that matches at the current position.  The
+        default, ``'sequential'``, tries the rules of the current state one
+        after another.  ``'combined'`` merges the rules of each state into
+        one regex, which finds the matching rule with a single regex call
+        and is faster for states with many rules.  ``'firstchar'`` only
+        tries the rules that can match starting with the character at the
+        current position.  All modes produce the same tokens.
+
+        .. versionadded:: 2.3
+
+    ``timeout``
+        If given and greater than 0, the number of seconds lexing a text may
+        take.  When it is exceeded, lexing stops, and the rest of the text
+        is returned as a single `Text` token.  The time is checked between
+        rule matches, so a single regex match taking longer is not
+        interrupted.  The information about the timeout is available as the
+        `last_timeout` attribute afterwards (default: 0).
+
+        .. versionadded:: 2.3
+
+    ``ontimeout``
+        What to do when the ``timeout`` is exceeded: ``'text'`` to return
+        the rest of the text as `Text` (the default), or ``'raise'`` to
+        raise a `pygments.util.LexerTimeout` exception.
+
+        .. versionadded:: 2.3
     """
 
     #: Flags for compiling the regular expressions.
@@ -613,20 +1843,169 @@ class RegexLexer(Lexer):
     #: current one.
     tokens = {}
 
+    #: Rule selectors for the ``rulematching`` option, None if the rules
+    #: are tried sequentially.
+    _selectors = None
+
+    #: The `LexerTimeout` describing where the last lexing run exceeded the
+    #: ``timeout``, or None if it didn't.
+    last_timeout = None
+
+    def __init__(self, **options):
+        Lexer.__init__(self, **options)
+        mode = get_choice_opt(options, 'rulematching',
+                              list(_rule_selector_factories), 'sequential')
+        if mode != 'sequential':
+            self._selectors = self.__class__.get_rule_selectors(self._tokens,
+                                                                mode)
+        try:
+            self.timeout = float(options.get('timeout') or 0)
+        except (TypeError, ValueError):
+            raise OptionError('Invalid value %r for option timeout; you '
+                              'must give a number of seconds' %
+                              options.get('timeout'))
+        self.ontimeout = get_choice_opt(options, 'ontimeout',
+                                        ['text', 'raise'], 'text')
+
     def get_tokens_unprocessed(self, text, stack=('root',)):
         """
         Split ``text`` into (tokentype, text) pairs.
 
         ``stack`` is the inital stack (default: ``['root']``)
         """
-        pos = 0
+        self.last_timeout = None
+        return self._get_tokens_from(text, 0, stack)
+
+    def _get_tokens_from_chunks(self, chunks, chunksize):
+        """
+        Lex the text in windows of about `chunksize` characters.  The tokens
+        up to the last line start before the final eighth of a window are
+        final; lexing resumes there with the state the lexer had, with the
+        following chunks appended to the rest of the window.
+        """
+        if not _resumes_at_checkpoints(self):
+            return Lexer._get_tokens_from_chunks(self, chunks, chunksize)
+        return self._get_windowed_tokens(chunks, chunksize)
+
+    def _get_windowed_tokens(self, chunks, chunksize):
+        lookahead = chunksize // 8
+        chunks = iter(chunks)
+        self.last_timeout = None
+        deadline = self.timeout and _clock() + self.timeout or None
+        parts = []
+        size = 0
+        text = u''
+        offset = 0
+        state = None
+        minimum = chunksize
+        for chunk in chain(chunks, [None]):
+            final = chunk is None
+            if not final:
+                parts.append(chunk)
+                size += len(chunk)
+                if size < minimum:
+                    continue
+            text = u''.join(parts)
+            limit = final and len(text) or len(text) - lookahead
+            cut, cut_state = 0, state
+            pending = []
+            checkpoints = []
+            seen = 0
+            # end of the text covered by tokens so far; callbacks can emit
+            # tokens ahead of the lexer position
+            reach = 0
+            lexer = self._get_tokens_from(text, 0, state, checkpoints,
+                                          deadline)
+            try:
+                for item in chain(lexer, [None]):
+                    # checkpoints are recorded before the tokens following
+                    # them
+                    while seen < len(checkpoints):
+                        cpos, cstate = checkpoints[seen]
+                        seen += 1
+                        if cpos > limit:
+                            item = None
+                            break
+                        if cpos > cut and cpos >= reach:
+                            for pos, t, v in pending:
+                                yield offset + pos, t, v
+                            pending = []
+                            cut, cut_state = cpos, cstate
+                    if item is None:
+                        break
+                    pending.append(item)
+                    reach = max(reach, item[0] + len(item[2]))
+            except LexerTimeout as err:
+                err.pos += offset
+                raise
+            lexer.close()
+            if self.last_timeout is not None:
+                # the rest of the window is already a Text token, the rest
+                # of the input isn't lexed anymore
+                self.last_timeout.pos += offset
+                for pos, t, v in pending:
+                    yield offset + pos, t, v
+                offset += len(text)
+                for chunk in chunks:
+                    yield offset, Text, chunk
+                    offset += len(chunk)
+                return
+            if final:
+                for pos, t, v in pending:
+                    yield offset + pos, t, v
+            elif cut:
+                parts = [text[cut:]]
+                size = len(parts[0])
+                offset += cut
+                state = cut_state
+                minimum = chunksize
+            else:
+                # no line to resume at in this window, try a larger one
+                parts = [text]
+                minimum = 2 * size
+
+    def _get_tokens_from(self, text, pos, state, checkpoints=None,
+                         deadline=None, lookaheads=None):
+        """
+        Like `get_tokens_unprocessed`, but start lexing at ``pos`` in the
+        given ``state`` (the state stack, None for the initial one).
+
+        If ``checkpoints`` is a list, a ``(pos, state)`` pair is appended to
+        it whenever the lexer starts matching at the beginning of a line.
+        Lexing can be resumed from there by passing both to this method.
+
+        ``deadline`` is the `_clock` time at which lexing times out; it
+        defaults to ``timeout`` seconds from now.
+
+        If ``lookaheads`` is a list, a ``(pos, end)`` pair is appended to it
+        whenever a rule failing at ``pos`` may have looked at the text up to
+        ``end``, beyond the end of the line (see `_record_lookahead`).
+        """
         tokendefs = self._tokens
-        statestack = list(stack)
+        selectors = self._selectors
+        statestack = list(state or ('root',))
         statetokens = tokendefs[statestack[-1]]
+        if deadline is None and self.timeout:
+            deadline = _clock() + self.timeout
+        rexmatch = None
         while 1:
+            if deadline is not None and _clock() > deadline:
+                for item in self._timed_out(text, pos, len(text),
+                                            statestack, rexmatch):
+                    yield item
+                break
+            if checkpoints is not None and (not pos or text[pos-1] == '\n') \
+               and (not checkpoints or checkpoints[-1][0] < pos):
+                checkpoints.append((pos, tuple(statestack)))
+            if selectors is not None:
+                statetokens = selectors[statestack[-1]](text, pos)
             for rexmatch, action, new_state in statetokens:
                 m = rexmatch(text, pos)
                 if m:
+                    if lookaheads is not None:
+                        self._record_lookahead(lookaheads, text, pos,
+                                               statestack[-1], rexmatch,
+                                               m.end())
                     if action is not None:
                         if type(action) is _TokenType:
                             yield pos, action, m.group()
@@ -656,6 +2035,9 @@ class RegexLexer(Lexer):
             else:
                 # We are here only if all state tokens have been considered
                 # and there was not a match on any of them.
+                if lookaheads is not None:
+                    self._record_lookahead(lookaheads, text, pos,
+                                           statestack[-1], None)
                 try:
                     if text[pos] == '\n':
                         # at EOL, reset state to "root"
@@ -669,6 +2051,48 @@ class RegexLexer(Lexer):
                 except IndexError:
                     break
 
+    def _record_lookahead(self, lookaheads, text, pos, state, rexmatch,
+                          matchend=None):
+        """
+        Append ``(pos, end)`` to `lookaheads` if a rule of `state` that was
+        tried at `pos` before the rule `rexmatch` matched (all rules if it
+        is None) may have looked at the text up to `end`, beyond the end of
+        the line.  That happens e.g. for a rule for comments when the
+        comment isn't terminated.
+
+        The match of `rexmatch`, ending at `matchend`, counts as well if it
+        may have looked beyond the end of the line and the character after
+        it, e.g. for ``".*"`` with `re.DOTALL`.
+        """
+        linestart = text.find('\n', pos) + 1
+        if not linestart:
+            return
+        get_tests, matched = self.__class__.get_lookahead_tests(
+            self._tokens, state)
+        ends = [_lookahead_end(reach, text, pos, linestart)
+                for reach in get_tests(rexmatch, text[pos])]
+        if rexmatch in matched and matchend < len(text):
+            ends.append(_lookahead_end(matched[rexmatch], text, pos,
+                                       max(matchend + 1, linestart),
+                                       matchend))
+        ends = [end for end in ends if end is not None]
+        if ends:
+            lookaheads.append((pos, max(ends)))
+
+    def _timed_out(self, text, pos, end, stack, rexmatch):
+        """
+        Record that lexing timed out at `pos` with the state `stack`, after
+        trying the rule `rexmatch`, and raise `LexerTimeout` or return the
+        rest of the text up to `end` as a `Text` token.
+        """
+        rule = getattr(getattr(rexmatch, '__self__', None), 'pattern', None)
+        self.last_timeout = error = LexerTimeout(self.timeout, pos,
+                                                 tuple(stack), rule)
+        if self.ontimeout == 'raise':
+            raise error
+        if pos < end:
+            yield pos, Text, text[pos:end]
+
 
 class LexerContext(object):
     """
@@ -696,18 +2120,54 @@ class ExtendedRegexLexer(RegexLexer):
         Split ``text`` into (tokentype, text) pairs.
         If ``context`` is given, use this lexer context instead.
         """
+        self.last_timeout = None
+        return self._get_context_tokens(context or LexerContext(text, 0))
+
+    def _get_tokens_from(self, text, pos, state, checkpoints=None,
+                         deadline=None, lookaheads=None):
+        """
+        Like `RegexLexer._get_tokens_from`, but the state also holds the
+        attributes that callbacks stored in the lexer context.
+        """
+        ctx = LexerContext(text, pos)
+        if state is not None:
+            ctx.stack = list(state[0])
+            ctx.__dict__.update(deepcopy(dict(state[1])))
+        return self._get_context_tokens(ctx, checkpoints, deadline,
+                                        lookaheads)
+
+    def _get_context_tokens(self, ctx, checkpoints=None, deadline=None,
+                            lookaheads=None):
         tokendefs = self._tokens
-        if not context:
-            ctx = LexerContext(text, 0)
-            statetokens = tokendefs['root']
-        else:
-            ctx = context
-            statetokens = tokendefs[ctx.stack[-1]]
-            text = ctx.text
+        selectors = self._selectors
+        statetokens = tokendefs[ctx.stack[-1]]
+        text = ctx.text
+        if deadline is None and self.timeout:
+            deadline = _clock() + self.timeout
+        rexmatch = None
         while 1:
+            if deadline is not None and _clock() > deadline:
+                for item in self._timed_out(text, ctx.pos, ctx.end,
+                                            ctx.stack, rexmatch):
+                    yield item
+                break
+            # callbacks may move the position past the end
+            if checkpoints is not None and ctx.pos <= ctx.end and \
+               (not ctx.pos or text[ctx.pos-1] == '\n') and \
+               (not checkpoints or checkpoints[-1][0] < ctx.pos):
+                extra = sorted((key, deepcopy(value))
+                               for key, value in iteritems(ctx.__dict__)
+                               if key not in ('text', 'pos', 'end', 'stack'))
+                checkpoints.append((ctx.pos, (tuple(ctx.stack), tuple(extra))))
+            if selectors is not None:
+                statetokens = selectors[ctx.stack[-1]](text, ctx.pos, ctx.end)
             for rexmatch, action, new_state in statetokens:
                 m = rexmatch(text, ctx.pos, ctx.end)
                 if m:
+                    if lookaheads is not None:
+                        self._record_lookahead(lookaheads, text, ctx.pos,
+                                               ctx.stack[-1], rexmatch,
+                                               m.end())
                     if action is not None:
                         if type(action) is _TokenType:
                             yield ctx.pos, action, m.group()
@@ -739,6 +2199,9 @@ class ExtendedRegexLexer(RegexLexer):
                         statetokens = tokendefs[ctx.stack[-1]]
                     break
             else:
+                if lookaheads is not None:
+                    self._record_lookahead(lookaheads, text, ctx.pos,
+                                           ctx.stack[-1], None)
                 try:
                     if ctx.pos >= ctx.end:
                         break
@@ -755,6 +2218,253 @@ class ExtendedRegexLexer(RegexLexer):
                     break
 
 
+def _resumes_at_checkpoints(lexer):
+    """
+    Return whether `lexer` produces its tokens with `_get_tokens_from`, so
+    that lexing can be resumed at the checkpoints recorded by it.
+    """
+    return isinstance(lexer, RegexLexer) and \
+        type(lexer).get_tokens_unprocessed in (
+            RegexLexer.get_tokens_unprocessed,
+            ExtendedRegexLexer.get_tokens_unprocessed)
+
+
+class LexedText(object):
+    """
+    Holds a text together with the tokens `lexer` produced for it, and keeps
+    the tokens up to date when the text is edited with `update`.
+
+    For lexers based on `RegexLexer` and `ExtendedRegexLexer` that don't
+    override `get_tokens_unprocessed`, the state of the lexer is recorded at
+    the beginning of each line.  After an edit, lexing restarts at the
+    beginning of the edited line and stops as soon as the lexer reaches a
+    line it already passed in the same state before the edit, so the cost of
+    an edit doesn't depend on the length of the text.  Lexing restarts
+    earlier if a rule tried before the edited line looked at the edited
+    text, e.g. a rule for comments spanning several lines when the comment
+    isn't terminated yet.  Other lexers relex the whole text.
+
+    Like `Lexer.get_tokens_unprocessed`, this works on the text as given,
+    without the preprocessing and filtering done by `Lexer.get_tokens`.
+    Lexers that keep state outside of their state stack or lexer context
+    can produce different tokens than a complete relex would.
+
+    .. versionadded:: 2.3
+    """
+
+    def __init__(self, lexer, text):
+        self.lexer = lexer
+        self.text = text
+        #: The tokens of the text, as ``(tokentype, value)`` pairs.
+        self.tokens = []
+        self._incremental = _resumes_at_checkpoints(lexer)
+        # position, number of preceding tokens and lexer state of each
+        # checkpoint
+        self._positions = []
+        self._ntokens = []
+        self._states = []
+        # position and end of the text looked at of failed rule attempts
+        # that looked beyond the end of their line
+        self._lookaheads = []
+        if self._incremental:
+            self._relex(0, 0, 0)
+        else:
+            self.tokens = [(t, v) for _, t, v in
+                           lexer.get_tokens_unprocessed(text)]
+
+    def update(self, start, end, replacement):
+        """
+        Replace ``self.text[start:end]`` by `replacement` and update the
+        tokens accordingly.
+
+        Returns a ``(first, last, tokens)`` tuple, meaning that the tokens
+        ``first`` to ``last`` (excluding) of the previous token list have
+        been replaced by `tokens`.
+        """
+        self.text = self.text[:start] + replacement + self.text[end:]
+        delta = len(replacement) - (end - start)
+        if self._incremental:
+            # restart at the last checkpoint before the edited line, and
+            # before `start`, since tokens ending there looked at the
+            # character after them
+            limit = min(self.text.rfind('\n', 0, start) + 1, start - 1)
+            # or where a failed rule looked at the edited text
+            for pos, end in self._lookaheads:
+                if pos >= limit:
+                    break
+                if end > start:
+                    limit = pos
+                    break
+            index = max(bisect_right(self._positions, limit) - 1, 0)
+            first, old, new = self._relex(index, start + len(replacement),
+                                          delta)
+        else:
+            first, old = 0, self.tokens
+            self.tokens = new = [(t, v) for _, t, v in
+                                 self.lexer.get_tokens_unprocessed(self.text)]
+        # only report tokens that actually changed
+        head = 0
+        while head < len(old) and head < len(new) and old[head] == new[head]:
+            head += 1
+        tail = 0
+        while tail < len(old) - head and tail < len(new) - head and \
+                old[-1 - tail] == new[-1 - tail]:
+            tail += 1
+        return (first + head, first + len(old) - tail,
+                new[head:len(new) - tail])
+
+    def _relex(self, index, edit_end, delta):
+        """
+        Lex from checkpoint `index` until the lexer state converges with the
+        state at a checkpoint after `edit_end` (in new text coordinates),
+        and splice the result into the tokens.  Returns the index of the
+        first replaced token, the replaced tokens and the new tokens.
+        """
+        positions = self._positions
+        if positions:
+            state = self._states[index]
+            pos = positions[index]
+            ntokens = self._ntokens[index]
+        else:
+            state = None
+            pos = ntokens = 0
+        tokens = []
+        checkpoints = []
+        new_positions = []
+        new_ntokens = []
+        new_states = []
+        converged = None
+        # end of the text covered by tokens so far; callbacks can emit
+        # tokens ahead of the lexer position, which must not be skipped
+        # when restarting at a checkpoint
+        reach = pos
+        seen = 0
+        lookaheads = []
+        lexer = self.lexer._get_tokens_from(self.text, pos, state,
+                                            checkpoints,
+                                            lookaheads=lookaheads)
+        for item in chain(lexer, [None]):
+            # checkpoints are recorded before the tokens following them
+            while seen < len(checkpoints):
+                cpos, cstate = checkpoints[seen]
+                seen += 1
+                if cpos < reach:
+                    continue
+                if cpos >= edit_end:
+                    old = bisect_left(positions, cpos - delta, index + 1)
+                    if old < len(positions) and \
+                       positions[old] == cpos - delta and \
+                       self._states[old] == cstate:
+                        converged = old
+                        break
+                new_positions.append(cpos)
+                new_ntokens.append(ntokens + len(tokens))
+                new_states.append(cstate)
+            if converged is not None or item is None:
+                break
+            tokens.append(item[1:])
+            reach = max(reach, item[0] + len(item[2]))
+        lexer.close()
+
+        kept = bisect_left(self._lookaheads, (pos,))
+        if converged is None:
+            converged = len(positions)
+            last = len(self.tokens)
+            self._lookaheads[kept:] = lookaheads
+        else:
+            last = self._ntokens[converged]
+            # the lexer may have gone on a bit past the convergence
+            resume = positions[converged]
+            self._lookaheads[kept:] = [
+                item for item in lookaheads if item[0] < resume + delta] + [
+                (lpos + delta, end + delta) for lpos, end in
+                self._lookaheads[bisect_left(self._lookaheads, (resume,)):]]
+        old_tokens = self.tokens[ntokens:last]
+        self.tokens[ntokens:last] = tokens
+        shift = len(tokens) - (last - ntokens)
+        positions[index:] = new_positions + \
+            [cpos + delta for cpos in positions[converged:]]
+        self._ntokens[index:] = new_ntokens + \
+            [n + shift for n in self._ntokens[converged:]]
+        self._states[index:] = new_states + self._states[converged:]
+        return ntokens, old_tokens, tokens
+
+
+class LexedStream(object):
+    """
+    Lexes a text that arrives in pieces, such as the output of ``tail -f``.
+    `feed` returns the tokens of the complete lines received so far, and
+    `close` those of the rest.
+
+    For lexers based on `RegexLexer` and `ExtendedRegexLexer` that don't
+    override `get_tokens_unprocessed`, lexing continues with the state the
+    lexer had at the end of the previous lines, so constructs that the lexer
+    handles with states, like strings or comments spanning several lines,
+    are lexed as in the complete text.  A rule matching several lines at
+    once only matches if they are fed together.  Other lexers lex the lines
+    of each call to `feed` separately.
+
+    Newlines are normalized, tabs expanded and the filters of the lexer
+    applied like by `Lexer.get_tokens`, but the ``stripnl`` and ``stripall``
+    options are ignored.
+
+    .. versionadded:: 2.3
+    """
+
+    def __init__(self, lexer):
+        self.lexer = lexer
+        self._resumable = _resumes_at_checkpoints(lexer)
+        self._state = None
+        self._rest = u''
+        self._started = False
+
+    def feed(self, text):
+        """
+        Add `text` and return the tokens of the lines it completes, as a
+        list of ``(tokentype, value)`` pairs.
+        """
+        text = self._rest + text
+        end = text.rfind(u'\n') + 1
+        self._rest = text[end:]
+        return self._lex(text[:end])
+
+    def close(self):
+        """Return the tokens of the text after the last newline."""
+        text, self._rest = self._rest, u''
+        if text and self.lexer.ensurenl:
+            text += u'\n'
+        return self._lex(text)
+
+    def _lex(self, text):
+        if not self._started and text:
+            self._started = True
+            if text.startswith(u'\ufeff'):
+                text = text[len(u'\ufeff'):]
+        if not text:
+            return []
+        text = text.replace(u'\r\n', u'\n').replace(u'\r', u'\n')
+        if self.lexer.tabsize > 0:
+            text = text.expandtabs(self.lexer.tabsize)
+        if self._resumable:
+            checkpoints = []
+            tokens = self.lexer._get_tokens_from(text, 0, self._state,
+                                                 checkpoints)
+        else:
+            tokens = self.lexer.get_tokens_unprocessed(text)
+        stream = ((t, v) for _, t, v in tokens)
+        if self.lexer.filters:
+            stream = apply_filters(stream, self.lexer.filters, self.lexer)
+        result = list(stream)
+        if self._resumable:
+            # the lexer records its state when it reaches the end of the
+            # last line
+            if checkpoints and checkpoints[-1][0] == len(text):
+                self._state = checkpoints[-1][1]
+            else:
+                self._state = None
+        return result
+
+
 def do_insertions(insertions, tokens):
     """
     Helper for lexers which must combine the results of several
@@ -818,54 +2528,33 @@ def do_insertions(insertions, tokens):
             break  # not strictly necessary
 
 
-class ProfilingRegexLexerMeta(RegexLexerMeta):
-    """Metaclass for ProfilingRegexLexer, collects regex timing info."""
-
-    def _process_regex(cls, regex, rflags, state):
-        if isinstance(regex, words):
-            rex = regex_opt(regex.words, prefix=regex.prefix,
-                            suffix=regex.suffix)
-        else:
-            rex = regex
-        compiled = re.compile(rex, rflags)
-
-        def match_func(text, pos, endpos=sys.maxsize):
-            info = cls._prof_data[-1].setdefault((state, rex), [0, 0.0])
-            t0 = time.time()
-            res = compiled.match(text, pos, endpos)
-            t1 = time.time()
-            info[0] += 1
-            info[1] += t1 - t0
-            return res
-        return match_func
+# kept for compatibility, profiling doesn't need a metaclass anymore
+ProfilingRegexLexerMeta = RegexLexerMeta
 
 
-@add_metaclass(ProfilingRegexLexerMeta)
 class ProfilingRegexLexer(RegexLexer):
-    """Drop-in replacement for RegexLexer that does profiling of its regexes."""
+    """
+    Drop-in replacement for RegexLexer that prints a profile of its regexes
+    after lexing.  `pygments.regexprofile.RegexProfile` collects the same
+    data for any lexer class, without changing its base class.
+    """
 
-    _prof_data = []
     _prof_sort_index = 4  # defaults to time per call
 
     def get_tokens_unprocessed(self, text, stack=('root',)):
-        # this needs to be a stack, since using(this) will produce nested calls
-        self.__class__._prof_data.append({})
-        for tok in RegexLexer.get_tokens_unprocessed(self, text, stack):
-            yield tok
-        rawdata = self.__class__._prof_data.pop()
-        data = sorted(((s, repr(r).strip('u\'').replace('\\\\', '\\')[:65],
-                        n, 1000 * t, 1000 * t / n)
-                       for ((s, r), (n, t)) in rawdata.items()),
-                      key=lambda x: x[self._prof_sort_index],
-                      reverse=True)
-        sum_total = sum(x[3] for x in data)
-
+        from pygments.regexprofile import RegexProfile, get_profile
+        cls = self.__class__
+        if get_profile(cls) is not None:
+            # nested call from using(this), counted in the outer profile
+            for tok in RegexLexer.get_tokens_unprocessed(self, text, stack):
+                yield tok
+            return
+        profile = RegexProfile()
+        with profile.enabled(cls):
+            for tok in RegexLexer.get_tokens_unprocessed(self, text, stack):
+                yield tok
         print()
         print('Profiling result for %s lexing %d chars in %.3f ms' %
-              (self.__class__.__name__, len(text), sum_total))
-        print('=' * 110)
-        print('%-20s %-64s ncalls  tottime  percall' % ('state', 'regex'))
-        print('-' * 110)
-        for d in data:
-            print('%-20s %-65s %5d %8.4f %8.4f' % d)
-        print('=' * 110)
+              (cls.__name__, len(text), 1000 * profile.total_time()))
+        profile.report(sort=('state', 'regex', 'attempts', 'time',
+                             'percall')[self._prof_sort_index])
@@ -15,7 +15,9 @@ import types
 import fnmatch
 from os.path import basename
 
-from pygments.lexers._mapping import LEXERS
+from pygments.lexers._mapping import LEXERS, ANALYSERS, ALIASES, MIMETYPES, \
+    FILENAMES, SUFFIXES, PATTERNS
+from pygments.lexer import Lexer
 from pygments.modeline import get_filetype_from_buffer
 from pygments.plugin import find_plugin_lexers
 from pygments.util import ClassNotFound, itervalues, guess_decode
@@ -44,6 +46,15 @@ def _load_lexers(module_name):
         _lexer_cache[cls.name] = cls
 
 
+def _get_lexer_class(key):
+    """Return the builtin lexer class with the name `key`, loading it if
+    necessary."""
+    module_name, name = LEXERS[key][:2]
+    if name not in _lexer_cache:
+        _load_lexers(module_name)
+    return _lexer_cache[name]
+
+
 def get_all_lexers():
     """Return a generator of tuples in the form ``(name, aliases,
     filenames, mimetypes)`` of all know lexers.
@@ -82,11 +93,9 @@ def find_lexer_class_by_name(_alias):
     if not _alias:
         raise ClassNotFound('no lexer for alias %r found' % _alias)
     # lookup builtin lexers
-    for module_name, name, aliases, _, _ in itervalues(LEXERS):
-        if _alias.lower() in aliases:
-            if name not in _lexer_cache:
-                _load_lexers(module_name)
-            return _lexer_cache[name]
+    key = ALIASES.get(_alias.lower())
+    if key:
+        return _get_lexer_class(key)
     # continue with lexers from setuptools entrypoints
     for cls in find_plugin_lexers():
         if _alias.lower() in cls.aliases:
@@ -103,11 +112,9 @@ def get_lexer_by_name(_alias, **options):
         raise ClassNotFound('no lexer for alias %r found' % _alias)
 
     # lookup builtin lexers
-    for module_name, name, aliases, _, _ in itervalues(LEXERS):
-        if _alias.lower() in aliases:
-            if name not in _lexer_cache:
-                _load_lexers(module_name)
-            return _lexer_cache[name](**options)
+    key = ALIASES.get(_alias.lower())
+    if key:
+        return _get_lexer_class(key)(**options)
     # continue with lexers from setuptools entrypoints
     for cls in find_plugin_lexers():
         if _alias.lower() in cls.aliases:
@@ -159,12 +166,14 @@ def find_lexer_class_for_filename(_fn, code=None):
     """
     matches = []
     fn = basename(_fn)
-    for modname, name, _, filenames, _ in itervalues(LEXERS):
-        for filename in filenames:
-            if _fn_matches(fn, filename):
-                if name not in _lexer_cache:
-                    _load_lexers(modname)
-                matches.append((_lexer_cache[name], filename))
+    for key in FILENAMES.get(fn, ()):
+        matches.append((_get_lexer_class(key), fn))
+    for i in range(len(fn) + 1):
+        for key in SUFFIXES.get(fn[i:], ()):
+            matches.append((_get_lexer_class(key), '*' + fn[i:]))
+    for key, filename in PATTERNS:
+        if _fn_matches(fn, filename):
+            matches.append((_get_lexer_class(key), filename))
     for cls in find_plugin_lexers():
         for filename in cls.filenames:
             if _fn_matches(fn, filename):
@@ -211,11 +220,9 @@ def get_lexer_for_mimetype(_mime, **options):
 
     Raises ClassNotFound if not found.
     """
-    for modname, name, _, _, mimetypes in itervalues(LEXERS):
-        if _mime in mimetypes:
-            if name not in _lexer_cache:
-                _load_lexers(modname)
-            return _lexer_cache[name](**options)
+    key = MIMETYPES.get(_mime)
+    if key:
+        return _get_lexer_class(key)(**options)
     for cls in find_plugin_lexers():
         if _mime in cls.mimetypes:
             return cls(**options)
@@ -225,15 +232,24 @@ def get_lexer_for_mimetype(_mime, **options):
 def _iter_lexerclasses(plugins=True):
     """Return an iterator over all lexer classes."""
     for key in sorted(LEXERS):
-        module_name, name = LEXERS[key][:2]
-        if name not in _lexer_cache:
-            _load_lexers(module_name)
-        yield _lexer_cache[name]
+        yield _get_lexer_class(key)
     if plugins:
         for lexer in find_plugin_lexers():
             yield lexer
 
 
+def _iter_analysing_lexerclasses():
+    """Return an iterator over the lexer classes that can recognize a text,
+    in the order of `_iter_lexerclasses`.  Modules without such lexers are
+    not imported.
+    """
+    for key in ANALYSERS:
+        yield _get_lexer_class(key)
+    for lexer in find_plugin_lexers():
+        if lexer.analyse_text is not Lexer.analyse_text:
+            yield lexer
+
+
 def guess_lexer_for_filename(_fn, _text, **options):
     """
     Lookup all lexers that handle those filenames primary (``filenames``)
@@ -298,7 +314,7 @@ def guess_lexer(_text, **options):
             pass
 
     best_lexer = [0.0, None]
-    for lexer in _iter_lexerclasses():
+    for lexer in _iter_analysing_lexerclasses():
         rv = lexer.analyse_text(_text)
         if rv == 1.0:
             return lexer(**options)
@@ -56,6 +56,7 @@ LEXERS = {
     'BatchLexer': ('pygments.lexers.shell', 'Batchfile', ('bat', 'batch', 'dosbatch', 'winbatch'), ('*.bat', '*.cmd'), ('application/x-dos-batch',)),
     'BefungeLexer': ('pygments.lexers.esoteric', 'Befunge', ('befunge',), ('*.befunge',), ('application/x-befunge',)),
     'BibTeXLexer': ('pygments.lexers.bibtex', 'BibTeX', ('bib', 'bibtex'), ('*.bib',), ('text/x-bibtex',)),
+    'BinaryTokenLexer': ('pygments.lexers.special', 'Binary token data', ('binarytokens',), (), ('application/x-pygments-binary-tokens',)),
     'BlitzBasicLexer': ('pygments.lexers.basic', 'BlitzBasic', ('blitzbasic', 'b3d', 'bplus'), ('*.bb', '*.decls'), ('text/x-bb',)),
     'BlitzMaxLexer': ('pygments.lexers.basic', 'BlitzMax', ('blitzmax', 'bmax'), ('*.bmx',), ('text/x-bmx',)),
     'BnfLexer': ('pygments.lexers.grammar_notation', 'BNF', ('bnf',), ('*.bnf',), ('text/x-bnf',)),
@@ -453,13 +454,1837 @@ LEXERS = {
     'ZephirLexer': ('pygments.lexers.php', 'Zephir', ('zephir',), ('*.zep',), ()),
 }
 
+# lexers with an analyse_text method, the only ones worth trying when
+# guessing the lexer of a text
+ANALYSERS = (
+    'ActionScript3Lexer',
+    'AntlrActionScriptLexer',
+    'AntlrCSharpLexer',
+    'AntlrCppLexer',
+    'AntlrJavaLexer',
+    'AntlrLexer',
+    'AntlrObjectiveCLexer',
+    'AntlrPerlLexer',
+    'AntlrPythonLexer',
+    'AntlrRubyLexer',
+    'ArduinoLexer',
+    'BashLexer',
+    'BugsLexer',
+    'CLexer',
+    'CMakeLexer',
+    'CSharpAspxLexer',
+    'Ca65Lexer',
+    'CbmBasicV2Lexer',
+    'CoqLexer',
+    'CppLexer',
+    'CssDjangoLexer',
+    'CssErbLexer',
+    'CssGenshiLexer',
+    'CssPhpLexer',
+    'CssSmartyLexer',
+    'CudaLexer',
+    'DiffLexer',
+    'DjangoLexer',
+    'DtdLexer',
+    'ECLexer',
+    'EasytrieveLexer',
+    'ErbLexer',
+    'GasLexer',
+    'GenshiLexer',
+    'GroffLexer',
+    'GroovyLexer',
+    'HaxeLexer',
+    'HtmlDjangoLexer',
+    'HtmlGenshiLexer',
+    'HtmlLexer',
+    'HtmlPhpLexer',
+    'HtmlSmartyLexer',
+    'HttpLexer',
+    'HyLexer',
+    'IniLexer',
+    'JagsLexer',
+    'JasminLexer',
+    'JavascriptDjangoLexer',
+    'JavascriptErbLexer',
+    'JavascriptGenshiLexer',
+    'JavascriptPhpLexer',
+    'JavascriptSmartyLexer',
+    'JclLexer',
+    'JspLexer',
+    'JuliaLexer',
+    'LassoCssLexer',
+    'LassoHtmlLexer',
+    'LassoJavascriptLexer',
+    'LassoLexer',
+    'LassoXmlLexer',
+    'LimboLexer',
+    'LogosLexer',
+    'LogtalkLexer',
+    'MakefileLexer',
+    'MasonLexer',
+    'MatlabLexer',
+    'MqlLexer',
+    'NesCLexer',
+    'NixLexer',
+    'NumPyLexer',
+    'ObjectiveCLexer',
+    'ObjectiveCppLexer',
+    'ObjectiveJLexer',
+    'Perl6Lexer',
+    'PerlLexer',
+    'PhpLexer',
+    'PikeLexer',
+    'PrologLexer',
+    'Python3Lexer',
+    'PythonLexer',
+    'QBasicLexer',
+    'RagelCLexer',
+    'RagelCppLexer',
+    'RagelDLexer',
+    'RagelEmbeddedLexer',
+    'RagelJavaLexer',
+    'RagelObjectiveCLexer',
+    'RagelRubyLexer',
+    'RebolLexer',
+    'RegeditLexer',
+    'ResourceLexer',
+    'RexxLexer',
+    'RhtmlLexer',
+    'RslLexer',
+    'RstLexer',
+    'RubyLexer',
+    'SLexer',
+    'SmaliLexer',
+    'SmartyLexer',
+    'SourcesListLexer',
+    'SspLexer',
+    'StanLexer',
+    'SwigLexer',
+    'TclLexer',
+    'TeaTemplateLexer',
+    'TexLexer',
+    'TextLexer',
+    'TypeScriptLexer',
+    'TypoScriptLexer',
+    'VCLLexer',
+    'VCLSnippetLexer',
+    'VbNetAspxLexer',
+    'VbNetLexer',
+    'VelocityLexer',
+    'VelocityXmlLexer',
+    'XmlDjangoLexer',
+    'XmlErbLexer',
+    'XmlLexer',
+    'XmlPhpLexer',
+    'XmlSmartyLexer',
+    'XsltLexer',
+)
+
+# indexes of LEXERS by alias, mimetype, file name and file name suffix
+# (for patterns like "*.py"); PATTERNS holds the other file name patterns
+ALIASES = {
+    'abap': 'ABAPLexer',
+    'abl': 'OpenEdgeLexer',
+    'abnf': 'AbnfLexer',
+    'aconf': 'ApacheConfLexer',
+    'actionscript': 'ActionScriptLexer',
+    'actionscript3': 'ActionScript3Lexer',
+    'ada': 'AdaLexer',
+    'ada2005': 'AdaLexer',
+    'ada95': 'AdaLexer',
+    'adl': 'AdlLexer',
+    'agda': 'AgdaLexer',
+    'aheui': 'AheuiLexer',
+    'ahk': 'AutohotkeyLexer',
+    'alloy': 'AlloyLexer',
+    'ambienttalk': 'AmbientTalkLexer',
+    'ambienttalk/2': 'AmbientTalkLexer',
+    'ampl': 'AmplLexer',
+    'antlr': 'AntlrLexer',
+    'antlr-actionscript': 'AntlrActionScriptLexer',
+    'antlr-as': 'AntlrActionScriptLexer',
+    'antlr-c#': 'AntlrCSharpLexer',
+    'antlr-cpp': 'AntlrCppLexer',
+    'antlr-csharp': 'AntlrCSharpLexer',
+    'antlr-java': 'AntlrJavaLexer',
+    'antlr-objc': 'AntlrObjectiveCLexer',
+    'antlr-perl': 'AntlrPerlLexer',
+    'antlr-python': 'AntlrPythonLexer',
+    'antlr-rb': 'AntlrRubyLexer',
+    'antlr-ruby': 'AntlrRubyLexer',
+    'apache': 'ApacheConfLexer',
+    'apacheconf': 'ApacheConfLexer',
+    'apl': 'APLLexer',
+    'applescript': 'AppleScriptLexer',
+    'arduino': 'ArduinoLexer',
+    'arexx': 'RexxLexer',
+    'as': 'ActionScriptLexer',
+    'as3': 'ActionScript3Lexer',
+    'asm': 'GasLexer',
+    'aspectj': 'AspectJLexer',
+    'aspx-cs': 'CSharpAspxLexer',
+    'aspx-vb': 'VbNetAspxLexer',
+    'asy': 'AsymptoteLexer',
+    'asymptote': 'AsymptoteLexer',
+    'at': 'AmbientTalkLexer',
+    'autohotkey': 'AutohotkeyLexer',
+    'autoit': 'AutoItLexer',
+    'awk': 'AwkLexer',
+    'b3d': 'BlitzBasicLexer',
+    'basemake': 'BaseMakefileLexer',
+    'bash': 'BashLexer',
+    'basic': 'QBasicLexer',
+    'bat': 'BatchLexer',
+    'batch': 'BatchLexer',
+    'bbcode': 'BBCodeLexer',
+    'bc': 'BCLexer',
+    'befunge': 'BefungeLexer',
+    'bf': 'BrainfuckLexer',
+    'bib': 'BibTeXLexer',
+    'bibtex': 'BibTeXLexer',
+    'binarytokens': 'BinaryTokenLexer',
+    'blitzbasic': 'BlitzBasicLexer',
+    'blitzmax': 'BlitzMaxLexer',
+    'bmax': 'BlitzMaxLexer',
+    'bnf': 'BnfLexer',
+    'boo': 'BooLexer',
+    'boogie': 'BoogieLexer',
+    'bplus': 'BlitzBasicLexer',
+    'brainfuck': 'BrainfuckLexer',
+    'bro': 'BroLexer',
+    'bsdmake': 'MakefileLexer',
+    'bst': 'BSTLexer',
+    'bst-pybtex': 'BSTLexer',
+    'bugs': 'BugsLexer',
+    'c': 'CLexer',
+    'c#': 'CSharpLexer',
+    'c++': 'CppLexer',
+    'c++-objdumb': 'CppObjdumpLexer',
+    'c-objdump': 'CObjdumpLexer',
+    'ca65': 'Ca65Lexer',
+    'cadl': 'CadlLexer',
+    'camkes': 'CAmkESLexer',
+    'capdl': 'CapDLLexer',
+    'capnp': 'CapnProtoLexer',
+    'cbmbas': 'CbmBasicV2Lexer',
+    'ceylon': 'CeylonLexer',
+    'cf3': 'Cfengine3Lexer',
+    'cfc': 'ColdfusionCFCLexer',
+    'cfengine3': 'Cfengine3Lexer',
+    'cfg': 'IniLexer',
+    'cfm': 'ColdfusionHtmlLexer',
+    'cfs': 'ColdfusionLexer',
+    'chai': 'ChaiscriptLexer',
+    'chaiscript': 'ChaiscriptLexer',
+    'chapel': 'ChapelLexer',
+    'cheetah': 'CheetahLexer',
+    'chpl': 'ChapelLexer',
+    'cirru': 'CirruLexer',
+    'cl': 'CommonLispLexer',
+    'clay': 'ClayLexer',
+    'clean': 'CleanLexer',
+    'clipper': 'FoxProLexer',
+    'clj': 'ClojureLexer',
+    'cljs': 'ClojureScriptLexer',
+    'clojure': 'ClojureLexer',
+    'clojurescript': 'ClojureScriptLexer',
+    'cmake': 'CMakeLexer',
+    'cobol': 'CobolLexer',
+    'cobolfree': 'CobolFreeformatLexer',
+    'coffee': 'CoffeeScriptLexer',
+    'coffee-script': 'CoffeeScriptLexer',
+    'coffeescript': 'CoffeeScriptLexer',
+    'common-lisp': 'CommonLispLexer',
+    'componentpascal': 'ComponentPascalLexer',
+    'console': 'BashSessionLexer',
+    'control': 'DebianControlLexer',
+    'coq': 'CoqLexer',
+    'cp': 'ComponentPascalLexer',
+    'cpp': 'CppLexer',
+    'cpp-objdump': 'CppObjdumpLexer',
+    'cpsa': 'CPSALexer',
+    'cr': 'CrystalLexer',
+    'crmsh': 'CrmshLexer',
+    'croc': 'CrocLexer',
+    'cry': 'CryptolLexer',
+    'cryptol': 'CryptolLexer',
+    'crystal': 'CrystalLexer',
+    'csh': 'TcshLexer',
+    'csharp': 'CSharpLexer',
+    'csound': 'CsoundOrchestraLexer',
+    'csound-csd': 'CsoundDocumentLexer',
+    'csound-document': 'CsoundDocumentLexer',
+    'csound-orc': 'CsoundOrchestraLexer',
+    'csound-sco': 'CsoundScoreLexer',
+    'csound-score': 'CsoundScoreLexer',
+    'css': 'CssLexer',
+    'css+django': 'CssDjangoLexer',
+    'css+erb': 'CssErbLexer',
+    'css+genshi': 'CssGenshiLexer',
+    'css+genshitext': 'CssGenshiLexer',
+    'css+jinja': 'CssDjangoLexer',
+    'css+lasso': 'LassoCssLexer',
+    'css+mako': 'MakoCssLexer',
+    'css+mozpreproc': 'MozPreprocCssLexer',
+    'css+myghty': 'MyghtyCssLexer',
+    'css+php': 'CssPhpLexer',
+    'css+ruby': 'CssErbLexer',
+    'css+smarty': 'CssSmartyLexer',
+    'cu': 'CudaLexer',
+    'cucumber': 'GherkinLexer',
+    'cuda': 'CudaLexer',
+    'cxx-objdump': 'CppObjdumpLexer',
+    'cypher': 'CypherLexer',
+    'cython': 'CythonLexer',
+    'd': 'DLexer',
+    'd-objdump': 'DObjdumpLexer',
+    'dart': 'DartLexer',
+    'debcontrol': 'DebianControlLexer',
+    'debsources': 'SourcesListLexer',
+    'delphi': 'DelphiLexer',
+    'dg': 'DgLexer',
+    'diff': 'DiffLexer',
+    'django': 'DjangoLexer',
+    'do': 'StataLexer',
+    'docker': 'DockerLexer',
+    'dockerfile': 'DockerLexer',
+    'dosbatch': 'BatchLexer',
+    'doscon': 'MSDOSSessionLexer',
+    'dosini': 'IniLexer',
+    'dpatch': 'DarcsPatchLexer',
+    'dtd': 'DtdLexer',
+    'duby': 'RubyLexer',
+    'duel': 'DuelLexer',
+    'dylan': 'DylanLexer',
+    'dylan-console': 'DylanConsoleLexer',
+    'dylan-lid': 'DylanLidLexer',
+    'dylan-repl': 'DylanConsoleLexer',
+    'earl-grey': 'EarlGreyLexer',
+    'earlgrey': 'EarlGreyLexer',
+    'easytrieve': 'EasytrieveLexer',
+    'ebnf': 'EbnfLexer',
+    'ec': 'ECLexer',
+    'ecl': 'ECLLexer',
+    'eg': 'EarlGreyLexer',
+    'eiffel': 'EiffelLexer',
+    'elisp': 'EmacsLispLexer',
+    'elixir': 'ElixirLexer',
+    'elm': 'ElmLexer',
+    'emacs': 'EmacsLispLexer',
+    'emacs-lisp': 'EmacsLispLexer',
+    'erb': 'ErbLexer',
+    'erl': 'ErlangShellLexer',
+    'erlang': 'ErlangLexer',
+    'evoque': 'EvoqueLexer',
+    'ex': 'ElixirLexer',
+    'exs': 'ElixirLexer',
+    'extempore': 'XtlangLexer',
+    'ezhil': 'EzhilLexer',
+    'factor': 'FactorLexer',
+    'fan': 'FantomLexer',
+    'fancy': 'FancyLexer',
+    'felix': 'FelixLexer',
+    'fish': 'FishShellLexer',
+    'fishshell': 'FishShellLexer',
+    'flatline': 'FlatlineLexer',
+    'flx': 'FelixLexer',
+    'forth': 'ForthLexer',
+    'fortran': 'FortranLexer',
+    'fortranfixed': 'FortranFixedLexer',
+    'foxpro': 'FoxProLexer',
+    'fsharp': 'FSharpLexer',
+    'fy': 'FancyLexer',
+    'gap': 'GAPLexer',
+    'gas': 'GasLexer',
+    'gawk': 'AwkLexer',
+    'genshi': 'GenshiLexer',
+    'genshitext': 'GenshiTextLexer',
+    'gherkin': 'GherkinLexer',
+    'glsl': 'GLShaderLexer',
+    'gnuplot': 'GnuplotLexer',
+    'go': 'GoLexer',
+    'golo': 'GoloLexer',
+    'gooddata-cl': 'GoodDataCLLexer',
+    'gosu': 'GosuLexer',
+    'groff': 'GroffLexer',
+    'groovy': 'GroovyLexer',
+    'gst': 'GosuTemplateLexer',
+    'haml': 'HamlLexer',
+    'handlebars': 'HandlebarsLexer',
+    'haskell': 'HaskellLexer',
+    'haxe': 'HaxeLexer',
+    'haxeml': 'HxmlLexer',
+    'hexdump': 'HexdumpLexer',
+    'hs': 'HaskellLexer',
+    'hsa': 'HsailLexer',
+    'hsail': 'HsailLexer',
+    'html': 'HtmlLexer',
+    'html+cheetah': 'CheetahHtmlLexer',
+    'html+django': 'HtmlDjangoLexer',
+    'html+erb': 'RhtmlLexer',
+    'html+evoque': 'EvoqueHtmlLexer',
+    'html+genshi': 'HtmlGenshiLexer',
+    'html+handlebars': 'HandlebarsHtmlLexer',
+    'html+jinja': 'HtmlDjangoLexer',
+    'html+kid': 'HtmlGenshiLexer',
+    'html+lasso': 'LassoHtmlLexer',
+    'html+mako': 'MakoHtmlLexer',
+    'html+myghty': 'MyghtyHtmlLexer',
+    'html+ng2': 'Angular2HtmlLexer',
+    'html+php': 'HtmlPhpLexer',
+    'html+ruby': 'RhtmlLexer',
+    'html+smarty': 'HtmlSmartyLexer',
+    'html+spitfire': 'CheetahHtmlLexer',
+    'html+twig': 'TwigHtmlLexer',
+    'html+velocity': 'VelocityHtmlLexer',
+    'htmlcheetah': 'CheetahHtmlLexer',
+    'htmldjango': 'HtmlDjangoLexer',
+    'http': 'HttpLexer',
+    'hx': 'HaxeLexer',
+    'hxml': 'HxmlLexer',
+    'hxsl': 'HaxeLexer',
+    'hy': 'HybrisLexer',
+    'hybris': 'HybrisLexer',
+    'hylang': 'HyLexer',
+    'i6': 'Inform6Lexer',
+    'i6t': 'Inform6TemplateLexer',
+    'i7': 'Inform7Lexer',
+    'idl': 'IDLLexer',
+    'idl4': 'CAmkESLexer',
+    'idr': 'IdrisLexer',
+    'idris': 'IdrisLexer',
+    'iex': 'ElixirConsoleLexer',
+    'igor': 'IgorLexer',
+    'igorpro': 'IgorLexer',
+    'ik': 'IokeLexer',
+    'inform6': 'Inform6Lexer',
+    'inform7': 'Inform7Lexer',
+    'ini': 'IniLexer',
+    'io': 'IoLexer',
+    'ioke': 'IokeLexer',
+    'irb': 'RubyConsoleLexer',
+    'irc': 'IrcLogsLexer',
+    'isabelle': 'IsabelleLexer',
+    'j': 'JLexer',
+    'jade': 'PugLexer',
+    'jags': 'JagsLexer',
+    'jasmin': 'JasminLexer',
+    'jasminxt': 'JasminLexer',
+    'java': 'JavaLexer',
+    'javascript': 'JavascriptLexer',
+    'javascript+cheetah': 'CheetahJavascriptLexer',
+    'javascript+django': 'JavascriptDjangoLexer',
+    'javascript+erb': 'JavascriptErbLexer',
+    'javascript+genshi': 'JavascriptGenshiLexer',
+    'javascript+genshitext': 'JavascriptGenshiLexer',
+    'javascript+jinja': 'JavascriptDjangoLexer',
+    'javascript+lasso': 'LassoJavascriptLexer',
+    'javascript+mako': 'MakoJavascriptLexer',
+    'javascript+mozpreproc': 'MozPreprocJavascriptLexer',
+    'javascript+myghty': 'MyghtyJavascriptLexer',
+    'javascript+php': 'JavascriptPhpLexer',
+    'javascript+ruby': 'JavascriptErbLexer',
+    'javascript+smarty': 'JavascriptSmartyLexer',
+    'javascript+spitfire': 'CheetahJavascriptLexer',
+    'jbst': 'DuelLexer',
+    'jcl': 'JclLexer',
+    'jinja': 'DjangoLexer',
+    'jl': 'JuliaLexer',
+    'jlcon': 'JuliaConsoleLexer',
+    'jproperties': 'PropertiesLexer',
+    'js': 'JavascriptLexer',
+    'js+cheetah': 'CheetahJavascriptLexer',
+    'js+django': 'JavascriptDjangoLexer',
+    'js+erb': 'JavascriptErbLexer',
+    'js+genshi': 'JavascriptGenshiLexer',
+    'js+genshitext': 'JavascriptGenshiLexer',
+    'js+jinja': 'JavascriptDjangoLexer',
+    'js+lasso': 'LassoJavascriptLexer',
+    'js+mako': 'MakoJavascriptLexer',
+    'js+myghty': 'MyghtyJavascriptLexer',
+    'js+php': 'JavascriptPhpLexer',
+    'js+ruby': 'JavascriptErbLexer',
+    'js+smarty': 'JavascriptSmartyLexer',
+    'js+spitfire': 'CheetahJavascriptLexer',
+    'jsgf': 'JsgfLexer',
+    'json': 'JsonLexer',
+    'json-ld': 'JsonLdLexer',
+    'json-object': 'JsonBareObjectLexer',
+    'jsonld': 'JsonLdLexer',
+    'jsonml+bst': 'DuelLexer',
+    'jsp': 'JspLexer',
+    'julia': 'JuliaLexer',
+    'juttle': 'JuttleLexer',
+    'kal': 'KalLexer',
+    'kconfig': 'KconfigLexer',
+    'kernel-config': 'KconfigLexer',
+    'kid': 'GenshiLexer',
+    'koka': 'KokaLexer',
+    'kotlin': 'KotlinLexer',
+    'ksh': 'BashLexer',
+    'lagda': 'LiterateAgdaLexer',
+    'lasso': 'LassoLexer',
+    'lassoscript': 'LassoLexer',
+    'latex': 'TexLexer',
+    'lcry': 'LiterateCryptolLexer',
+    'lcryptol': 'LiterateCryptolLexer',
+    'lean': 'LeanLexer',
+    'less': 'LessCssLexer',
+    'lhaskell': 'LiterateHaskellLexer',
+    'lhs': 'LiterateHaskellLexer',
+    'lid': 'DylanLidLexer',
+    'lidr': 'LiterateIdrisLexer',
+    'lidris': 'LiterateIdrisLexer',
+    'lighttpd': 'LighttpdConfLexer',
+    'lighty': 'LighttpdConfLexer',
+    'limbo': 'LimboLexer',
+    'linux-config': 'KconfigLexer',
+    'liquid': 'LiquidLexer',
+    'lisp': 'CommonLispLexer',
+    'literate-agda': 'LiterateAgdaLexer',
+    'literate-cryptol': 'LiterateCryptolLexer',
+    'literate-haskell': 'LiterateHaskellLexer',
+    'literate-idris': 'LiterateIdrisLexer',
+    'live-script': 'LiveScriptLexer',
+    'livescript': 'LiveScriptLexer',
+    'llvm': 'LlvmLexer',
+    'logos': 'LogosLexer',
+    'logtalk': 'LogtalkLexer',
+    'lsl': 'LSLLexer',
+    'lua': 'LuaLexer',
+    'm2': 'Modula2Lexer',
+    'make': 'MakefileLexer',
+    'makefile': 'MakefileLexer',
+    'mako': 'MakoLexer',
+    'man': 'GroffLexer',
+    'maql': 'MaqlLexer',
+    'mask': 'MaskLexer',
+    'mason': 'MasonLexer',
+    'mathematica': 'MathematicaLexer',
+    'matlab': 'MatlabLexer',
+    'matlabsession': 'MatlabSessionLexer',
+    'mawk': 'AwkLexer',
+    'md': 'MarkdownLexer',
+    'menuconfig': 'KconfigLexer',
+    'mf': 'MakefileLexer',
+    'minid': 'MiniDLexer',
+    'mma': 'MathematicaLexer',
+    'modelica': 'ModelicaLexer',
+    'modula2': 'Modula2Lexer',
+    'moin': 'MoinWikiLexer',
+    'monkey': 'MonkeyLexer',
+    'monte': 'MonteLexer',
+    'moo': 'MOOCodeLexer',
+    'moocode': 'MOOCodeLexer',
+    'moon': 'MoonScriptLexer',
+    'moonscript': 'MoonScriptLexer',
+    'mozhashpreproc': 'MozPreprocHashLexer',
+    'mozpercentpreproc': 'MozPreprocPercentLexer',
+    'mq4': 'MqlLexer',
+    'mq5': 'MqlLexer',
+    'mql': 'MqlLexer',
+    'mql4': 'MqlLexer',
+    'mql5': 'MqlLexer',
+    'msc': 'MscgenLexer',
+    'mscgen': 'MscgenLexer',
+    'mupad': 'MuPADLexer',
+    'mxml': 'MxmlLexer',
+    'myghty': 'MyghtyLexer',
+    'mysql': 'MySqlLexer',
+    'nasm': 'NasmLexer',
+    'nawk': 'AwkLexer',
+    'nb': 'MathematicaLexer',
+    'ncl': 'NCLLexer',
+    'nemerle': 'NemerleLexer',
+    'nesc': 'NesCLexer',
+    'newlisp': 'NewLispLexer',
+    'newspeak': 'NewspeakLexer',
+    'ng2': 'Angular2Lexer',
+    'nginx': 'NginxConfLexer',
+    'nim': 'NimrodLexer',
+    'nimrod': 'NimrodLexer',
+    'nit': 'NitLexer',
+    'nix': 'NixLexer',
+    'nixos': 'NixLexer',
+    'nroff': 'GroffLexer',
+    'nsh': 'NSISLexer',
+    'nsi': 'NSISLexer',
+    'nsis': 'NSISLexer',
+    'numpy': 'NumPyLexer',
+    'nusmv': 'NuSMVLexer',
+    'obj-c': 'ObjectiveCLexer',
+    'obj-c++': 'ObjectiveCppLexer',
+    'obj-j': 'ObjectiveJLexer',
+    'objc': 'ObjectiveCLexer',
+    'objc++': 'ObjectiveCppLexer',
+    'objdump': 'ObjdumpLexer',
+    'objdump-nasm': 'NasmObjdumpLexer',
+    'objective-c': 'ObjectiveCLexer',
+    'objective-c++': 'ObjectiveCppLexer',
+    'objective-j': 'ObjectiveJLexer',
+    'objectivec': 'ObjectiveCLexer',
+    'objectivec++': 'ObjectiveCppLexer',
+    'objectivej': 'ObjectiveJLexer',
+    'objectpascal': 'DelphiLexer',
+    'objj': 'ObjectiveJLexer',
+    'ocaml': 'OcamlLexer',
+    'octave': 'OctaveLexer',
+    'odin': 'OdinLexer',
+    'ooc': 'OocLexer',
+    'opa': 'OpaLexer',
+    'openbugs': 'BugsLexer',
+    'openedge': 'OpenEdgeLexer',
+    'pacmanconf': 'PacmanConfLexer',
+    'pan': 'PanLexer',
+    'parasail': 'ParaSailLexer',
+    'pas': 'DelphiLexer',
+    'pascal': 'DelphiLexer',
+    'pawn': 'PawnLexer',
+    'pcmk': 'CrmshLexer',
+    'perl': 'PerlLexer',
+    'perl6': 'Perl6Lexer',
+    'php': 'PhpLexer',
+    'php3': 'PhpLexer',
+    'php4': 'PhpLexer',
+    'php5': 'PhpLexer',
+    'pig': 'PigLexer',
+    'pike': 'PikeLexer',
+    'pkgconfig': 'PkgConfigLexer',
+    'pl': 'PerlLexer',
+    'pl6': 'Perl6Lexer',
+    'plpgsql': 'PlPgsqlLexer',
+    'po': 'GettextLexer',
+    'posh': 'PowerShellLexer',
+    'postgres': 'PostgresLexer',
+    'postgres-console': 'PostgresConsoleLexer',
+    'postgresql': 'PostgresLexer',
+    'postgresql-console': 'PostgresConsoleLexer',
+    'postscr': 'PostScriptLexer',
+    'postscript': 'PostScriptLexer',
+    'pot': 'GettextLexer',
+    'pov': 'PovrayLexer',
+    'powershell': 'PowerShellLexer',
+    'praat': 'PraatLexer',
+    'progress': 'OpenEdgeLexer',
+    'prolog': 'PrologLexer',
+    'properties': 'PropertiesLexer',
+    'proto': 'ProtoBufLexer',
+    'protobuf': 'ProtoBufLexer',
+    'ps1': 'PowerShellLexer',
+    'ps1con': 'PowerShellSessionLexer',
+    'psm1': 'PowerShellLexer',
+    'psql': 'PostgresConsoleLexer',
+    'pug': 'PugLexer',
+    'puppet': 'PuppetLexer',
+    'py': 'PythonLexer',
+    'py3': 'Python3Lexer',
+    'py3tb': 'Python3TracebackLexer',
+    'pycon': 'PythonConsoleLexer',
+    'pypy': 'PyPyLogLexer',
+    'pypylog': 'PyPyLogLexer',
+    'pyrex': 'CythonLexer',
+    'pytb': 'PythonTracebackLexer',
+    'python': 'PythonLexer',
+    'python3': 'Python3Lexer',
+    'pyx': 'CythonLexer',
+    'qbasic': 'QBasicLexer',
+    'qbs': 'QmlLexer',
+    'qml': 'QmlLexer',
+    'qvt': 'QVToLexer',
+    'qvto': 'QVToLexer',
+    'r': 'SLexer',
+    'racket': 'RacketLexer',
+    'ragel': 'RagelLexer',
+    'ragel-c': 'RagelCLexer',
+    'ragel-cpp': 'RagelCppLexer',
+    'ragel-d': 'RagelDLexer',
+    'ragel-em': 'RagelEmbeddedLexer',
+    'ragel-java': 'RagelJavaLexer',
+    'ragel-objc': 'RagelObjectiveCLexer',
+    'ragel-rb': 'RagelRubyLexer',
+    'ragel-ruby': 'RagelRubyLexer',
+    'raw': 'RawTokenLexer',
+    'rb': 'RubyLexer',
+    'rbcon': 'RubyConsoleLexer',
+    'rconsole': 'RConsoleLexer',
+    'rd': 'RdLexer',
+    'rebol': 'RebolLexer',
+    'red': 'RedLexer',
+    'red/system': 'RedLexer',
+    'redcode': 'RedcodeLexer',
+    'registry': 'RegeditLexer',
+    'resource': 'ResourceLexer',
+    'resourcebundle': 'ResourceLexer',
+    'rest': 'RstLexer',
+    'restructuredtext': 'RstLexer',
+    'rexx': 'RexxLexer',
+    'rhtml': 'RhtmlLexer',
+    'rkt': 'RacketLexer',
+    'rnc': 'RNCCompactLexer',
+    'rng-compact': 'RNCCompactLexer',
+    'roboconf-graph': 'RoboconfGraphLexer',
+    'roboconf-instances': 'RoboconfInstancesLexer',
+    'robotframework': 'RobotFrameworkLexer',
+    'rout': 'RConsoleLexer',
+    'rql': 'RqlLexer',
+    'rsl': 'RslLexer',
+    'rst': 'RstLexer',
+    'rts': 'RtsLexer',
+    'ruby': 'RubyLexer',
+    'rust': 'RustLexer',
+    's': 'SLexer',
+    'sage': 'PythonLexer',
+    'salt': 'YamlJinjaLexer',
+    'sas': 'SASLexer',
+    'sass': 'SassLexer',
+    'sc': 'SuperColliderLexer',
+    'scala': 'ScalaLexer',
+    'scaml': 'ScamlLexer',
+    'scheme': 'SchemeLexer',
+    'scilab': 'ScilabLexer',
+    'scm': 'SchemeLexer',
+    'scss': 'ScssLexer',
+    'sh': 'BashLexer',
+    'shell': 'BashLexer',
+    'shell-session': 'BashSessionLexer',
+    'shen': 'ShenLexer',
+    'silver': 'SilverLexer',
+    'slim': 'SlimLexer',
+    'sls': 'YamlJinjaLexer',
+    'smali': 'SmaliLexer',
+    'smalltalk': 'SmalltalkLexer',
+    'smarty': 'SmartyLexer',
+    'sml': 'SMLLexer',
+    'snobol': 'SnobolLexer',
+    'snowball': 'SnowballLexer',
+    'sources.list': 'SourcesListLexer',
+    'sourceslist': 'SourcesListLexer',
+    'sp': 'SourcePawnLexer',
+    'sparql': 'SparqlLexer',
+    'spec': 'RPMSpecLexer',
+    'spitfire': 'CheetahLexer',
+    'splus': 'SLexer',
+    'sql': 'SqlLexer',
+    'sqlite3': 'SqliteConsoleLexer',
+    'squeak': 'SmalltalkLexer',
+    'squid': 'SquidConfLexer',
+    'squid.conf': 'SquidConfLexer',
+    'squidconf': 'SquidConfLexer',
+    'ssp': 'SspLexer',
+    'st': 'SmalltalkLexer',
+    'stan': 'StanLexer',
+    'stata': 'StataLexer',
+    'supercollider': 'SuperColliderLexer',
+    'sv': 'SystemVerilogLexer',
+    'swift': 'SwiftLexer',
+    'swig': 'SwigLexer',
+    'systemverilog': 'SystemVerilogLexer',
+    't-sql': 'TransactSqlLexer',
+    'tads3': 'Tads3Lexer',
+    'tap': 'TAPLexer',
+    'tasm': 'TasmLexer',
+    'tcl': 'TclLexer',
+    'tcsh': 'TcshLexer',
+    'tcshcon': 'TcshSessionLexer',
+    'tea': 'TeaTemplateLexer',
+    'termcap': 'TermcapLexer',
+    'terminfo': 'TerminfoLexer',
+    'terraform': 'TerraformLexer',
+    'tex': 'TexLexer',
+    'text': 'TextLexer',
+    'tf': 'TerraformLexer',
+    'thrift': 'ThriftLexer',
+    'todotxt': 'TodotxtLexer',
+    'trac-wiki': 'MoinWikiLexer',
+    'trafficscript': 'RtsLexer',
+    'treetop': 'TreetopLexer',
+    'ts': 'TypeScriptLexer',
+    'tsql': 'TransactSqlLexer',
+    'turtle': 'TurtleLexer',
+    'twig': 'TwigLexer',
+    'typescript': 'TypeScriptLexer',
+    'typoscript': 'TypoScriptLexer',
+    'typoscriptcssdata': 'TypoScriptCssDataLexer',
+    'typoscripthtmldata': 'TypoScriptHtmlDataLexer',
+    'udiff': 'DiffLexer',
+    'urbiscript': 'UrbiscriptLexer',
+    'v': 'VerilogLexer',
+    'vala': 'ValaLexer',
+    'vapi': 'ValaLexer',
+    'vb.net': 'VbNetLexer',
+    'vbnet': 'VbNetLexer',
+    'vcl': 'VCLLexer',
+    'vclsnippet': 'VCLSnippetLexer',
+    'vclsnippets': 'VCLSnippetLexer',
+    'vctreestatus': 'VCTreeStatusLexer',
+    'velocity': 'VelocityLexer',
+    'verilog': 'VerilogLexer',
+    'vfp': 'FoxProLexer',
+    'vgl': 'VGLLexer',
+    'vhdl': 'VhdlLexer',
+    'vim': 'VimLexer',
+    'wdiff': 'WDiffLexer',
+    'whiley': 'WhileyLexer',
+    'winbatch': 'BatchLexer',
+    'winbugs': 'BugsLexer',
+    'x10': 'X10Lexer',
+    'xbase': 'FoxProLexer',
+    'xml': 'XmlLexer',
+    'xml+cheetah': 'CheetahXmlLexer',
+    'xml+django': 'XmlDjangoLexer',
+    'xml+erb': 'XmlErbLexer',
+    'xml+evoque': 'EvoqueXmlLexer',
+    'xml+genshi': 'GenshiLexer',
+    'xml+jinja': 'XmlDjangoLexer',
+    'xml+kid': 'GenshiLexer',
+    'xml+lasso': 'LassoXmlLexer',
+    'xml+mako': 'MakoXmlLexer',
+    'xml+myghty': 'MyghtyXmlLexer',
+    'xml+php': 'XmlPhpLexer',
+    'xml+ruby': 'XmlErbLexer',
+    'xml+smarty': 'XmlSmartyLexer',
+    'xml+spitfire': 'CheetahXmlLexer',
+    'xml+velocity': 'VelocityXmlLexer',
+    'xorg.conf': 'XorgLexer',
+    'xq': 'XQueryLexer',
+    'xql': 'XQueryLexer',
+    'xqm': 'XQueryLexer',
+    'xquery': 'XQueryLexer',
+    'xqy': 'XQueryLexer',
+    'xslt': 'XsltLexer',
+    'xten': 'X10Lexer',
+    'xtend': 'XtendLexer',
+    'xul+mozpreproc': 'MozPreprocXulLexer',
+    'yaml': 'YamlLexer',
+    'yaml+jinja': 'YamlJinjaLexer',
+    'zephir': 'ZephirLexer',
+    'zsh': 'BashLexer',
+}
+
+MIMETYPES = {
+    'application/atom+xml': 'XmlLexer',
+    'application/javascript': 'JavascriptLexer',
+    'application/jsgf': 'JsgfLexer',
+    'application/json': 'JsonLexer',
+    'application/json-object': 'JsonBareObjectLexer',
+    'application/juttle': 'JuttleLexer',
+    'application/kal': 'KalLexer',
+    'application/ld+json': 'JsonLdLexer',
+    'application/mathematica': 'MathematicaLexer',
+    'application/postscript': 'PostScriptLexer',
+    'application/rss+xml': 'XmlLexer',
+    'application/sparql-query': 'SparqlLexer',
+    'application/supercollider': 'SuperColliderLexer',
+    'application/vnd.wolfram.cdf': 'MathematicaLexer',
+    'application/vnd.wolfram.mathematica': 'MathematicaLexer',
+    'application/vnd.wolfram.mathematica.package': 'MathematicaLexer',
+    'application/x-actionscript': 'ActionScriptLexer',
+    'application/x-actionscript3': 'ActionScript3Lexer',
+    'application/x-awk': 'AwkLexer',
+    'application/x-befunge': 'BefungeLexer',
+    'application/x-brainfuck': 'BrainfuckLexer',
+    'application/x-chaiscript': 'ChaiscriptLexer',
+    'application/x-cheetah': 'CheetahLexer',
+    'application/x-clojure': 'ClojureLexer',
+    'application/x-clojurescript': 'ClojureScriptLexer',
+    'application/x-coldfusion': 'ColdfusionHtmlLexer',
+    'application/x-csh': 'TcshLexer',
+    'application/x-cython': 'CythonLexer',
+    'application/x-django-templating': 'DjangoLexer',
+    'application/x-dos-batch': 'BatchLexer',
+    'application/x-ecl': 'ECLLexer',
+    'application/x-elisp': 'EmacsLispLexer',
+    'application/x-evoque': 'EvoqueLexer',
+    'application/x-fantom': 'FantomLexer',
+    'application/x-fish': 'FishShellLexer',
+    'application/x-forth': 'ForthLexer',
+    'application/x-genshi': 'GenshiLexer',
+    'application/x-genshi-text': 'GenshiTextLexer',
+    'application/x-gettext': 'GettextLexer',
+    'application/x-gooddata-maql': 'MaqlLexer',
+    'application/x-httpd-lasso': 'LassoHtmlLexer',
+    'application/x-httpd-lasso[89]': 'LassoHtmlLexer',
+    'application/x-httpd-php': 'HtmlPhpLexer',
+    'application/x-httpd-php3': 'HtmlPhpLexer',
+    'application/x-httpd-php4': 'HtmlPhpLexer',
+    'application/x-httpd-php5': 'HtmlPhpLexer',
+    'application/x-hy': 'HyLexer',
+    'application/x-hybris': 'HybrisLexer',
+    'application/x-javascript': 'JavascriptLexer',
+    'application/x-javascript+cheetah': 'CheetahJavascriptLexer',
+    'application/x-javascript+django': 'JavascriptDjangoLexer',
+    'application/x-javascript+genshi': 'JavascriptGenshiLexer',
+    'application/x-javascript+jinja': 'JavascriptDjangoLexer',
+    'application/x-javascript+lasso': 'LassoJavascriptLexer',
+    'application/x-javascript+mako': 'MakoJavascriptLexer',
+    'application/x-javascript+myghty': 'MyghtyJavascriptLexer',
+    'application/x-javascript+php': 'JavascriptPhpLexer',
+    'application/x-javascript+ruby': 'JavascriptErbLexer',
+    'application/x-javascript+smarty': 'JavascriptSmartyLexer',
+    'application/x-javascript+spitfire': 'CheetahJavascriptLexer',
+    'application/x-jinja': 'DjangoLexer',
+    'application/x-jsgf': 'JsgfLexer',
+    'application/x-jsp': 'JspLexer',
+    'application/x-julia': 'JuliaLexer',
+    'application/x-juttle': 'JuttleLexer',
+    'application/x-kid': 'GenshiLexer',
+    'application/x-lua': 'LuaLexer',
+    'application/x-mako': 'MakoLexer',
+    'application/x-mason': 'MasonLexer',
+    'application/x-moonscript': 'MoonScriptLexer',
+    'application/x-myghty': 'MyghtyLexer',
+    'application/x-newlisp': 'NewLispLexer',
+    'application/x-openedge': 'OpenEdgeLexer',
+    'application/x-perl': 'PerlLexer',
+    'application/x-perl6': 'Perl6Lexer',
+    'application/x-php': 'HtmlPhpLexer',
+    'application/x-pygments-binary-tokens': 'BinaryTokenLexer',
+    'application/x-pygments-tokens': 'RawTokenLexer',
+    'application/x-pypylog': 'PyPyLogLexer',
+    'application/x-python': 'PythonLexer',
+    'application/x-python3': 'Python3Lexer',
+    'application/x-qml': 'QmlLexer',
+    'application/x-qt.qbs+qml': 'QmlLexer',
+    'application/x-racket': 'RacketLexer',
+    'application/x-ruby': 'RubyLexer',
+    'application/x-ruby-templating': 'ErbLexer',
+    'application/x-sas': 'SASLexer',
+    'application/x-scheme': 'SchemeLexer',
+    'application/x-sh': 'BashLexer',
+    'application/x-sh-session': 'BashSessionLexer',
+    'application/x-shell-session': 'BashSessionLexer',
+    'application/x-shellscript': 'BashLexer',
+    'application/x-shen': 'ShenLexer',
+    'application/x-smarty': 'SmartyLexer',
+    'application/x-spitfire': 'CheetahLexer',
+    'application/x-ssp': 'SspLexer',
+    'application/x-standardml': 'SMLLexer',
+    'application/x-stata': 'StataLexer',
+    'application/x-tcl': 'TclLexer',
+    'application/x-terraform': 'TerraformLexer',
+    'application/x-tf': 'TerraformLexer',
+    'application/x-thrift': 'ThriftLexer',
+    'application/x-troff': 'GroffLexer',
+    'application/x-turtle': 'TurtleLexer',
+    'application/x-twig': 'TwigLexer',
+    'application/x-urbiscript': 'UrbiscriptLexer',
+    'application/xhtml+xml': 'HtmlLexer',
+    'application/xml': 'XmlLexer',
+    'application/xml+cheetah': 'CheetahXmlLexer',
+    'application/xml+django': 'XmlDjangoLexer',
+    'application/xml+evoque': 'EvoqueXmlLexer',
+    'application/xml+jinja': 'XmlDjangoLexer',
+    'application/xml+lasso': 'LassoXmlLexer',
+    'application/xml+mako': 'MakoXmlLexer',
+    'application/xml+myghty': 'MyghtyXmlLexer',
+    'application/xml+php': 'XmlPhpLexer',
+    'application/xml+ruby': 'XmlErbLexer',
+    'application/xml+smarty': 'XmlSmartyLexer',
+    'application/xml+spitfire': 'CheetahXmlLexer',
+    'application/xml+velocity': 'VelocityXmlLexer',
+    'application/xml-dtd': 'DtdLexer',
+    'application/xquery': 'XQueryLexer',
+    'application/xsl+xml': 'XsltLexer',
+    'application/xslt+xml': 'XsltLexer',
+    'image/svg+xml': 'XmlLexer',
+    'text/S': 'SLexer',
+    'text/S-plus': 'SLexer',
+    'text/actionscript': 'ActionScriptLexer',
+    'text/actionscript3': 'ActionScript3Lexer',
+    'text/basic': 'QBasicLexer',
+    'text/coffeescript': 'CoffeeScriptLexer',
+    'text/css': 'CssLexer',
+    'text/css+django': 'CssDjangoLexer',
+    'text/css+genshi': 'CssGenshiLexer',
+    'text/css+jinja': 'CssDjangoLexer',
+    'text/css+lasso': 'LassoCssLexer',
+    'text/css+mako': 'MakoCssLexer',
+    'text/css+myghty': 'MyghtyCssLexer',
+    'text/css+php': 'CssPhpLexer',
+    'text/css+ruby': 'CssErbLexer',
+    'text/css+smarty': 'CssSmartyLexer',
+    'text/gettext': 'GettextLexer',
+    'text/haxe': 'HaxeLexer',
+    'text/html': 'HtmlLexer',
+    'text/html+cheetah': 'CheetahHtmlLexer',
+    'text/html+django': 'HtmlDjangoLexer',
+    'text/html+evoque': 'EvoqueHtmlLexer',
+    'text/html+genshi': 'HtmlGenshiLexer',
+    'text/html+handlebars': 'HandlebarsHtmlLexer',
+    'text/html+jinja': 'HtmlDjangoLexer',
+    'text/html+lasso': 'LassoHtmlLexer',
+    'text/html+mako': 'MakoHtmlLexer',
+    'text/html+myghty': 'MyghtyHtmlLexer',
+    'text/html+ruby': 'RhtmlLexer',
+    'text/html+smarty': 'HtmlSmartyLexer',
+    'text/html+spitfire': 'CheetahHtmlLexer',
+    'text/html+twig': 'TwigHtmlLexer',
+    'text/html+velocity': 'VelocityHtmlLexer',
+    'text/idl': 'IDLLexer',
+    'text/inf': 'IniLexer',
+    'text/ipf': 'IgorLexer',
+    'text/javascript': 'JavascriptLexer',
+    'text/javascript+cheetah': 'CheetahJavascriptLexer',
+    'text/javascript+django': 'JavascriptDjangoLexer',
+    'text/javascript+genshi': 'JavascriptGenshiLexer',
+    'text/javascript+jinja': 'JavascriptDjangoLexer',
+    'text/javascript+lasso': 'LassoJavascriptLexer',
+    'text/javascript+mako': 'MakoJavascriptLexer',
+    'text/javascript+mygthy': 'MyghtyJavascriptLexer',
+    'text/javascript+php': 'JavascriptPhpLexer',
+    'text/javascript+ruby': 'JavascriptErbLexer',
+    'text/javascript+smarty': 'JavascriptSmartyLexer',
+    'text/javascript+spitfire': 'CheetahJavascriptLexer',
+    'text/jsgf': 'JsgfLexer',
+    'text/juttle': 'JuttleLexer',
+    'text/kal': 'KalLexer',
+    'text/limbo': 'LimboLexer',
+    'text/livescript': 'LiveScriptLexer',
+    'text/matlab': 'MatlabLexer',
+    'text/ncl': 'NCLLexer',
+    'text/octave': 'OctaveLexer',
+    'text/odin': 'OdinLexer',
+    'text/plain': 'TextLexer',
+    'text/prs.fallenstein.rst': 'RstLexer',
+    'text/rsl': 'RslLexer',
+    'text/rust': 'RustLexer',
+    'text/sas': 'SASLexer',
+    'text/scilab': 'ScilabLexer',
+    'text/smali': 'SmaliLexer',
+    'text/stata': 'StataLexer',
+    'text/supercollider': 'SuperColliderLexer',
+    'text/swig': 'SwigLexer',
+    'text/troff': 'GroffLexer',
+    'text/turtle': 'TurtleLexer',
+    'text/x-R': 'SLexer',
+    'text/x-abap': 'ABAPLexer',
+    'text/x-abnf': 'AbnfLexer',
+    'text/x-actionscript': 'ActionScriptLexer',
+    'text/x-actionscript3': 'ActionScript3Lexer',
+    'text/x-ada': 'AdaLexer',
+    'text/x-agda': 'AgdaLexer',
+    'text/x-alloy': 'AlloyLexer',
+    'text/x-ambienttalk': 'AmbientTalkLexer',
+    'text/x-apacheconf': 'ApacheConfLexer',
+    'text/x-arduino': 'ArduinoLexer',
+    'text/x-aspectj': 'AspectJLexer',
+    'text/x-asymptote': 'AsymptoteLexer',
+    'text/x-autohotkey': 'AutohotkeyLexer',
+    'text/x-autoit': 'AutoItLexer',
+    'text/x-bb': 'BlitzBasicLexer',
+    'text/x-bbcode': 'BBCodeLexer',
+    'text/x-bibtex': 'BibTeXLexer',
+    'text/x-bmx': 'BlitzMaxLexer',
+    'text/x-bnf': 'BnfLexer',
+    'text/x-boo': 'BooLexer',
+    'text/x-c++hdr': 'CppLexer',
+    'text/x-c++src': 'CppLexer',
+    'text/x-c-objdump': 'CObjdumpLexer',
+    'text/x-ceylon': 'CeylonLexer',
+    'text/x-chaiscript': 'ChaiscriptLexer',
+    'text/x-chdr': 'CLexer',
+    'text/x-cirru': 'CirruLexer',
+    'text/x-clay': 'ClayLexer',
+    'text/x-clojure': 'ClojureLexer',
+    'text/x-clojurescript': 'ClojureScriptLexer',
+    'text/x-cmake': 'CMakeLexer',
+    'text/x-cobol': 'CobolLexer',
+    'text/x-common-lisp': 'CommonLispLexer',
+    'text/x-component-pascal': 'ComponentPascalLexer',
+    'text/x-coq': 'CoqLexer',
+    'text/x-cpp-objdump': 'CppObjdumpLexer',
+    'text/x-crocsrc': 'CrocLexer',
+    'text/x-cryptol': 'CryptolLexer',
+    'text/x-crystal': 'CrystalLexer',
+    'text/x-csharp': 'CSharpLexer',
+    'text/x-csrc': 'CLexer',
+    'text/x-cuda': 'CudaLexer',
+    'text/x-cython': 'CythonLexer',
+    'text/x-d-objdump': 'DObjdumpLexer',
+    'text/x-dart': 'DartLexer',
+    'text/x-dg': 'DgLexer',
+    'text/x-diff': 'DiffLexer',
+    'text/x-dockerfile-config': 'DockerLexer',
+    'text/x-dsrc': 'DLexer',
+    'text/x-duel': 'DuelLexer',
+    'text/x-dylan': 'DylanLexer',
+    'text/x-dylan-console': 'DylanConsoleLexer',
+    'text/x-dylan-lid': 'DylanLidLexer',
+    'text/x-earl-grey': 'EarlGreyLexer',
+    'text/x-easytrieve': 'EasytrieveLexer',
+    'text/x-ebnf': 'EbnfLexer',
+    'text/x-echdr': 'ECLexer',
+    'text/x-ecsrc': 'ECLexer',
+    'text/x-eiffel': 'EiffelLexer',
+    'text/x-elisp': 'EmacsLispLexer',
+    'text/x-elixir': 'ElixirLexer',
+    'text/x-elixir-shellsession': 'ElixirConsoleLexer',
+    'text/x-elm': 'ElmLexer',
+    'text/x-erl-shellsession': 'ErlangShellLexer',
+    'text/x-erlang': 'ErlangLexer',
+    'text/x-ezhil': 'EzhilLexer',
+    'text/x-factor': 'FactorLexer',
+    'text/x-fancysrc': 'FancyLexer',
+    'text/x-felix': 'FelixLexer',
+    'text/x-flatline': 'FlatlineLexer',
+    'text/x-fortran': 'FortranLexer',
+    'text/x-fsharp': 'FSharpLexer',
+    'text/x-gas': 'GasLexer',
+    'text/x-genshi': 'GenshiTextLexer',
+    'text/x-gettext': 'GettextLexer',
+    'text/x-gherkin': 'GherkinLexer',
+    'text/x-glslsrc': 'GLShaderLexer',
+    'text/x-gnuplot': 'GnuplotLexer',
+    'text/x-gooddata-cl': 'GoodDataCLLexer',
+    'text/x-gooddata-maql': 'MaqlLexer',
+    'text/x-gosrc': 'GoLexer',
+    'text/x-gosu': 'GosuLexer',
+    'text/x-gosu-template': 'GosuTemplateLexer',
+    'text/x-groovy': 'GroovyLexer',
+    'text/x-haml': 'HamlLexer',
+    'text/x-handlebars-template': 'HandlebarsHtmlLexer',
+    'text/x-haskell': 'HaskellLexer',
+    'text/x-haxe': 'HaxeLexer',
+    'text/x-hsail': 'HsailLexer',
+    'text/x-hx': 'HaxeLexer',
+    'text/x-hy': 'HyLexer',
+    'text/x-hybris': 'HybrisLexer',
+    'text/x-idris': 'IdrisLexer',
+    'text/x-ini': 'IniLexer',
+    'text/x-iokesrc': 'IokeLexer',
+    'text/x-iosrc': 'IoLexer',
+    'text/x-irclog': 'IrcLogsLexer',
+    'text/x-isabelle': 'IsabelleLexer',
+    'text/x-j': 'JLexer',
+    'text/x-jade': 'PugLexer',
+    'text/x-java': 'JavaLexer',
+    'text/x-java-properties': 'PropertiesLexer',
+    'text/x-javascript': 'JavascriptLexer',
+    'text/x-javascript+cheetah': 'CheetahJavascriptLexer',
+    'text/x-javascript+django': 'JavascriptDjangoLexer',
+    'text/x-javascript+genshi': 'JavascriptGenshiLexer',
+    'text/x-javascript+jinja': 'JavascriptDjangoLexer',
+    'text/x-javascript+lasso': 'LassoJavascriptLexer',
+    'text/x-javascript+mako': 'MakoJavascriptLexer',
+    'text/x-javascript+myghty': 'MyghtyJavascriptLexer',
+    'text/x-javascript+php': 'JavascriptPhpLexer',
+    'text/x-javascript+ruby': 'JavascriptErbLexer',
+    'text/x-javascript+smarty': 'JavascriptSmartyLexer',
+    'text/x-javascript+spitfire': 'CheetahJavascriptLexer',
+    'text/x-jbst': 'DuelLexer',
+    'text/x-jcl': 'JclLexer',
+    'text/x-julia': 'JuliaLexer',
+    'text/x-juttle': 'JuttleLexer',
+    'text/x-kconfig': 'KconfigLexer',
+    'text/x-koka': 'KokaLexer',
+    'text/x-kotlin': 'KotlinLexer',
+    'text/x-lasso': 'LassoLexer',
+    'text/x-latex': 'TexLexer',
+    'text/x-lean': 'LeanLexer',
+    'text/x-less-css': 'LessCssLexer',
+    'text/x-lighttpd-conf': 'LighttpdConfLexer',
+    'text/x-literate-agda': 'LiterateAgdaLexer',
+    'text/x-literate-cryptol': 'LiterateCryptolLexer',
+    'text/x-literate-haskell': 'LiterateHaskellLexer',
+    'text/x-literate-idris': 'LiterateIdrisLexer',
+    'text/x-llvm': 'LlvmLexer',
+    'text/x-logos': 'LogosLexer',
+    'text/x-logtalk': 'LogtalkLexer',
+    'text/x-lsl': 'LSLLexer',
+    'text/x-lua': 'LuaLexer',
+    'text/x-makefile': 'MakefileLexer',
+    'text/x-markdown': 'MarkdownLexer',
+    'text/x-mask': 'MaskLexer',
+    'text/x-minidsrc': 'MiniDLexer',
+    'text/x-modelica': 'ModelicaLexer',
+    'text/x-modula2': 'Modula2Lexer',
+    'text/x-monkey': 'MonkeyLexer',
+    'text/x-moocode': 'MOOCodeLexer',
+    'text/x-moonscript': 'MoonScriptLexer',
+    'text/x-mql': 'MqlLexer',
+    'text/x-mysql': 'MySqlLexer',
+    'text/x-nasm': 'NasmLexer',
+    'text/x-nasm-objdump': 'NasmObjdumpLexer',
+    'text/x-nemerle': 'NemerleLexer',
+    'text/x-nescsrc': 'NesCLexer',
+    'text/x-newlisp': 'NewLispLexer',
+    'text/x-newspeak': 'NewspeakLexer',
+    'text/x-nginx-conf': 'NginxConfLexer',
+    'text/x-nim': 'NimrodLexer',
+    'text/x-nix': 'NixLexer',
+    'text/x-nsis': 'NSISLexer',
+    'text/x-objdump': 'ObjdumpLexer',
+    'text/x-objective-c': 'ObjectiveCLexer',
+    'text/x-objective-c++': 'ObjectiveCppLexer',
+    'text/x-objective-j': 'ObjectiveJLexer',
+    'text/x-ocaml': 'OcamlLexer',
+    'text/x-ooc': 'OocLexer',
+    'text/x-opa': 'OpaLexer',
+    'text/x-openedge': 'OpenEdgeLexer',
+    'text/x-parasail': 'ParaSailLexer',
+    'text/x-pascal': 'DelphiLexer',
+    'text/x-patch': 'DiffLexer',
+    'text/x-pawn': 'PawnLexer',
+    'text/x-perl': 'PerlLexer',
+    'text/x-perl6': 'Perl6Lexer',
+    'text/x-php': 'PhpLexer',
+    'text/x-pig': 'PigLexer',
+    'text/x-pike': 'PikeLexer',
+    'text/x-plpgsql': 'PlPgsqlLexer',
+    'text/x-postgresql': 'PostgresLexer',
+    'text/x-postgresql-psql': 'PostgresConsoleLexer',
+    'text/x-povray': 'PovrayLexer',
+    'text/x-powershell': 'PowerShellLexer',
+    'text/x-prolog': 'PrologLexer',
+    'text/x-pug': 'PugLexer',
+    'text/x-python': 'PythonLexer',
+    'text/x-python-doctest': 'PythonConsoleLexer',
+    'text/x-python-traceback': 'PythonTracebackLexer',
+    'text/x-python3': 'Python3Lexer',
+    'text/x-python3-traceback': 'Python3TracebackLexer',
+    'text/x-r': 'SLexer',
+    'text/x-r-doc': 'RdLexer',
+    'text/x-r-history': 'SLexer',
+    'text/x-r-profile': 'SLexer',
+    'text/x-r-source': 'SLexer',
+    'text/x-racket': 'RacketLexer',
+    'text/x-rebol': 'RebolLexer',
+    'text/x-red': 'RedLexer',
+    'text/x-red-system': 'RedLexer',
+    'text/x-rexx': 'RexxLexer',
+    'text/x-robotframework': 'RobotFrameworkLexer',
+    'text/x-rpm-spec': 'RPMSpecLexer',
+    'text/x-rql': 'RqlLexer',
+    'text/x-rst': 'RstLexer',
+    'text/x-ruby': 'RubyLexer',
+    'text/x-ruby-shellsession': 'RubyConsoleLexer',
+    'text/x-sas': 'SASLexer',
+    'text/x-sass': 'SassLexer',
+    'text/x-scala': 'ScalaLexer',
+    'text/x-scaml': 'ScamlLexer',
+    'text/x-scheme': 'SchemeLexer',
+    'text/x-script.tcl': 'TclLexer',
+    'text/x-scss': 'ScssLexer',
+    'text/x-shen': 'ShenLexer',
+    'text/x-slim': 'SlimLexer',
+    'text/x-sls': 'YamlJinjaLexer',
+    'text/x-smalltalk': 'SmalltalkLexer',
+    'text/x-snobol': 'SnobolLexer',
+    'text/x-sourcepawn': 'SourcePawnLexer',
+    'text/x-sql': 'SqlLexer',
+    'text/x-sqlite3-console': 'SqliteConsoleLexer',
+    'text/x-squidconf': 'SquidConfLexer',
+    'text/x-standardml': 'SMLLexer',
+    'text/x-stata': 'StataLexer',
+    'text/x-swift': 'SwiftLexer',
+    'text/x-systemverilog': 'SystemVerilogLexer',
+    'text/x-tasm': 'TasmLexer',
+    'text/x-tcl': 'TclLexer',
+    'text/x-tea': 'TeaTemplateLexer',
+    'text/x-tex': 'TexLexer',
+    'text/x-todo': 'TodotxtLexer',
+    'text/x-trac-wiki': 'MoinWikiLexer',
+    'text/x-tsql': 'TransactSqlLexer',
+    'text/x-typescript': 'TypeScriptLexer',
+    'text/x-typoscript': 'TypoScriptLexer',
+    'text/x-vala': 'ValaLexer',
+    'text/x-vba': 'VbNetLexer',
+    'text/x-vbnet': 'VbNetLexer',
+    'text/x-vclsnippet': 'VCLSnippetLexer',
+    'text/x-vclsrc': 'VCLLexer',
+    'text/x-verilog': 'VerilogLexer',
+    'text/x-vhdl': 'VhdlLexer',
+    'text/x-vim': 'VimLexer',
+    'text/x-whiley': 'WhileyLexer',
+    'text/x-windows-registry': 'RegeditLexer',
+    'text/x-x10': 'X10Lexer',
+    'text/x-xtend': 'XtendLexer',
+    'text/x-yaml': 'YamlLexer',
+    'text/x-yaml+jinja': 'YamlJinjaLexer',
+    'text/xml': 'XmlLexer',
+    'text/xquery': 'XQueryLexer',
+}
+
+FILENAMES = {
+    '.Renviron': ('SLexer',),
+    '.Rhistory': ('SLexer',),
+    '.Rprofile': ('SLexer',),
+    '.bashrc': ('BashLexer',),
+    '.exrc': ('VimLexer',),
+    '.gvimrc': ('VimLexer',),
+    '.htaccess': ('ApacheConfLexer',),
+    '.vimrc': ('VimLexer',),
+    '.zshrc': ('BashLexer',),
+    'CMakeLists.txt': ('CMakeLexer',),
+    'Dockerfile': ('DockerLexer',),
+    'GNUmakefile': ('MakefileLexer',),
+    'Gemfile': ('RubyLexer',),
+    'Kconfig': ('KconfigLexer',),
+    'Makefile': ('MakefileLexer',),
+    'PKGBUILD': ('BashLexer',),
+    'Rakefile': ('RubyLexer',),
+    'SConscript': ('PythonLexer',),
+    'SConstruct': ('PythonLexer',),
+    '_exrc': ('VimLexer',),
+    '_gvimrc': ('VimLexer',),
+    '_vimrc': ('VimLexer',),
+    'apache.conf': ('ApacheConfLexer',),
+    'apache2.conf': ('ApacheConfLexer',),
+    'autodelegate': ('MyghtyLexer',),
+    'autohandler': ('MasonLexer',),
+    'bashrc': ('BashLexer',),
+    'control': ('DebianControlLexer',),
+    'dhandler': ('MasonLexer',),
+    'gvimrc': ('VimLexer',),
+    'makefile': ('MakefileLexer',),
+    'nginx.conf': ('NginxConfLexer',),
+    'pacman.conf': ('PacmanConfLexer',),
+    'sources.list': ('SourcesListLexer',),
+    'squid.conf': ('SquidConfLexer',),
+    'standard-modules.in': ('KconfigLexer',),
+    'termcap': ('TermcapLexer',),
+    'termcap.src': ('TermcapLexer',),
+    'terminfo': ('TerminfoLexer',),
+    'terminfo.src': ('TerminfoLexer',),
+    'todo.txt': ('TodotxtLexer',),
+    'vimrc': ('VimLexer',),
+    'xorg.conf': ('XorgLexer',),
+    'zshrc': ('BashLexer',),
+}
+
+SUFFIXES = {
+    '.6pl': ('Perl6Lexer',),
+    '.6pm': ('Perl6Lexer',),
+    '.ABAP': ('ABAPLexer',),
+    '.ASM': ('NasmLexer', 'TasmLexer'),
+    '.BAS': ('QBasicLexer',),
+    '.C': ('CppLexer',),
+    '.CBL': ('CobolFreeformatLexer',),
+    '.COB': ('CobolLexer',),
+    '.CPP': ('CppLexer',),
+    '.CPY': ('CobolLexer',),
+    '.F': ('FortranFixedLexer',),
+    '.F03': ('FortranLexer',),
+    '.F90': ('FortranLexer',),
+    '.G': ('AntlrActionScriptLexer', 'AntlrCSharpLexer', 'AntlrCppLexer', 'AntlrJavaLexer', 'AntlrObjectiveCLexer', 'AntlrPerlLexer', 'AntlrPythonLexer', 'AntlrRubyLexer'),
+    '.H': ('CppLexer',),
+    '.PRG': ('FoxProLexer',),
+    '.R': ('SLexer',),
+    '.Rd': ('RdLexer',),
+    '.Rout': ('RConsoleLexer',),
+    '.S': ('GasLexer', 'SLexer'),
+    '.SAS': ('SASLexer',),
+    '.abap': ('ABAPLexer',),
+    '.abnf': ('AbnfLexer',),
+    '.ada': ('AdaLexer',),
+    '.adb': ('AdaLexer',),
+    '.adl': ('AdlLexer',),
+    '.adlf': ('AdlLexer',),
+    '.adls': ('AdlLexer',),
+    '.adlx': ('AdlLexer',),
+    '.ado': ('StataLexer',),
+    '.ads': ('AdaLexer',),
+    '.agda': ('AgdaLexer',),
+    '.aheui': ('AheuiLexer',),
+    '.ahk': ('AutohotkeyLexer',),
+    '.ahkl': ('AutohotkeyLexer',),
+    '.aj': ('AspectJLexer',),
+    '.als': ('AlloyLexer',),
+    '.apl': ('APLLexer',),
+    '.applescript': ('AppleScriptLexer',),
+    '.arexx': ('RexxLexer',),
+    '.as': ('ActionScript3Lexer', 'ActionScriptLexer'),
+    '.asax': ('CSharpAspxLexer', 'VbNetAspxLexer'),
+    '.ascx': ('CSharpAspxLexer', 'VbNetAspxLexer'),
+    '.ashx': ('CSharpAspxLexer', 'VbNetAspxLexer'),
+    '.asm': ('NasmLexer', 'TasmLexer'),
+    '.asmx': ('CSharpAspxLexer', 'VbNetAspxLexer'),
+    '.aspx': ('CSharpAspxLexer', 'VbNetAspxLexer'),
+    '.asy': ('AsymptoteLexer',),
+    '.at': ('AmbientTalkLexer',),
+    '.au3': ('AutoItLexer',),
+    '.aux': ('TexLexer',),
+    '.awk': ('AwkLexer',),
+    '.axd': ('CSharpAspxLexer', 'VbNetAspxLexer'),
+    '.b': ('BrainfuckLexer', 'LimboLexer'),
+    '.bas': ('CbmBasicV2Lexer', 'QBasicLexer', 'VbNetLexer'),
+    '.bash': ('BashLexer',),
+    '.bat': ('BatchLexer',),
+    '.bb': ('BlitzBasicLexer',),
+    '.bc': ('BCLexer',),
+    '.befunge': ('BefungeLexer',),
+    '.bf': ('BrainfuckLexer',),
+    '.bib': ('BibTeXLexer',),
+    '.bmx': ('BlitzMaxLexer',),
+    '.bnf': ('BnfLexer',),
+    '.boo': ('BooLexer',),
+    '.bpl': ('BoogieLexer',),
+    '.bro': ('BroLexer',),
+    '.bst': ('BSTLexer',),
+    '.bug': ('BugsLexer', 'JagsLexer'),
+    '.c': ('CLexer',),
+    '.c++': ('CppLexer',),
+    '.c++-objdump': ('CppObjdumpLexer',),
+    '.c-objdump': ('CObjdumpLexer',),
+    '.cadl': ('CadlLexer',),
+    '.camkes': ('CAmkESLexer',),
+    '.capnp': ('CapnProtoLexer',),
+    '.cbl': ('CobolFreeformatLexer',),
+    '.cc': ('CppLexer',),
+    '.cdf': ('MathematicaLexer',),
+    '.cdl': ('CapDLLexer',),
+    '.ceylon': ('CeylonLexer',),
+    '.cf': ('Cfengine3Lexer',),
+    '.cfc': ('ColdfusionCFCLexer',),
+    '.cfg': ('IniLexer',),
+    '.cfm': ('ColdfusionHtmlLexer',),
+    '.cfml': ('ColdfusionHtmlLexer',),
+    '.chai': ('ChaiscriptLexer',),
+    '.chpl': ('ChapelLexer',),
+    '.cirru': ('CirruLexer',),
+    '.cl': ('CommonLispLexer',),
+    '.clay': ('ClayLexer',),
+    '.clj': ('ClojureLexer',),
+    '.cljs': ('ClojureScriptLexer',),
+    '.cls': ('OpenEdgeLexer',),
+    '.cmake': ('CMakeLexer',),
+    '.cmd': ('BatchLexer',),
+    '.cob': ('CobolLexer',),
+    '.coffee': ('CoffeeScriptLexer',),
+    '.cp': ('ComponentPascalLexer', 'CppLexer'),
+    '.cpp': ('CppLexer',),
+    '.cpp-objdump': ('CppObjdumpLexer',),
+    '.cps': ('ComponentPascalLexer',),
+    '.cpsa': ('CPSALexer',),
+    '.cpy': ('CobolLexer',),
+    '.cr': ('CrystalLexer',),
+    '.crmsh': ('CrmshLexer',),
+    '.croc': ('CrocLexer',),
+    '.cry': ('CryptolLexer',),
+    '.cs': ('CSharpLexer',),
+    '.csd': ('CsoundDocumentLexer',),
+    '.csh': ('TcshLexer',),
+    '.css': ('CssLexer',),
+    '.css.in': ('MozPreprocCssLexer',),
+    '.cu': ('CudaLexer',),
+    '.cuh': ('CudaLexer',),
+    '.cw': ('RedcodeLexer',),
+    '.cxx': ('CppLexer',),
+    '.cxx-objdump': ('CppObjdumpLexer',),
+    '.cyp': ('CypherLexer',),
+    '.cypher': ('CypherLexer',),
+    '.d': ('DLexer',),
+    '.d-objdump': ('DObjdumpLexer',),
+    '.darcspatch': ('DarcsPatchLexer',),
+    '.dart': ('DartLexer',),
+    '.dcl': ('CleanLexer',),
+    '.decls': ('BlitzBasicLexer',),
+    '.def': ('Modula2Lexer',),
+    '.dg': ('DgLexer',),
+    '.di': ('DLexer',),
+    '.diff': ('DiffLexer',),
+    '.do': ('StataLexer',),
+    '.docker': ('DockerLexer',),
+    '.dpatch': ('DarcsPatchLexer',),
+    '.dpr': ('DelphiLexer',),
+    '.dtd': ('DtdLexer',),
+    '.duby': ('RubyLexer',),
+    '.duel': ('DuelLexer',),
+    '.dyl': ('DylanLexer',),
+    '.dylan': ('DylanLexer',),
+    '.dylan-console': ('DylanConsoleLexer',),
+    '.e': ('EiffelLexer',),
+    '.ebnf': ('EbnfLexer',),
+    '.ebuild': ('BashLexer',),
+    '.ec': ('ECLexer',),
+    '.ecl': ('ECLLexer', 'PrologLexer'),
+    '.eclass': ('BashLexer',),
+    '.eg': ('EarlGreyLexer',),
+    '.eh': ('ECLexer',),
+    '.el': ('EmacsLispLexer',),
+    '.elm': ('ElmLexer',),
+    '.eps': ('PostScriptLexer',),
+    '.erl': ('ErlangLexer',),
+    '.erl-sh': ('ErlangShellLexer',),
+    '.es': ('ErlangLexer',),
+    '.escript': ('ErlangLexer',),
+    '.evoque': ('EvoqueLexer',),
+    '.ex': ('ElixirLexer',),
+    '.exheres-0': ('BashLexer',),
+    '.exlib': ('BashLexer',),
+    '.exs': ('ElixirLexer',),
+    '.ezt': ('EasytrieveLexer',),
+    '.f': ('FortranFixedLexer',),
+    '.f03': ('FortranLexer',),
+    '.f90': ('FortranLexer',),
+    '.factor': ('FactorLexer',),
+    '.fan': ('FantomLexer',),
+    '.fancypack': ('FancyLexer',),
+    '.feature': ('GherkinLexer',),
+    '.fhtml': ('VelocityLexer',),
+    '.fish': ('FishShellLexer',),
+    '.flx': ('FelixLexer',),
+    '.flxh': ('FelixLexer',),
+    '.frag': ('GLShaderLexer',),
+    '.frt': ('ForthLexer',),
+    '.fs': ('FSharpLexer', 'ForthLexer'),
+    '.fsi': ('FSharpLexer',),
+    '.fun': ('SMLLexer',),
+    '.fy': ('FancyLexer',),
+    '.g': ('AntlrActionScriptLexer', 'AntlrCSharpLexer', 'AntlrCppLexer', 'AntlrJavaLexer', 'AntlrObjectiveCLexer', 'AntlrPerlLexer', 'AntlrPythonLexer', 'AntlrRubyLexer', 'GAPLexer'),
+    '.gap': ('GAPLexer',),
+    '.gd': ('GAPLexer',),
+    '.gdc': ('GoodDataCLLexer',),
+    '.gemspec': ('RubyLexer',),
+    '.geo': ('GLShaderLexer',),
+    '.gi': ('GAPLexer',),
+    '.go': ('GoLexer',),
+    '.golo': ('GoloLexer',),
+    '.gradle': ('GroovyLexer',),
+    '.graph': ('RoboconfGraphLexer',),
+    '.groovy': ('GroovyLexer',),
+    '.gs': ('GosuLexer',),
+    '.gsp': ('GosuLexer',),
+    '.gst': ('GosuTemplateLexer',),
+    '.gsx': ('GosuLexer',),
+    '.h': ('CLexer', 'ObjectiveCLexer'),
+    '.h++': ('CppLexer',),
+    '.haml': ('HamlLexer',),
+    '.handlebars': ('HandlebarsHtmlLexer',),
+    '.hbs': ('HandlebarsHtmlLexer',),
+    '.hdp': ('DylanLidLexer',),
+    '.hh': ('CppLexer', 'ObjectiveCppLexer'),
+    '.hpp': ('CppLexer',),
+    '.hrl': ('ErlangLexer',),
+    '.hs': ('HaskellLexer',),
+    '.hsail': ('HsailLexer',),
+    '.htm': ('HtmlLexer',),
+    '.html': ('EvoqueHtmlLexer', 'HtmlLexer'),
+    '.hx': ('HaxeLexer',),
+    '.hxml': ('HxmlLexer',),
+    '.hxsl': ('HaxeLexer',),
+    '.hxx': ('CppLexer',),
+    '.hy': ('HyLexer', 'HybrisLexer'),
+    '.hyb': ('HybrisLexer',),
+    '.i': ('SwigLexer',),
+    '.i6t': ('Inform6TemplateLexer',),
+    '.i7x': ('Inform7Lexer',),
+    '.icl': ('CleanLexer',),
+    '.idc': ('CLexer',),
+    '.idl4': ('CAmkESLexer',),
+    '.idr': ('IdrisLexer',),
+    '.ijs': ('JLexer',),
+    '.ik': ('IokeLexer',),
+    '.inc': ('PawnLexer', 'PhpLexer', 'PovrayLexer'),
+    '.inf': ('Inform6Lexer', 'IniLexer'),
+    '.ini': ('IniLexer',),
+    '.ino': ('ArduinoLexer',),
+    '.instances': ('RoboconfInstancesLexer',),
+    '.intr': ('DylanLexer',),
+    '.io': ('IoLexer',),
+    '.ipf': ('IgorLexer',),
+    '.j': ('JasminLexer', 'ObjectiveJLexer'),
+    '.jade': ('PugLexer',),
+    '.jag': ('JagsLexer',),
+    '.java': ('JavaLexer',),
+    '.jbst': ('DuelLexer',),
+    '.jcl': ('JclLexer',),
+    '.jl': ('JuliaLexer',),
+    '.js': ('JavascriptLexer',),
+    '.js.in': ('MozPreprocJavascriptLexer',),
+    '.jsgf': ('JsgfLexer',),
+    '.jsm': ('JavascriptLexer',),
+    '.json': ('JsonLexer',),
+    '.jsonld': ('JsonLdLexer',),
+    '.jsp': ('JspLexer',),
+    '.juttle': ('JuttleLexer',),
+    '.kal': ('KalLexer',),
+    '.kid': ('GenshiLexer',),
+    '.kif': ('NewLispLexer',),
+    '.kk': ('KokaLexer',),
+    '.kki': ('KokaLexer',),
+    '.ksh': ('BashLexer',),
+    '.kt': ('KotlinLexer',),
+    '.lagda': ('LiterateAgdaLexer',),
+    '.lasso': ('LassoLexer',),
+    '.lcry': ('LiterateCryptolLexer',),
+    '.lean': ('LeanLexer',),
+    '.less': ('LessCssLexer',),
+    '.lgt': ('LogtalkLexer',),
+    '.lhs': ('LiterateHaskellLexer',),
+    '.lid': ('DylanLidLexer',),
+    '.lidr': ('LiterateIdrisLexer',),
+    '.liquid': ('LiquidLexer',),
+    '.lisp': ('CommonLispLexer',),
+    '.ll': ('LlvmLexer',),
+    '.load': ('FishShellLexer',),
+    '.logtalk': ('LogtalkLexer',),
+    '.ls': ('LiveScriptLexer',),
+    '.lsl': ('LSLLexer',),
+    '.lsp': ('NewLispLexer',),
+    '.lua': ('LuaLexer',),
+    '.m': ('MasonLexer', 'MatlabLexer', 'ObjectiveCLexer', 'OctaveLexer'),
+    '.ma': ('MathematicaLexer',),
+    '.mac': ('EasytrieveLexer',),
+    '.mak': ('MakefileLexer',),
+    '.man': ('GroffLexer',),
+    '.mao': ('MakoLexer',),
+    '.maql': ('MaqlLexer',),
+    '.mask': ('MaskLexer',),
+    '.mc': ('MasonLexer',),
+    '.md': ('MarkdownLexer',),
+    '.mhtml': ('MasonLexer',),
+    '.mi': ('MasonLexer',),
+    '.mk': ('MakefileLexer',),
+    '.ml': ('OcamlLexer',),
+    '.mli': ('OcamlLexer',),
+    '.mll': ('OcamlLexer',),
+    '.mly': ('OcamlLexer',),
+    '.mm': ('ObjectiveCppLexer',),
+    '.mo': ('ModelicaLexer',),
+    '.mod': ('Modula2Lexer',),
+    '.monkey': ('MonkeyLexer',),
+    '.moo': ('MOOCodeLexer',),
+    '.moon': ('MoonScriptLexer',),
+    '.mq4': ('MqlLexer',),
+    '.mq5': ('MqlLexer',),
+    '.mqh': ('MqlLexer',),
+    '.msc': ('MscgenLexer',),
+    '.mt': ('MonteLexer',),
+    '.mu': ('MuPADLexer',),
+    '.mxml': ('MxmlLexer',),
+    '.myt': ('MyghtyLexer',),
+    '.n': ('EzhilLexer', 'NemerleLexer'),
+    '.nb': ('MathematicaLexer',),
+    '.nbp': ('MathematicaLexer',),
+    '.nc': ('NesCLexer',),
+    '.ncl': ('NCLLexer',),
+    '.ng2': ('Angular2HtmlLexer',),
+    '.ni': ('Inform7Lexer',),
+    '.nim': ('NimrodLexer',),
+    '.nimrod': ('NimrodLexer',),
+    '.nit': ('NitLexer',),
+    '.nix': ('NixLexer',),
+    '.nl': ('NewLispLexer',),
+    '.nqp': ('Perl6Lexer',),
+    '.ns2': ('NewspeakLexer',),
+    '.nsh': ('NSISLexer',),
+    '.nsi': ('NSISLexer',),
+    '.objdump': ('ObjdumpLexer',),
+    '.objdump-intel': ('NasmObjdumpLexer',),
+    '.odin': ('OdinLexer',),
+    '.ooc': ('OocLexer',),
+    '.opa': ('OpaLexer',),
+    '.orc': ('CsoundOrchestraLexer',),
+    '.p': ('OpenEdgeLexer', 'PawnLexer'),
+    '.p6': ('Perl6Lexer',),
+    '.p6l': ('Perl6Lexer',),
+    '.p6m': ('Perl6Lexer',),
+    '.pan': ('PanLexer',),
+    '.pas': ('DelphiLexer',),
+    '.patch': ('DiffLexer',),
+    '.pc': ('PkgConfigLexer',),
+    '.pcmk': ('CrmshLexer',),
+    '.php': ('PhpLexer',),
+    '.phtml': ('HtmlPhpLexer',),
+    '.pig': ('PigLexer',),
+    '.pike': ('PikeLexer',),
+    '.pl': ('Perl6Lexer', 'PerlLexer', 'PrologLexer'),
+    '.pl6': ('Perl6Lexer',),
+    '.plot': ('GnuplotLexer',),
+    '.plt': ('GnuplotLexer',),
+    '.pm': ('Perl6Lexer', 'PerlLexer'),
+    '.pm6': ('Perl6Lexer',),
+    '.pmod': ('PikeLexer',),
+    '.po': ('GettextLexer',),
+    '.pot': ('GettextLexer',),
+    '.pov': ('PovrayLexer',),
+    '.pp': ('PuppetLexer',),
+    '.praat': ('PraatLexer',),
+    '.prg': ('FoxProLexer',),
+    '.pro': ('IDLLexer', 'PrologLexer'),
+    '.proc': ('PraatLexer',),
+    '.prolog': ('PrologLexer',),
+    '.properties': ('PropertiesLexer',),
+    '.proto': ('ProtoBufLexer',),
+    '.ps': ('PostScriptLexer',),
+    '.ps1': ('PowerShellLexer',),
+    '.psc': ('PraatLexer',),
+    '.psi': ('ParaSailLexer',),
+    '.psl': ('ParaSailLexer',),
+    '.psm1': ('PowerShellLexer',),
+    '.pug': ('PugLexer',),
+    '.pwn': ('PawnLexer',),
+    '.pxd': ('CythonLexer',),
+    '.pxi': ('CythonLexer',),
+    '.py': ('PythonLexer',),
+    '.py3tb': ('Python3TracebackLexer',),
+    '.pypylog': ('PyPyLogLexer',),
+    '.pytb': ('PythonTracebackLexer',),
+    '.pyw': ('PythonLexer',),
+    '.pyx': ('CythonLexer',),
+    '.qbs': ('QmlLexer',),
+    '.qml': ('QmlLexer',),
+    '.qvto': ('QVToLexer',),
+    '.r': ('RebolLexer',),
+    '.r3': ('RebolLexer',),
+    '.rake': ('RubyLexer',),
+    '.rb': ('RubyLexer',),
+    '.rbw': ('RubyLexer',),
+    '.rbx': ('RubyLexer',),
+    '.reb': ('RebolLexer',),
+    '.red': ('RedLexer',),
+    '.reds': ('RedLexer',),
+    '.reg': ('RegeditLexer',),
+    '.rest': ('RstLexer',),
+    '.rex': ('RexxLexer',),
+    '.rexx': ('RexxLexer',),
+    '.rhtml': ('RhtmlLexer',),
+    '.rkt': ('RacketLexer',),
+    '.rktd': ('RacketLexer',),
+    '.rktl': ('RacketLexer',),
+    '.rl': ('RagelCLexer', 'RagelCppLexer', 'RagelDLexer', 'RagelEmbeddedLexer', 'RagelJavaLexer', 'RagelObjectiveCLexer', 'RagelRubyLexer'),
+    '.rnc': ('RNCCompactLexer',),
+    '.robot': ('RobotFrameworkLexer',),
+    '.rpf': ('VGLLexer',),
+    '.rq': ('SparqlLexer',),
+    '.rql': ('RqlLexer',),
+    '.rs': ('RustLexer',),
+    '.rs.in': ('RustLexer',),
+    '.rsl': ('RslLexer',),
+    '.rss': ('XmlLexer',),
+    '.rst': ('RstLexer',),
+    '.rts': ('RtsLexer',),
+    '.run': ('AmplLexer',),
+    '.rvt': ('TclLexer',),
+    '.rx': ('RexxLexer',),
+    '.s': ('Ca65Lexer', 'GasLexer'),
+    '.sage': ('PythonLexer',),
+    '.sas': ('SASLexer',),
+    '.sass': ('SassLexer',),
+    '.sbl': ('SnowballLexer',),
+    '.sc': ('PythonLexer', 'SuperColliderLexer'),
+    '.scala': ('ScalaLexer',),
+    '.scaml': ('ScamlLexer',),
+    '.scd': ('SuperColliderLexer',),
+    '.sce': ('ScilabLexer',),
+    '.sci': ('ScilabLexer',),
+    '.scm': ('SchemeLexer',),
+    '.sco': ('CsoundScoreLexer',),
+    '.scss': ('ScssLexer',),
+    '.sh': ('BashLexer',),
+    '.sh-session': ('BashSessionLexer',),
+    '.shell-session': ('BashSessionLexer',),
+    '.shen': ('ShenLexer',),
+    '.sig': ('SMLLexer',),
+    '.sil': ('SilverLexer',),
+    '.slim': ('SlimLexer',),
+    '.sls': ('YamlJinjaLexer',),
+    '.smali': ('SmaliLexer',),
+    '.sml': ('SMLLexer',),
+    '.smv': ('NuSMVLexer',),
+    '.snobol': ('SnobolLexer',),
+    '.sp': ('SourcePawnLexer',),
+    '.sparql': ('SparqlLexer',),
+    '.spec': ('RPMSpecLexer',),
+    '.spt': ('CheetahLexer',),
+    '.sql': ('SqlLexer', 'TransactSqlLexer'),
+    '.sqlite3-console': ('SqliteConsoleLexer',),
+    '.ss': ('SchemeLexer',),
+    '.ssp': ('SspLexer',),
+    '.st': ('SmalltalkLexer',),
+    '.stan': ('StanLexer',),
+    '.sv': ('SystemVerilogLexer',),
+    '.svh': ('SystemVerilogLexer',),
+    '.swg': ('SwigLexer',),
+    '.swift': ('SwiftLexer',),
+    '.t': ('Perl6Lexer', 'PerlLexer', 'Tads3Lexer'),
+    '.tac': ('PythonLexer',),
+    '.tap': ('TAPLexer',),
+    '.tasm': ('TasmLexer',),
+    '.tcl': ('TclLexer',),
+    '.tcsh': ('TcshLexer',),
+    '.tea': ('TeaTemplateLexer',),
+    '.tex': ('TexLexer',),
+    '.tf': ('TerraformLexer',),
+    '.thrift': ('ThriftLexer',),
+    '.thy': ('IsabelleLexer',),
+    '.tmpl': ('CheetahLexer',),
+    '.toc': ('TexLexer',),
+    '.todotxt': ('TodotxtLexer',),
+    '.tpl': ('SmartyLexer',),
+    '.treetop': ('TreetopLexer',),
+    '.ts': ('TypeScriptLexer', 'TypoScriptLexer'),
+    '.tst': ('ScilabLexer',),
+    '.tsx': ('TypeScriptLexer',),
+    '.tt': ('TreetopLexer',),
+    '.ttl': ('TurtleLexer',),
+    '.twig': ('TwigHtmlLexer',),
+    '.txt': ('ResourceLexer', 'RobotFrameworkLexer', 'TextLexer', 'TypoScriptLexer'),
+    '.u': ('UrbiscriptLexer',),
+    '.v': ('CoqLexer', 'VerilogLexer'),
+    '.vala': ('ValaLexer',),
+    '.vapi': ('ValaLexer',),
+    '.vark': ('GosuLexer',),
+    '.vb': ('VbNetLexer',),
+    '.vcl': ('VCLLexer',),
+    '.vert': ('GLShaderLexer',),
+    '.vhd': ('VhdlLexer',),
+    '.vhdl': ('VhdlLexer',),
+    '.vim': ('VimLexer',),
+    '.vm': ('VelocityLexer',),
+    '.vpr': ('SilverLexer',),
+    '.wdiff': ('WDiffLexer',),
+    '.weechatlog': ('IrcLogsLexer',),
+    '.whiley': ('WhileyLexer',),
+    '.wlua': ('LuaLexer',),
+    '.wsdl': ('XmlLexer',),
+    '.wsf': ('XmlLexer',),
+    '.x': ('LogosLexer',),
+    '.x10': ('X10Lexer',),
+    '.xhtml': ('HtmlLexer',),
+    '.xi': ('LogosLexer',),
+    '.xm': ('LogosLexer',),
+    '.xmi': ('LogosLexer',),
+    '.xml': ('EvoqueXmlLexer', 'XmlLexer'),
+    '.xpl': ('XsltLexer',),
+    '.xq': ('XQueryLexer',),
+    '.xql': ('XQueryLexer',),
+    '.xqm': ('XQueryLexer',),
+    '.xquery': ('XQueryLexer',),
+    '.xqy': ('XQueryLexer',),
+    '.xsd': ('XmlLexer',),
+    '.xsl': ('XmlLexer', 'XsltLexer'),
+    '.xslt': ('HtmlLexer', 'XmlLexer', 'XsltLexer'),
+    '.xtend': ('XtendLexer',),
+    '.xtm': ('XtlangLexer',),
+    '.xul.in': ('MozPreprocXulLexer',),
+    '.yaml': ('YamlLexer',),
+    '.yml': ('YamlLexer',),
+    '.zep': ('ZephirLexer',),
+    '.zsh': ('BashLexer',),
+}
+
+PATTERNS = (
+    ('BashLexer', '.bash_*'),
+    ('BashLexer', 'bash_*'),
+    ('GroffLexer', '*.[1234567]'),
+    ('KconfigLexer', '*Config.in*'),
+    ('KconfigLexer', 'external.in*'),
+    ('LassoLexer', '*.lasso[89]'),
+    ('MakefileLexer', 'Makefile.*'),
+    ('PhpLexer', '*.php[345]'),
+)
+
 if __name__ == '__main__':  # pragma: no cover
     import sys
     import os
 
     # lookup lexers
     found_lexers = []
+    analysers = []
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+    from pygments.lexer import Lexer
     for root, dirs, files in os.walk('.'):
         for filename in files:
             if filename.endswith('.py') and not filename.startswith('_'):
@@ -470,14 +2295,47 @@ if __name__ == '__main__':  # pragma: no cover
                 for lexer_name in module.__all__:
                     lexer = getattr(module, lexer_name)
                     found_lexers.append(
-                        '%r: %r' % (lexer_name,
-                                    (module_name,
-                                     lexer.name,
-                                     tuple(lexer.aliases),
-                                     tuple(lexer.filenames),
-                                     tuple(lexer.mimetypes))))
+                        (lexer_name, (module_name,
+                                      lexer.name,
+                                      tuple(lexer.aliases),
+                                      tuple(lexer.filenames),
+                                      tuple(lexer.mimetypes))))
+                    if lexer.analyse_text is not Lexer.analyse_text:
+                        analysers.append(lexer_name)
     # sort them to make the diff minimal
     found_lexers.sort()
+    analysers.sort()
+
+    # build the indexes; the first lexer in LEXERS wins for aliases and
+    # mimetypes, like when scanning LEXERS
+    aliases = {}
+    mimetypes = {}
+    filenames = {}
+    suffixes = {}
+    patterns = []
+    for lexer_name, (_, _, lexer_aliases, globs, lexer_mimetypes) in \
+            found_lexers:
+        for alias in lexer_aliases:
+            aliases.setdefault(alias, lexer_name)
+        for mimetype in lexer_mimetypes:
+            mimetypes.setdefault(mimetype, lexer_name)
+        for glob in globs:
+            if not any(c in glob for c in '*?['):
+                names = filenames.setdefault(glob, [])
+            elif glob.startswith('*') and \
+                    not any(c in glob[1:] for c in '*?['):
+                names = suffixes.setdefault(glob[1:], [])
+            else:
+                patterns.append((lexer_name, glob))
+                continue
+            if lexer_name not in names:
+                names.append(lexer_name)
+
+    def format_dict(name, dct):
+        return '%s = {\n%s}\n\n' % (name, ''.join(
+            '    %r: %r,\n' % (key, dct[key] if isinstance(dct[key], str)
+                               else tuple(dct[key]))
+            for key in sorted(dct)))
 
     # extract useful sourcecode from this file
     with open(__file__) as fp:
@@ -495,7 +2353,21 @@ if __name__ == '__main__':  # pragma: no cover
     # write new file
     with open(__file__, 'w') as fp:
         fp.write(header)
-        fp.write('LEXERS = {\n    %s,\n}\n\n' % ',\n    '.join(found_lexers))
+        fp.write('LEXERS = {\n    %s,\n}\n\n' % ',\n    '.join(
+            '%r: %r' % item for item in found_lexers))
+        fp.write('# lexers with an analyse_text method, the only ones worth '
+                 'trying when\n# guessing the lexer of a text\n')
+        fp.write('ANALYSERS = (\n    %s,\n)\n\n' %
+                 ',\n    '.join(map(repr, analysers)))
+        fp.write('# indexes of LEXERS by alias, mimetype, file name and file '
+                 'name suffix\n# (for patterns like "*.py"); PATTERNS holds the '
+                 'other file name patterns\n')
+        fp.write(format_dict('ALIASES', aliases))
+        fp.write(format_dict('MIMETYPES', mimetypes))
+        fp.write(format_dict('FILENAMES', filenames))
+        fp.write(format_dict('SUFFIXES', suffixes))
+        fp.write('PATTERNS = (\n%s)\n\n' % ''.join(
+            '    %r,\n' % (item,) for item in patterns))
         fp.write(footer)
 
     print ('=== %d lexers processed.' % len(found_lexers))
@@ -12,10 +12,10 @@
 import re
 
 from pygments.lexer import RegexLexer, include, bygroups, default, using, \
-    this, words, combined
+    this, words, combined, _builtin_names
 from pygments.token import Text, Comment, Operator, Keyword, Name, String, \
     Number, Punctuation, Other
-from pygments.util import get_bool_opt, iteritems
+from pygments.util import get_bool_opt, itervalues
 import pygments.unistring as uni
 
 __all__ = ['JavascriptLexer', 'KalLexer', 'LiveScriptLexer', 'DartLexer',
@@ -541,6 +541,13 @@ class TypeScriptLexer(RegexLexer):
             return 1.0
 
 
+def _get_lasso_names(table):
+    from pygments.lexers import _lasso_builtins
+    for names in itervalues(getattr(_lasso_builtins, table)):
+        for name in names:
+            yield name
+
+
 class LassoLexer(RegexLexer):
     """
     For `Lasso <http://www.lassosoft.com/>`_ source code, covering both Lasso 9
@@ -764,14 +771,13 @@ class LassoLexer(RegexLexer):
         self.requiredelimiters = get_bool_opt(
             options, 'requiredelimiters', False)
 
-        self._builtins = set()
-        self._members = set()
         if self.builtinshighlighting:
-            from pygments.lexers._lasso_builtins import BUILTINS, MEMBERS
-            for key, value in iteritems(BUILTINS):
-                self._builtins.update(value)
-            for key, value in iteritems(MEMBERS):
-                self._members.update(value)
+            self._builtins = _builtin_names(('lasso', 'BUILTINS'),
+                                            _get_lasso_names, 'BUILTINS')
+            self._members = _builtin_names(('lasso', 'MEMBERS'),
+                                           _get_lasso_names, 'MEMBERS')
+        else:
+            self._builtins = self._members = frozenset()
         RegexLexer.__init__(self, **options)
 
     def get_tokens_unprocessed(self, text):
@@ -16,7 +16,7 @@ from pygments.lexers.javascript import JavascriptLexer
 from pygments.lexers.css import CssLexer
 
 from pygments.lexer import RegexLexer, DelegatingLexer, include, bygroups, \
-    using, this, do_insertions, default, words
+    using, this, do_insertions, default, words, _lexer_pool
 from pygments.token import Text, Comment, Operator, Keyword, Name, String, \
     Number, Punctuation, Generic, Other
 from pygments.util import get_bool_opt, ClassNotFound
@@ -128,7 +128,7 @@ class RstLexer(RegexLexer):
     flags = re.MULTILINE
 
     def _handle_sourcecode(self, match):
-        from pygments.lexers import get_lexer_by_name
+        from pygments.lexers import find_lexer_class_by_name
 
         # section header
         yield match.start(1), Punctuation, match.group(1)
@@ -140,10 +140,10 @@ class RstLexer(RegexLexer):
         yield match.start(7), Text, match.group(7)
 
         # lookup lexer if wanted and existing
-        lexer = None
+        lexer_class = None
         if self.handlecodeblocks:
             try:
-                lexer = get_lexer_by_name(match.group(6).strip())
+                lexer_class = find_lexer_class_by_name(match.group(6).strip())
             except ClassNotFound:
                 pass
         indention = match.group(8)
@@ -151,7 +151,7 @@ class RstLexer(RegexLexer):
         code = (indention + match.group(9) + match.group(10) + match.group(11))
 
         # no lexer for this language. handle it like it was a code block
-        if lexer is None:
+        if lexer_class is None:
             yield match.start(8), String, code
             return
 
@@ -165,7 +165,8 @@ class RstLexer(RegexLexer):
                 code += line[indention_size:]
             else:
                 code += line
-        for item in do_insertions(ins, lexer.get_tokens_unprocessed(code)):
+        for item in do_insertions(ins, _lexer_pool.tokens(lexer_class, {},
+                                                          code)):
             yield item
 
     # from docutils.parsers.rst.states
@@ -517,7 +518,7 @@ class MarkdownLexer(RegexLexer):
         """
         match args: 1:backticks, 2:lang_name, 3:newline, 4:code, 5:backticks
         """
-        from pygments.lexers import get_lexer_by_name
+        from pygments.lexers import find_lexer_class_by_name
 
         # section header
         yield match.start(1), String        , match.group(1)
@@ -525,20 +526,21 @@ class MarkdownLexer(RegexLexer):
         yield match.start(3), Text          , match.group(3)
 
         # lookup lexer if wanted and existing
-        lexer = None
+        lexer_class = None
         if self.handlecodeblocks:
             try:
-                lexer = get_lexer_by_name( match.group(2).strip() )
+                lexer_class = find_lexer_class_by_name(match.group(2).strip())
             except ClassNotFound:
                 pass
         code = match.group(4)
 
         # no lexer for this language. handle it like it was a code block
-        if lexer is None:
+        if lexer_class is None:
             yield match.start(4), String, code
             return
 
-        for item in do_insertions([], lexer.get_tokens_unprocessed(code)):
+        for item in do_insertions([], _lexer_pool.tokens(lexer_class, {},
+                                                         code)):
             yield item
 
         yield match.start(5), String        , match.group(5)
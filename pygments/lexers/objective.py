@@ -12,7 +12,7 @@
 import re
 
 from pygments.lexer import RegexLexer, include, bygroups, using, this, words, \
-    inherit, default
+    inherit, default, _builtin_names
 from pygments.token import Text, Keyword, Name, String, Operator, \
     Number, Punctuation, Literal, Comment
 
@@ -21,6 +21,12 @@ from pygments.lexers.c_cpp import CLexer, CppLexer
 __all__ = ['ObjectiveCLexer', 'ObjectiveCppLexer', 'LogosLexer', 'SwiftLexer']
 
 
+def _get_cocoa_names():
+    from pygments.lexers._cocoa_builtins import COCOA_INTERFACES, \
+        COCOA_PROTOCOLS, COCOA_PRIMITIVES
+    return COCOA_INTERFACES | COCOA_PROTOCOLS | COCOA_PRIMITIVES
+
+
 def objective(baselexer):
     """
     Generate a subclass of baselexer that accepts the Objective-C syntax
@@ -177,14 +183,12 @@ def objective(baselexer):
             return 0
 
         def get_tokens_unprocessed(self, text):
-            from pygments.lexers._cocoa_builtins import COCOA_INTERFACES, \
-                COCOA_PROTOCOLS, COCOA_PRIMITIVES
+            cocoa_names = _builtin_names('cocoa', _get_cocoa_names)
 
             for index, token, value in \
                     baselexer.get_tokens_unprocessed(self, text):
                 if token is Name or token is Name.Class:
-                    if value in COCOA_INTERFACES or value in COCOA_PROTOCOLS \
-                       or value in COCOA_PRIMITIVES:
+                    if value in cocoa_names:
                         token = Name.Builtin.Pseudo
 
                 yield index, token, value
@@ -491,14 +495,12 @@ class SwiftLexer(RegexLexer):
     }
 
     def get_tokens_unprocessed(self, text):
-        from pygments.lexers._cocoa_builtins import COCOA_INTERFACES, \
-            COCOA_PROTOCOLS, COCOA_PRIMITIVES
+        cocoa_names = _builtin_names('cocoa', _get_cocoa_names)
 
         for index, token, value in \
                 RegexLexer.get_tokens_unprocessed(self, text):
             if token is Name or token is Name.Class:
-                if value in COCOA_INTERFACES or value in COCOA_PROTOCOLS \
-                   or value in COCOA_PRIMITIVES:
+                if value in cocoa_names:
                     token = Name.Builtin.Pseudo
 
             yield index, token, value
@@ -9,7 +9,7 @@
     :license: BSD, see LICENSE for details.
 """
 
-from pygments.lexer import RegexLexer
+from pygments.lexer import RegexLexer, _builtin_names
 from pygments.token import Text, Comment, Operator, Keyword, Name, String, \
     Number, Punctuation, Error
 from pygments.util import get_bool_opt
@@ -17,6 +17,11 @@ from pygments.util import get_bool_opt
 __all__ = ['SourcePawnLexer', 'PawnLexer']
 
 
+def _get_sm_functions():
+    from pygments.lexers._sourcemod_builtins import FUNCTIONS
+    return FUNCTIONS
+
+
 class SourcePawnLexer(RegexLexer):
     """
     For SourcePawn source code with preprocessor directives.
@@ -110,10 +115,10 @@ class SourcePawnLexer(RegexLexer):
         self.smhighlighting = get_bool_opt(options,
                                            'sourcemod', True)
 
-        self._functions = set()
         if self.smhighlighting:
-            from pygments.lexers._sourcemod_builtins import FUNCTIONS
-            self._functions.update(FUNCTIONS)
+            self._functions = _builtin_names('sourcepawn', _get_sm_functions)
+        else:
+            self._functions = frozenset()
         RegexLexer.__init__(self, **options)
 
     def get_tokens_unprocessed(self, text):
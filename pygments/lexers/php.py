@@ -12,7 +12,7 @@
 import re
 
 from pygments.lexer import RegexLexer, include, bygroups, default, using, \
-    this, words
+    this, words, _builtin_names
 from pygments.token import Text, Comment, Operator, Keyword, Name, String, \
     Number, Punctuation, Other
 from pygments.util import get_bool_opt, get_list_opt, iteritems
@@ -84,6 +84,14 @@ class ZephirLexer(RegexLexer):
     }
 
 
+def _get_php_functions(disabledmodules):
+    from pygments.lexers._php_builtins import MODULES
+    for key, value in iteritems(MODULES):
+        if key not in disabledmodules:
+            for name in value:
+                yield name
+
+
 class PhpLexer(RegexLexer):
     """
     For `PHP <http://www.php.net/>`_ source code.
@@ -240,12 +248,12 @@ class PhpLexer(RegexLexer):
             self.startinline = options.pop('_startinline')
 
         # collect activated functions in a set
-        self._functions = set()
         if self.funcnamehighlighting:
-            from pygments.lexers._php_builtins import MODULES
-            for key, value in iteritems(MODULES):
-                if key not in self.disabledmodules:
-                    self._functions.update(value)
+            self._functions = _builtin_names(
+                ('php', frozenset(self.disabledmodules)),
+                _get_php_functions, self.disabledmodules)
+        else:
+            self._functions = frozenset()
         RegexLexer.__init__(self, **options)
 
     def get_tokens_unprocessed(self, text):
@@ -11,12 +11,14 @@
 
 import re
 
+from pygments.filter import apply_filters
 from pygments.lexer import Lexer
 from pygments.token import Token, Error, Text
+from pygments.tokenfile import iter_token_file
 from pygments.util import get_choice_opt, text_type, BytesIO
 
 
-__all__ = ['TextLexer', 'RawTokenLexer']
+__all__ = ['TextLexer', 'RawTokenLexer', 'BinaryTokenLexer']
 
 
 class TextLexer(Lexer):
@@ -101,3 +103,53 @@ class RawTokenLexer(Lexer):
                 val = val[2:-2].decode('unicode-escape')
             yield length, ttype, val
             length += len(val)
+
+
+class BinaryTokenLexer(Lexer):
+    """
+    Recreate a token stream formatted with the `BinaryTokenFormatter`.  This
+    lexer raises `ValueError` if the token stream is malformed.
+
+    Given a file, e.g. by ``pygmentize -l binarytokens``, the lexer maps it
+    into memory instead of reading it, and decodes each token value only
+    when it is needed.
+
+    .. versionadded:: 2.3
+    """
+    name = 'Binary token data'
+    aliases = ['binarytokens']
+    filenames = []
+    mimetypes = ['application/x-pygments-binary-tokens']
+
+    def get_tokens(self, text, unfiltered=False):
+        # the token values are stored verbatim, so no decoding or other
+        # preprocessing is done
+        stream = iter_token_file(text)
+        if not unfiltered:
+            stream = apply_filters(stream, self.filters, self)
+        return stream
+
+    def get_tokens_from_file(self, infile, unfiltered=False, chunksize=None):
+        try:
+            import mmap
+            data = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            # not a real file, or an empty one
+            return self.get_tokens(infile.read(), unfiltered)
+
+        def streamer():
+            try:
+                for token in iter_token_file(data):
+                    yield token
+            finally:
+                data.close()
+        stream = streamer()
+        if not unfiltered:
+            stream = apply_filters(stream, self.filters, self)
+        return stream
+
+    def get_tokens_unprocessed(self, text):
+        index = 0
+        for ttype, value in iter_token_file(text):
+            yield index, ttype, value
+            index += len(value)
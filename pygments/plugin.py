@@ -40,7 +40,43 @@ FORMATTER_ENTRY_POINT = 'pygments.formatters'
 STYLE_ENTRY_POINT = 'pygments.styles'
 FILTER_ENTRY_POINT = 'pygments.filters'
 
+# loaded plugins by entry point group, filled on first use
+_plugin_cache = {}
+# the entry points of all installed distributions, from importlib.metadata
+_metadata_cache = []
+
+
+def _metadata_entry_points(group_name):
+    """Return the entry points of a group using importlib.metadata, which is
+    much faster to import than pkg_resources, or None if it's missing."""
+    if not _metadata_cache:
+        try:
+            from importlib import metadata
+        except ImportError:
+            try:
+                import importlib_metadata as metadata
+            except ImportError:
+                return None
+        _metadata_cache.append(metadata.entry_points())
+    entry_points = _metadata_cache[0]
+    if hasattr(entry_points, 'select'):
+        entry_points = entry_points.select(group=group_name)
+    else:
+        entry_points = entry_points.get(group_name, ())
+    # a distribution can be found more than once on sys.path
+    seen = set()
+    result = []
+    for entrypoint in entry_points:
+        if (entrypoint.name, entrypoint.value) not in seen:
+            seen.add((entrypoint.name, entrypoint.value))
+            result.append(entrypoint)
+    return result
+
+
 def iter_entry_points(group_name):
+    entry_points = _metadata_entry_points(group_name)
+    if entry_points is not None:
+        return entry_points
     try:
         import pkg_resources
     except ImportError:
@@ -48,21 +84,40 @@ def iter_entry_points(group_name):
 
     return pkg_resources.iter_entry_points(group_name)
 
+
+def _load_plugins(group_name):
+    """Return a list of the names and loaded objects of the entry points of
+    a group.  The installed plugins are only looked up once; call
+    `clear_plugin_cache` to look them up again."""
+    try:
+        return _plugin_cache[group_name]
+    except KeyError:
+        plugins = [(entrypoint.name, entrypoint.load())
+                   for entrypoint in iter_entry_points(group_name)]
+        return _plugin_cache.setdefault(group_name, plugins)
+
+
+def clear_plugin_cache():
+    """Forget the plugins found so far, e.g. after installing a plugin."""
+    _plugin_cache.clear()
+    del _metadata_cache[:]
+
+
 def find_plugin_lexers():
-    for entrypoint in iter_entry_points(LEXER_ENTRY_POINT):
-        yield entrypoint.load()
+    for _, lexer in _load_plugins(LEXER_ENTRY_POINT):
+        yield lexer
 
 
 def find_plugin_formatters():
-    for entrypoint in iter_entry_points(FORMATTER_ENTRY_POINT):
-        yield entrypoint.name, entrypoint.load()
+    for name, formatter in _load_plugins(FORMATTER_ENTRY_POINT):
+        yield name, formatter
 
 
 def find_plugin_styles():
-    for entrypoint in iter_entry_points(STYLE_ENTRY_POINT):
-        yield entrypoint.name, entrypoint.load()
+    for name, style in _load_plugins(STYLE_ENTRY_POINT):
+        yield name, style
 
 
 def find_plugin_filters():
-    for entrypoint in iter_entry_points(FILTER_ENTRY_POINT):
-        yield entrypoint.name, entrypoint.load()
+    for name, filter_ in _load_plugins(FILTER_ENTRY_POINT):
+        yield name, filter_
@@ -12,72 +12,68 @@
 
 import re
 from re import escape
-from os.path import commonprefix
-from itertools import groupby
-from operator import itemgetter
 
 CS_ESCAPE = re.compile(r'[\^\\\-\]]')
-FIRST_ELEMENT = itemgetter(0)
+
+#: The version of the algorithm; increase it when the generated regexes
+#: change, so that regexes cached on disk aren't used any more.
+REGEX_OPT_VERSION = 2
+
+# regexes generated so far, by word list, prefix and suffix; lexers often
+# share word lists
+_regex_cache = {}
 
 
 def make_charset(letters):
     return '[' + CS_ESCAPE.sub(lambda m: '\\' + m.group(), ''.join(letters)) + ']'
 
 
+def make_trie(strings):
+    """Return a trie of the strings, as nested dicts from characters to
+    subtries.  The key ``None`` marks the end of a string."""
+    trie = {}
+    for s in strings:
+        node = trie
+        for char in s:
+            node = node.setdefault(char, {})
+        node[None] = True
+    return trie
+
+
+def regex_opt_trie(trie):
+    """Return a regex that matches any string in the trie, preferring longer
+    strings.  The regex can be concatenated with others without grouping.
+
+    Characters leading to the same subtrie are collapsed into a charset, and
+    since the branches of each alternation start with different characters,
+    at most one of them can match.
+    """
+    branches = {}
+    for char in trie:
+        if char is not None:
+            branches.setdefault(regex_opt_trie(trie[char]), []).append(char)
+    alternatives = sorted(
+        (len(chars) == 1 and escape(chars[0]) or make_charset(sorted(chars)),
+         rest) for rest, chars in branches.items())
+    if None not in trie:
+        if len(alternatives) == 1:
+            return ''.join(alternatives[0])
+        return '(?:' + '|'.join(head + rest for head, rest in alternatives) + ')'
+    if not alternatives:
+        return ''
+    if len(alternatives) == 1:
+        head, rest = alternatives[0]
+        if not rest:
+            return head + '?'
+    return '(?:' + '|'.join(head + rest for head, rest in alternatives) + ')?'
+
+
 def regex_opt_inner(strings, open_paren):
-    """Return a regex that matches any string in the sorted list of strings."""
+    """Return a regex that matches any string in the list of strings."""
     close_paren = open_paren and ')' or ''
-    # print strings, repr(open_paren)
     if not strings:
-        # print '-> nothing left'
         return ''
-    first = strings[0]
-    if len(strings) == 1:
-        # print '-> only 1 string'
-        return open_paren + escape(first) + close_paren
-    if not first:
-        # print '-> first string empty'
-        return open_paren + regex_opt_inner(strings[1:], '(?:') \
-            + '?' + close_paren
-    if len(first) == 1:
-        # multiple one-char strings? make a charset
-        oneletter = []
-        rest = []
-        for s in strings:
-            if len(s) == 1:
-                oneletter.append(s)
-            else:
-                rest.append(s)
-        if len(oneletter) > 1:  # do we have more than one oneletter string?
-            if rest:
-                # print '-> 1-character + rest'
-                return open_paren + regex_opt_inner(rest, '') + '|' \
-                    + make_charset(oneletter) + close_paren
-            # print '-> only 1-character'
-            return open_paren + make_charset(oneletter) + close_paren
-    prefix = commonprefix(strings)
-    if prefix:
-        plen = len(prefix)
-        # we have a prefix for all strings
-        # print '-> prefix:', prefix
-        return open_paren + escape(prefix) \
-            + regex_opt_inner([s[plen:] for s in strings], '(?:') \
-            + close_paren
-    # is there a suffix?
-    strings_rev = [s[::-1] for s in strings]
-    suffix = commonprefix(strings_rev)
-    if suffix:
-        slen = len(suffix)
-        # print '-> suffix:', suffix[::-1]
-        return open_paren \
-            + regex_opt_inner(sorted(s[:-slen] for s in strings), '(?:') \
-            + escape(suffix[::-1]) + close_paren
-    # recurse on common 1-string prefixes
-    # print '-> last resort'
-    return open_paren + \
-        '|'.join(regex_opt_inner(list(group[1]), '')
-                 for group in groupby(strings, lambda s: s[0] == first[0])) \
-        + close_paren
+    return open_paren + regex_opt_trie(make_trie(strings)) + close_paren
 
 
 def regex_opt(strings, prefix='', suffix=''):
@@ -88,5 +84,9 @@ def regex_opt(strings, prefix='', suffix=''):
 
     *prefix* and *suffix* are pre- and appended to the final regex.
     """
-    strings = sorted(strings)
-    return prefix + regex_opt_inner(strings, '(') + suffix
+    key = (tuple(sorted(set(strings))), prefix, suffix)
+    try:
+        return _regex_cache[key]
+    except KeyError:
+        regex = prefix + regex_opt_inner(key[0], '(') + suffix
+        return _regex_cache.setdefault(key, regex)
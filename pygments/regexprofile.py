@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+    pygments.regexprofile
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Collect statistics about the rules of regex based lexers while they are
+    lexing, to find the rules that take the most time.
+
+    :copyright: Copyright 2006-2017 by the Pygments team, see AUTHORS.
+    :license: BSD, see LICENSE for details.
+"""
+
+from __future__ import print_function
+
+import sys
+from contextlib import contextmanager
+
+from pygments.lexer import RegexLexer, _clock
+from pygments.token import _TokenType
+from pygments.util import iteritems, itervalues
+
+__all__ = ['RegexProfile', 'RuleStats', 'get_profile']
+
+# maps the classes being profiled to their profile, the number of times
+# profiling was enabled for them, and their original rules
+_profiled = {}
+
+
+class RuleStats(object):
+    """
+    The statistics of a single rule: the number of `attempts` to match it,
+    the number of `hits`, the `time` the matching took and the
+    `callback_time` its callback took to produce the tokens, both in
+    seconds.  The callback time includes that of lexers used by the
+    callback, for example with `using`.
+    """
+
+    __slots__ = ('attempts', 'hits', 'time', 'callback_time')
+
+    def __init__(self, attempts=0, hits=0, time=0.0, callback_time=0.0):
+        self.attempts = attempts
+        self.hits = hits
+        self.time = time
+        self.callback_time = callback_time
+
+    def merge(self, other):
+        """Add the statistics of `other` to this one."""
+        self.attempts += other.attempts
+        self.hits += other.hits
+        self.time += other.time
+        self.callback_time += other.callback_time
+
+    def __repr__(self):
+        return '<RuleStats: %d attempts, %d hits, %.6fs, %.6fs callback>' % (
+            self.attempts, self.hits, self.time, self.callback_time)
+
+
+class RegexProfile(object):
+    """
+    Statistics about the rules of `RegexLexer` and `ExtendedRegexLexer`
+    subclasses, collected while profiling is enabled for them::
+
+        profile = RegexProfile()
+        with profile.enabled(PythonLexer):
+            highlight(code, PythonLexer(), formatter)
+        profile.report()
+
+    Enabling profiling for a class replaces its processed rules by measuring
+    ones, so it affects all instances, including those that are lexing at
+    the moment, but not subclasses.  Lexers using the ``rulematching``
+    option are only profiled if they were created while profiling is
+    enabled.
+
+    `rules` maps ``(lexer, state, regex)`` tuples, where `lexer` is the
+    qualified name of the lexer class, to `RuleStats`.  The statistics of
+    all runs while profiling is enabled add up.
+
+    .. versionadded:: 2.3
+    """
+
+    def __init__(self):
+        self.rules = {}
+
+    def enable(self, *classes):
+        """
+        Start collecting statistics for the lexer `classes`.  Profiling can
+        be enabled several times for a class by the same profile, and is
+        disabled when `disable` was called as often.  Raise `ValueError` if
+        another profile is collecting statistics for one of the classes.
+        """
+        for cls in classes:
+            if not issubclass(cls, RegexLexer):
+                raise TypeError('%r is not a RegexLexer subclass' % cls)
+            if cls in _profiled:
+                profile, depth, originals = _profiled[cls]
+                if profile is not self:
+                    raise ValueError('%s is profiled by another profile' %
+                                     cls.__name__)
+                _profiled[cls] = (profile, depth + 1, originals)
+                continue
+            cls._preprocess_tokens()
+            name = '%s.%s' % (cls.__module__, cls.__name__)
+            originals = []
+            for tokendefs in itervalues(cls._all_tokens):
+                for state, rules in iteritems(tokendefs):
+                    originals.append((rules, list(rules)))
+                    rules[:] = [self._instrument(cls, name, state, rule)
+                                for rule in rules]
+            _reset_selectors(cls)
+            _profiled[cls] = (self, 1, originals)
+
+    def disable(self, *classes):
+        """Stop collecting statistics for the lexer `classes`."""
+        for cls in classes:
+            profile, depth, originals = _profiled.get(cls, (None, 0, None))
+            if profile is not self:
+                raise ValueError('%s is not profiled by this profile' %
+                                 cls.__name__)
+            if depth > 1:
+                _profiled[cls] = (profile, depth - 1, originals)
+                continue
+            for rules, original in originals:
+                rules[:] = original
+            _reset_selectors(cls)
+            del _profiled[cls]
+
+    @contextmanager
+    def enabled(self, *classes):
+        """
+        Return a context manager that enables profiling for the lexer
+        `classes` in its block.
+        """
+        self.enable(*classes)
+        try:
+            yield self
+        finally:
+            self.disable(*classes)
+
+    def _instrument(self, cls, name, state, rule):
+        rexmatch, action, new_state = rule
+        regex = getattr(getattr(rexmatch, '__self__', None), 'pattern',
+                        repr(rexmatch))
+        profile = self
+        stats = self.rules.get((name, state, regex))
+        if stats is None:
+            stats = self.rules[name, state, regex] = RuleStats()
+
+        def match(*args):
+            if _profiled.get(cls, (None,))[0] is not profile:
+                # left over in the rule selectors of a lexer instance
+                return rexmatch(*args)
+            start = _clock()
+            m = rexmatch(*args)
+            stats.time += _clock() - start
+            stats.attempts += 1
+            if m:
+                stats.hits += 1
+            return m
+
+        if action is not None and type(action) is not _TokenType:
+            callback = action
+
+            def action(*args):
+                tokens = iter(callback(*args))
+                if _profiled.get(cls, (None,))[0] is not profile:
+                    for item in tokens:
+                        yield item
+                    return
+                while True:
+                    start = _clock()
+                    try:
+                        item = next(tokens)
+                    except StopIteration:
+                        stats.callback_time += _clock() - start
+                        return
+                    stats.callback_time += _clock() - start
+                    yield item
+
+        return match, action, new_state
+
+    def merge(self, other):
+        """Add the statistics of the profile `other` to this one."""
+        for key, stats in iteritems(other.rules):
+            if key not in self.rules:
+                self.rules[key] = RuleStats()
+            self.rules[key].merge(stats)
+
+    def total_time(self):
+        """Return the total time spent matching rules, in seconds."""
+        return sum(stats.time for stats in itervalues(self.rules))
+
+    def to_dict(self):
+        """
+        Return the statistics as a dictionary that can be serialized, for
+        example as JSON, and read back with `from_dict`.
+        """
+        return {'rules': [
+            {'lexer': name, 'state': state, 'regex': regex,
+             'attempts': stats.attempts, 'hits': stats.hits,
+             'time': stats.time, 'callback_time': stats.callback_time}
+            for (name, state, regex), stats in sorted(iteritems(self.rules))
+        ]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a profile from the result of `to_dict`."""
+        profile = cls()
+        for entry in data['rules']:
+            profile.rules[entry['lexer'], entry['state'], entry['regex']] = \
+                RuleStats(entry['attempts'], entry['hits'], entry['time'],
+                          entry['callback_time'])
+        return profile
+
+    def report(self, outfile=None, sort='time', limit=None):
+        """
+        Print a table of the rules that were tried to `outfile` (default:
+        stdout), sorted by `sort` in descending order, which can be one of
+        ``'lexer'``, ``'state'``, ``'regex'``, ``'attempts'``, ``'hits'``,
+        ``'time'``, ``'percall'`` (time per attempt) and ``'callback'``.  If `limit` is
+        given, print only that many rules.
+        """
+        outfile = outfile or sys.stdout
+        columns = ('lexer', 'state', 'regex', 'attempts', 'hits', 'time',
+                   'percall', 'callback')
+        rows = []
+        for (name, state, regex), stats in iteritems(self.rules):
+            if not stats.attempts:
+                continue
+            rows.append((name.rsplit('.', 1)[-1][:16], state[:16],
+                         repr(regex).lstrip('u')[1:-1]
+                         .replace('\\\\', '\\')[:40],
+                         stats.attempts, stats.hits, 1000 * stats.time,
+                         1000 * stats.time / stats.attempts,
+                         1000 * stats.callback_time))
+        rows.sort(key=lambda row: row[columns.index(sort)], reverse=True)
+        if limit is not None:
+            rows = rows[:limit]
+        print('=' * 120, file=outfile)
+        print('%-16s %-16s %-40s %8s %8s %8s %8s %8s' % (
+            'lexer', 'state', 'regex', 'attempts', 'hits', 'time ms',
+            'percall', 'callback'), file=outfile)
+        print('-' * 120, file=outfile)
+        for row in rows:
+            print('%-16s %-16s %-40s %8d %8d %8.3f %8.5f %8.3f' % row,
+                  file=outfile)
+        print('=' * 120, file=outfile)
+
+
+def _reset_selectors(cls):
+    """
+    Drop the cached rule selectors and lookahead tests built from the rules
+    of `cls`, by it or its subclasses, so that new instances use the current
+    rules.
+    """
+    tokendefs = set(id(defs) for defs in itervalues(cls._all_tokens))
+    classes = [cls]
+    while classes:
+        klass = classes.pop()
+        classes.extend(klass.__subclasses__())
+        for name in ('_rule_selectors', '_lookahead_tests'):
+            cache = klass.__dict__.get(name)
+            for key in list(cache or ()):
+                if key[0] in tokendefs:
+                    del cache[key]
+
+
+def get_profile(cls):
+    """Return the `RegexProfile` collecting statistics for the lexer class
+    `cls`, or None if it isn't profiled."""
+    return _profiled.get(cls, (None,))[0]
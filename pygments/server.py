@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+    pygments.server
+    ~~~~~~~~~~~~~~~
+
+    A long-running highlighting server and its client, which avoid the cost
+    of starting Python, importing lexers and compiling their regexes for
+    every piece of code.
+
+    The server listens on a Unix socket or a TCP port.  Over a connection,
+    any number of requests can be sent one after another.  All messages
+    consist of frames: a four byte big-endian length followed by that many
+    bytes.  A request is a frame with a JSON object describing the request,
+    followed by a frame with the code.  The JSON object can have these keys:
+
+    ``lexer``
+        The alias of the lexer.
+    ``filename``
+        A file name used to find the lexer if no alias is given.
+    ``guess``
+        If true, guess the lexer from the code if none is found for the
+        file name.  Without ``lexer`` and ``filename``, the lexer is always
+        guessed.
+    ``formatter``
+        The alias of the formatter.
+    ``outfilename``
+        A file name used to find the formatter if no alias is given.
+    ``options``
+        The options for the lexer and formatter, as for ``pygmentize -O``.
+        The options of the builtin formatters that make them read or write
+        files (see `FILE_OPTIONS`) are rejected.  This is a denylist:
+        options of plugin lexers, formatters or filters that touch files
+        are not filtered, so don't install such plugins where untrusted
+        clients can reach the server.
+    ``filters``
+        A list of ``[name, options]`` pairs of filters to add to the lexer.
+
+    The response is a frame with a JSON object whose ``error`` key is an
+    error message or null, followed by any number of frames with the output
+    and an empty frame.  If a request frame is larger than the maximum
+    frame size of the server, the server responds with an error and closes
+    the connection.
+
+    :copyright: Copyright 2006-2017 by the Pygments team, see AUTHORS.
+    :license: BSD, see LICENSE for details.
+"""
+
+import os
+import json
+import stat
+import socket
+import struct
+import threading
+
+try:
+    import socketserver
+except ImportError:  # Python 2
+    import SocketServer as socketserver
+
+from pygments import highlight
+from pygments.util import ClassNotFound, OptionError, BytesIO, guess_decode
+from pygments.lexers import get_lexer_by_name, guess_lexer, \
+    find_lexer_class_for_filename
+from pygments.lexers.special import TextLexer
+from pygments.formatters import get_formatter_by_name, \
+    get_formatter_for_filename
+from pygments.formatters.latex import LatexEmbeddedLexer, LatexFormatter
+
+__all__ = ['HighlightServer', 'HighlightClient', 'ServerError',
+           'parse_address']
+
+#: The size of the frames the output is sent in.
+CHUNK_SIZE = 65536
+
+#: The default maximum size of the frames sent to the server.
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+#: The options that aren't accepted from clients, because they make the
+#: builtin formatters read or write files as the user running the server.
+#: Options of plugins that touch files are not covered.
+FILE_OPTIONS = frozenset(['cssfile', 'noclobber_cssfile', 'tagsfile'])
+
+_header = struct.Struct('>I')
+
+
+class ServerError(Exception):
+    """Raised by the client if the server couldn't highlight the code."""
+
+
+class _FrameTooLarge(Exception):
+    pass
+
+
+def parse_address(address):
+    """
+    Return the socket family and address for `address`, which is either
+    ``host:port`` or the path of a Unix socket.  The host defaults to
+    ``localhost``.
+    """
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit() and os.sep not in address:
+        return socket.AF_INET, (host or 'localhost', int(port))
+    if not hasattr(socket, 'AF_UNIX'):
+        raise ValueError('Unix sockets are not supported, use host:port')
+    return socket.AF_UNIX, address
+
+
+def _read_exactly(rfile, size):
+    data = rfile.read(size)
+    if len(data) != size:
+        raise EOFError('connection closed')
+    return data
+
+
+def _read_frame(rfile, maxsize=None):
+    """
+    Read a frame, return None if the connection was closed before it.
+    Raise `_FrameTooLarge` if the frame is larger than `maxsize` bytes.
+    """
+    header = rfile.read(_header.size)
+    if not header:
+        return None
+    if len(header) != _header.size:
+        raise EOFError('connection closed')
+    size = _header.unpack(header)[0]
+    if maxsize is not None and size > maxsize:
+        raise _FrameTooLarge('frame of %d bytes exceeds the maximum size of '
+                             '%d bytes' % (size, maxsize))
+    return _read_exactly(rfile, size)
+
+
+def _write_frame(wfile, data):
+    wfile.write(_header.pack(len(data)))
+    wfile.write(data)
+
+
+def _options_key(options, filters):
+    return json.dumps([options, filters], sort_keys=True)
+
+
+class _Highlighter(object):
+    """
+    Highlights the code of requests, reusing the lexers and formatters
+    created for earlier requests with the same options.
+    """
+
+    #: The maximum number of lexers and formatters each that are kept.
+    max_instances = 100
+
+    def __init__(self):
+        self.lexers = {}
+        self.formatters = {}
+        self.lock = threading.Lock()
+
+    def get_lexer(self, request, code, options, filters):
+        name = request.get('lexer')
+        cls = None
+        if not name:
+            filename = request.get('filename')
+            if filename:
+                cls = find_lexer_class_for_filename(filename, code)
+                if cls is None and not request.get('guess'):
+                    raise ClassNotFound('no lexer for filename %r found'
+                                        % filename)
+            if cls is None:
+                try:
+                    cls = type(guess_lexer(code, **options))
+                except ClassNotFound:
+                    cls = TextLexer
+        key = (name, cls, _options_key(options, filters))
+        lexer = self.lexers.get(key)
+        if lexer is None:
+            if name:
+                lexer = get_lexer_by_name(name, **options)
+            else:
+                lexer = cls(**options)
+            for fname, fopts in filters:
+                lexer.add_filter(fname, **fopts)
+            if len(self.lexers) >= self.max_instances:
+                self.lexers.clear()
+            self.lexers[key] = lexer
+        return lexer
+
+    def get_formatter(self, request, options):
+        name = request.get('formatter')
+        if name:
+            key = (name, None, _options_key(options, None))
+        else:
+            outfilename = request.get('outfilename')
+            if not outfilename:
+                raise ClassNotFound('no formatter given')
+            key = (None, os.path.splitext(outfilename)[1],
+                   _options_key(options, None))
+        fmter = self.formatters.get(key)
+        if fmter is None:
+            if name:
+                fmter = get_formatter_by_name(name, **options)
+            else:
+                fmter = get_formatter_for_filename(outfilename, **options)
+            if len(self.formatters) >= self.max_instances:
+                self.formatters.clear()
+            self.formatters[key] = fmter
+        return fmter
+
+    def __call__(self, request, code):
+        """Return the highlighted `code` for `request`."""
+        options = request.get('options') or {}
+        filters = request.get('filters') or []
+        for name in options:
+            if name in FILE_OPTIONS:
+                raise OptionError('option %r is not allowed' % name)
+        inencoding = options.get('inencoding', options.get('encoding'))
+        outencoding = options.get('outencoding', options.get('encoding'))
+        if not inencoding:
+            code, inencoding = guess_decode(code)
+        outfile = BytesIO()
+        # lexers and formatters aren't meant to be used by several threads
+        with self.lock:
+            lexer = self.get_lexer(request, code, options, filters)
+            fmter = self.get_formatter(request, options)
+            if not outencoding:
+                fmter.encoding = inencoding
+            escapeinside = options.get('escapeinside', '')
+            if len(escapeinside) == 2 and isinstance(fmter, LatexFormatter):
+                lexer = LatexEmbeddedLexer(escapeinside[0], escapeinside[1],
+                                           lexer)
+            highlight(code, lexer, fmter, outfile)
+        return outfile.getvalue()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        maxsize = self.server.max_frame_size
+        while True:
+            try:
+                header = _read_frame(self.rfile, maxsize)
+                if header is None:
+                    return
+                code = _read_frame(self.rfile, maxsize)
+                if code is None:
+                    raise EOFError('connection closed')
+            except _FrameTooLarge as err:
+                # the rest of the frame isn't read, so the connection
+                # can't be used any more
+                self.respond(b'', str(err))
+                return
+            try:
+                request = json.loads(header.decode('utf-8'))
+                output = self.server.highlighter(request, code)
+            except (ValueError, TypeError, AttributeError, OptionError) as err:
+                output = b''
+                error = str(err)
+            except Exception as err:
+                output = b''
+                error = '%s: %s' % (err.__class__.__name__, err)
+            else:
+                error = None
+            self.respond(output, error)
+
+    def respond(self, output, error):
+        _write_frame(self.wfile, json.dumps({'error': error}).encode('utf-8'))
+        for i in range(0, len(output), CHUNK_SIZE):
+            _write_frame(self.wfile, output[i:i + CHUNK_SIZE])
+        _write_frame(self.wfile, b'')
+        self.wfile.flush()
+
+
+class HighlightServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """
+    A server highlighting code sent by `HighlightClient` instances.
+
+    `address` is given as for `parse_address`.  An existing Unix socket
+    at the address is replaced.  Call ``serve_forever()`` to run the
+    server, and ``server_close()`` to close it.  Requests with frames larger
+    than the `max_frame_size` attribute are rejected.
+
+    .. versionadded:: 2.3
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+    max_frame_size = MAX_FRAME_SIZE
+
+    def __init__(self, address):
+        self.address_family, address = parse_address(address)
+        if self.address_family != socket.AF_INET:
+            try:
+                if stat.S_ISSOCK(os.stat(address).st_mode):
+                    os.remove(address)
+            except OSError:
+                pass
+        self.highlighter = _Highlighter()
+        socketserver.TCPServer.__init__(self, address, _RequestHandler)
+
+    def server_close(self):
+        socketserver.TCPServer.server_close(self)
+        if self.address_family != socket.AF_INET:
+            try:
+                os.remove(self.server_address)
+            except OSError:
+                pass
+
+
+class HighlightClient(object):
+    """
+    A connection to a `HighlightServer` at `address`, given as for
+    `parse_address`.  Can be used as a context manager that closes the
+    connection.
+
+    .. versionadded:: 2.3
+    """
+
+    def __init__(self, address):
+        family, address = parse_address(address)
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(address)
+        except socket.error:
+            self.sock.close()
+            raise
+        self.rfile = self.sock.makefile('rb')
+        self.wfile = self.sock.makefile('wb')
+
+    def close(self):
+        self.rfile.close()
+        self.wfile.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def _read_frame(self):
+        frame = _read_frame(self.rfile)
+        if frame is None:
+            raise EOFError('connection closed')
+        return frame
+
+    def __exit__(self, *args):
+        self.close()
+
+    def highlight(self, code, lexer=None, formatter=None, options=None,
+                  **request):
+        """
+        Return the output of highlighting `code` (a byte string) as bytes.
+        The other arguments are the keys of the request, see the module
+        documentation.  Raise `ServerError` if the server reports an error,
+        and `EOFError` if it closes the connection.
+        """
+        request.update(lexer=lexer, formatter=formatter, options=options)
+        _write_frame(self.wfile, json.dumps(request).encode('utf-8'))
+        _write_frame(self.wfile, code)
+        self.wfile.flush()
+        response = json.loads(self._read_frame().decode('utf-8'))
+        chunks = []
+        while True:
+            chunk = self._read_frame()
+            if not chunk:
+                break
+            chunks.append(chunk)
+        if response['error'] is not None:
+            raise ServerError(response['error'])
+        return b''.join(chunks)
@@ -9,6 +9,13 @@
     :license: BSD, see LICENSE for details.
 """
 
+from array import array
+
+from pygments.util import izip
+
+# all token types, indexed by their id
+_token_types = []
+
 
 class _TokenType(tuple):
     parent = None
@@ -25,6 +32,9 @@ class _TokenType(tuple):
     def __init__(self, *args):
         # no need to call super.__init__
         self.subtypes = set()
+        #: A small integer identifying the token type, see `id_to_tokentype`.
+        self.id = len(_token_types)
+        _token_types.append(self)
 
     def __contains__(self, val):
         return self is val or (
@@ -118,6 +128,118 @@ def string_to_tokentype(s):
     return node
 
 
+def id_to_tokentype(token_id):
+    """
+    Return the token type whose ``id`` attribute is `token_id`.
+    """
+    return _token_types[token_id]
+
+
+class TokenBuffer(object):
+    """
+    A compact list of tokens.  The tokens are stored as the offsets and
+    lengths of their values in `text` and the ids of their token types, in
+    arrays, instead of tuples holding a string each.
+
+    Iterating over the buffer yields ``(tokentype, value)`` pairs, so it can
+    be passed to formatters and filters like the result of
+    `Lexer.get_tokens()`.  Indexing it returns such a pair, slicing a list
+    of them.  Use `Lexer.get_token_buffer()` to fill one.
+
+    .. versionadded:: 2.3
+    """
+
+    def __init__(self, text=u''):
+        #: The text the tokens refer to.  Values of tokens that weren't
+        #: found in it are appended to it.
+        self.text = text
+        #: The offsets of the token values in `text`.
+        self.starts = array('l')
+        #: The lengths of the token values.
+        self.lengths = array('l')
+        #: The ids of the token types.
+        self.ids = array('I')
+        # values appended to the text, waiting to be joined
+        self._extra = []
+        self._end = len(text)
+
+    def append(self, ttype, value, start=None):
+        """
+        Add a token.  If `start` is given and `value` is found there in
+        `text`, only its position is stored, otherwise the value is
+        appended to `text`.
+        """
+        if start is None or not self.text.startswith(value, start):
+            start = self._end
+            self._extra.append(value)
+            self._end += len(value)
+        self.starts.append(start)
+        self.lengths.append(len(value))
+        self.ids.append(ttype.id)
+
+    def extend(self, tokens):
+        """
+        Add ``(tokentype, value)`` pairs, whose values are expected to follow
+        each other in `text`.  Values that differ from the text, e.g. because
+        a filter changed them, are assumed to replace text of the same
+        length.
+        """
+        pos = 0
+        append = self.append
+        for ttype, value in tokens:
+            append(ttype, value, pos)
+            pos += len(value)
+
+    def extend_unprocessed(self, tokens):
+        """
+        Add ``(index, tokentype, value)`` tuples as returned by
+        `Lexer.get_tokens_unprocessed()` for `text`.
+        """
+        append = self.append
+        for index, ttype, value in tokens:
+            append(ttype, value, index)
+
+    def _join_extra(self):
+        if self._extra:
+            self.text += u''.join(self._extra)
+            self._extra = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._join_extra()
+            text = self.text
+            return [(_token_types[token_id], text[start:start + length])
+                    for start, length, token_id in izip(self.starts[index],
+                                                        self.lengths[index],
+                                                        self.ids[index])]
+        start = self.starts[index]
+        end = start + self.lengths[index]
+        if end > len(self.text):
+            self._join_extra()
+        return _token_types[self.ids[index]], self.text[start:end]
+
+    def __iter__(self):
+        self._join_extra()
+        text = self.text
+        for start, length, token_id in izip(self.starts, self.lengths,
+                                           self.ids):
+            yield _token_types[token_id], text[start:start + length]
+
+    def iter_unprocessed(self):
+        """
+        Yield the tokens as ``(index, tokentype, value)`` tuples, with the
+        index of each value in `text`.
+        """
+        self._join_extra()
+        text = self.text
+        for start, length, token_id in izip(self.starts, self.lengths,
+                                           self.ids):
+            yield start, _token_types[token_id], text[start:start + length]
+
+
 # Map standard token types to short names, used in CSS class naming.
 # If you add a new item, please be sure to run this file to perform
 # a consistency check for duplicate values.
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+    pygments.tokenfile
+    ~~~~~~~~~~~~~~~~~~
+
+    A compact binary format for storing token streams, written by the
+    `BinaryTokenFormatter` and read by the `BinaryTokenLexer`.
+
+    A file starts with the magic bytes ``PYGTOK`` and a format version byte,
+    followed by the UTF-8 encoded token values, one after another.  After
+    them come the tables, which consist of unsigned LEB128 varints:
+
+    * the number of token types, then for each the length and the ASCII
+      bytes of its name (like ``Token.Name.Function``),
+    * the number of tokens, then for each the index of its token type and
+      the number of bytes of its value.
+
+    The file ends with the offset of the tables, as an eight byte big-endian
+    integer.  Since the tables are written last, the values can be written
+    while the tokens are coming in, and a reader can find every value
+    without decoding the ones before it.
+
+    :copyright: Copyright 2006-2017 by the Pygments team, see AUTHORS.
+    :license: BSD, see LICENSE for details.
+"""
+
+import struct
+
+from pygments.token import string_to_tokentype
+
+MAGIC = b'PYGTOK\x01'
+
+_trailer = struct.Struct('>Q')
+
+
+def _encode_varint(number, buf):
+    """Append `number` to the bytearray `buf` as a varint."""
+    while number > 0x7f:
+        buf.append(number & 0x7f | 0x80)
+        number >>= 7
+    buf.append(number)
+
+
+def _decode_varint(buf, pos):
+    """Return the varint at `pos` of the bytearray `buf` and the position
+    after it."""
+    number = shift = 0
+    while True:
+        try:
+            byte = buf[pos]
+        except IndexError:
+            raise ValueError('truncated token file')
+        pos += 1
+        number |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return number, pos
+        shift += 7
+
+
+class TokenFileWriter(object):
+    """
+    Writes tokens to the binary file object `outfile`.  The values are
+    buffered and written in blocks of about `bufsize` bytes; `close` writes
+    the rest and the tables, but doesn't close `outfile`.
+    """
+
+    def __init__(self, outfile, bufsize=65536):
+        self.outfile = outfile
+        self.bufsize = bufsize
+        self._types = {}
+        self._type_table = bytearray()
+        self._token_table = bytearray()
+        self._count = 0
+        self._offset = len(MAGIC)
+        self._pending = []
+        self._pending_size = 0
+        outfile.write(MAGIC)
+
+    def write(self, ttype, value):
+        """Add a token."""
+        data = value.encode('utf-8')
+        index = self._types.get(ttype)
+        if index is None:
+            index = self._types[ttype] = len(self._types)
+            name = str(ttype).encode('ascii')
+            _encode_varint(len(name), self._type_table)
+            self._type_table += name
+        _encode_varint(index, self._token_table)
+        _encode_varint(len(data), self._token_table)
+        self._count += 1
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= self.bufsize:
+            self._flush()
+
+    def _flush(self):
+        self.outfile.write(b''.join(self._pending))
+        self._offset += self._pending_size
+        self._pending = []
+        self._pending_size = 0
+
+    def close(self):
+        """Write the buffered values and the tables."""
+        self._flush()
+        tables = bytearray()
+        _encode_varint(len(self._types), tables)
+        tables += self._type_table
+        _encode_varint(self._count, tables)
+        tables += self._token_table
+        self.outfile.write(bytes(tables))
+        self.outfile.write(_trailer.pack(self._offset))
+
+
+def iter_token_file(data):
+    """
+    Yield the ``(tokentype, value)`` pairs stored in `data`, which can be a
+    bytes object or anything supporting slicing like it, such as an `mmap`.
+    Only the tables are copied; each value is decoded when it is yielded.
+
+    Raise `ValueError` if `data` is not a valid token file.
+    """
+    size = len(data)
+    if size < len(MAGIC) + _trailer.size or \
+       data[:len(MAGIC)] != MAGIC:
+        raise ValueError('not a binary token file')
+    offset = _trailer.unpack(data[size - _trailer.size:])[0]
+    if not len(MAGIC) <= offset <= size - _trailer.size:
+        raise ValueError('malformed token file')
+    tables = bytearray(data[offset:size - _trailer.size])
+
+    ntypes, pos = _decode_varint(tables, 0)
+    ttypes = []
+    for _ in range(ntypes):
+        length, pos = _decode_varint(tables, pos)
+        name = bytes(tables[pos:pos + length]).decode('ascii')
+        pos += length
+        if not all(part[:1].isupper() for part in name.split('.')):
+            raise ValueError('malformed token name')
+        ttypes.append(string_to_tokentype(name))
+
+    ntokens, pos = _decode_varint(tables, pos)
+    start = len(MAGIC)
+    for _ in range(ntokens):
+        index, pos = _decode_varint(tables, pos)
+        length, pos = _decode_varint(tables, pos)
+        if index >= ntypes or start + length > offset:
+            raise ValueError('malformed token file')
+        yield ttypes[index], data[start:start + length].decode('utf-8')
+        start += length
@@ -9,6 +9,7 @@
     :license: BSD, see LICENSE for details.
 """
 
+import os
 import re
 import sys
 
@@ -37,6 +38,27 @@ class OptionError(Exception):
     pass
 
 
+class LexerTimeout(Exception):
+    """
+    Raised by a `RegexLexer` with the ``timeout`` option if lexing takes
+    longer.  `pos` is the position in the text where lexing stopped, `state`
+    the state stack at that point, and `rule` the regex of the rule that was
+    tried last (None if unknown).
+    """
+
+    def __init__(self, timeout, pos, state, rule):
+        Exception.__init__(self, timeout, pos, state, rule)
+        self.timeout = timeout
+        self.pos = pos
+        self.state = state
+        self.rule = rule
+
+    def __str__(self):
+        return 'lexing took longer than %gs; stopped at position %d in ' \
+            'state %r after rule %r' % (self.timeout, self.pos,
+                                       '/'.join(self.state), self.rule)
+
+
 def get_choice_opt(options, optname, allowed, default=None, normcase=False):
     string = options.get(optname, default)
     if normcase:
@@ -320,6 +342,24 @@ def guess_decode(text):
             return text, 'latin1'
 
 
+def guess_encoding(data):
+    """Return the encoding `guess_decode` would use for a text starting
+    with the bytes *data*.
+
+    An incomplete character at the end of *data* is ignored, so that the
+    beginning of a file can be used to guess the encoding of all of it.
+    """
+    import codecs
+    import locale
+    for encoding in ('utf-8', locale.getpreferredencoding()):
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(data)
+        except (UnicodeDecodeError, LookupError):
+            continue
+        return encoding
+    return 'latin1'
+
+
 def guess_decode_from_terminal(text, term):
     """Decode *text* coming from terminal *term*.
 
@@ -345,6 +385,23 @@ def terminal_encoding(term):
     return locale.getpreferredencoding()
 
 
+def replace_file(src, dst):
+    """Rename the file *src* to *dst*, replacing *dst* if it exists.
+
+    This is atomic where ``os.replace`` exists (Python 3.3+).
+    """
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+        return
+    try:
+        os.rename(src, dst)
+    except OSError:
+        # Python 2 on Windows doesn't replace existing files on rename
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
 # Python 2/3 compatibility
 
 if sys.version_info < (3, 0):
@@ -355,6 +412,7 @@ if sys.version_info < (3, 0):
     u_prefix = 'u'
     iteritems = dict.iteritems
     itervalues = dict.itervalues
+    from itertools import izip
     import StringIO
     import cStringIO
     # unfortunately, io.StringIO in Python 2 doesn't accept str at all
@@ -368,6 +426,7 @@ else:
     u_prefix = ''
     iteritems = dict.items
     itervalues = dict.values
+    izip = zip
     from io import StringIO, BytesIO, TextIOWrapper
 
     class UnclosingTextIOWrapper(TextIOWrapper):
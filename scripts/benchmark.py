@@ -0,0 +1,319 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+    Lexer and formatter benchmark
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Lex and format the example files (or the files given on the command
+    line) and report the throughput of each lexer and formatter, optionally
+    comparing it to a previous run.
+
+    :copyright: Copyright 2006-2017 by the Pygments team, see AUTHORS.
+    :license: BSD, see LICENSE for details.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import json
+import platform
+from timeit import default_timer as timer
+
+# always prefer Pygments from source if exists
+srcpath = os.path.join(os.path.dirname(__file__), '..')
+if os.path.isdir(os.path.join(srcpath, 'pygments')):
+    sys.path.insert(0, srcpath)
+
+from pygments import __version__, format
+from pygments.lexers import get_lexer_by_name, get_lexer_for_filename
+from pygments.formatters import get_formatter_by_name
+from pygments.util import ClassNotFound
+
+EXAMPLEDIR = os.path.join(srcpath, 'tests', 'examplefiles')
+
+
+def find_files(paths):
+    """Return the files to benchmark: the files given in `paths`, or the
+    files in the directories given there."""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for fn in sorted(os.listdir(path)):
+            if fn.startswith('.') or fn.endswith('#'):
+                continue
+            absfn = os.path.join(path, fn)
+            if os.path.isfile(absfn):
+                files.append(absfn)
+    return files
+
+
+def read_file(fn):
+    """Read and decode a file like the example file tests do."""
+    with open(fn, 'rb') as fp:
+        text = fp.read()
+    text = text.replace(b'\r\n', b'\n')
+    text = text.strip(b'\n') + b'\n'
+    try:
+        text = text.decode('utf-8')
+        if text.startswith(u'\ufeff'):
+            text = text[len(u'\ufeff'):]
+    except UnicodeError:
+        text = text.decode('latin1')
+    return text
+
+
+def find_lexer(fn, text, lexername=None):
+    """Find the lexer for a file, also accepting the ``<lexer>_filename``
+    names of the example files."""
+    if lexername:
+        return get_lexer_by_name(lexername)
+    basename = os.path.basename(fn)
+    if '_' in basename:
+        try:
+            return get_lexer_by_name(basename.split('_')[0])
+        except ClassNotFound:
+            pass
+    return get_lexer_for_filename(basename, code=text)
+
+
+def best_time(func, repeat, warmup):
+    """Call `func` `warmup` times, then `repeat` times, and return the last
+    result and the shortest time a call took."""
+    result = None
+    for _ in range(warmup):
+        result = func()
+    best = None
+    for _ in range(repeat):
+        start = timer()
+        result = func()
+        elapsed = timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return result, best
+
+
+def _add(stats, name, chars, tokens, elapsed):
+    entry = stats.setdefault(name, {'files': 0, 'chars': 0, 'tokens': 0,
+                                    'time': 0.0})
+    entry['files'] += 1
+    entry['chars'] += chars
+    entry['tokens'] += tokens
+    entry['time'] += elapsed
+
+
+def _finish(stats):
+    for entry in stats.values():
+        elapsed = entry['time'] or 1e-9
+        entry['chars_per_sec'] = entry['chars'] / elapsed
+        entry['tokens_per_sec'] = entry['tokens'] / elapsed
+
+
+def run(files, formatters=('html', 'terminal', 'null'), lexername=None,
+        repeat=3, warmup=1, verbose=False):
+    """
+    Lex and format each file, and return the results as a dictionary with
+    ``lexers`` and ``formatters`` entries mapping the names to the number of
+    files, chars and tokens, the total time taken for them, and the chars
+    and tokens per second.  Files that can't be read or lexed are listed
+    under ``errors``.
+    """
+    lexer_stats = {}
+    formatter_stats = {}
+    errors = {}
+    fmters = [(name, get_formatter_by_name(name)) for name in formatters]
+
+    for fn in files:
+        try:
+            text = read_file(fn)
+            lexer = find_lexer(fn, text, lexername)
+            tokens, elapsed = best_time(lambda: list(lexer.get_tokens(text)),
+                                        repeat, warmup)
+        except Exception as err:
+            errors[fn] = '%s: %s' % (err.__class__.__name__, err)
+            continue
+        _add(lexer_stats, lexer.name, len(text), len(tokens), elapsed)
+        if verbose:
+            print('%-40s %-20s %8.2f ms' % (os.path.basename(fn), lexer.name,
+                                            1000 * elapsed))
+        for name, fmter in fmters:
+            _, elapsed = best_time(lambda: format(tokens, fmter),
+                                   repeat, warmup)
+            _add(formatter_stats, name, len(text), len(tokens), elapsed)
+
+    _finish(lexer_stats)
+    _finish(formatter_stats)
+    return {
+        'pygments': __version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'repeat': repeat,
+        'warmup': warmup,
+        'lexers': lexer_stats,
+        'formatters': formatter_stats,
+        'errors': errors,
+    }
+
+
+def compare(baseline, results, threshold=0.1):
+    """
+    Compare the chars per second of each lexer and formatter in `results`
+    to `baseline`.  Return a list of ``(kind, name, old, new)`` tuples, one
+    for each lexer or formatter that got slower by more than `threshold`
+    (a fraction of the old speed).  Lexers and formatters that weren't
+    given the same input in both runs are not compared.
+    """
+    regressions = []
+    for kind in ('lexers', 'formatters'):
+        old_stats = baseline.get(kind, {})
+        for name, entry in sorted(results[kind].items()):
+            if not _comparable(old_stats.get(name), entry):
+                continue
+            old = old_stats[name]['chars_per_sec']
+            new = entry['chars_per_sec']
+            if new < old * (1 - threshold):
+                regressions.append((kind, name, old, new))
+    return regressions
+
+
+def _comparable(old, new):
+    return old is not None and \
+        (old['files'], old['chars']) == (new['files'], new['chars'])
+
+
+def print_results(results, baseline=None):
+    for kind in ('lexers', 'formatters'):
+        old_stats = baseline.get(kind, {}) if baseline else {}
+        print()
+        print('%-32s %5s %10s %12s %12s %8s' %
+              (kind.capitalize(), 'files', 'chars', 'chars/s', 'tokens/s',
+               'change' if baseline else ''))
+        for name, entry in sorted(results[kind].items()):
+            change = ''
+            if _comparable(old_stats.get(name), entry):
+                change = '%+7.1f%%' % (
+                    100 * (entry['chars_per_sec'] /
+                           old_stats[name]['chars_per_sec'] - 1))
+            print('%-32s %5d %10d %12.0f %12.0f %8s' %
+                  (name, entry['files'], entry['chars'],
+                   entry['chars_per_sec'], entry['tokens_per_sec'], change))
+    if results['errors']:
+        print()
+        print('Files that could not be read or lexed:')
+        for fn, err in sorted(results['errors'].items()):
+            print('    %s: %s' % (fn, err))
+
+
+def main(args):
+    import getopt
+    try:
+        opts, args = getopt.getopt(args, 'l:f:n:w:o:c:t:vh')
+    except getopt.GetoptError as err:
+        print('Error:', err, file=sys.stderr)
+        print_help(sys.stderr)
+        return 2
+    lexername = None
+    formatters = ['html', 'terminal', 'null']
+    repeat = 3
+    warmup = 1
+    outfn = None
+    baselinefn = None
+    threshold = 0.1
+    verbose = False
+    try:
+        for opt, val in opts:
+            if opt == '-l':
+                lexername = val
+                get_lexer_by_name(lexername)
+            elif opt == '-f':
+                formatters = [name for name in val.split(',') if name]
+                for name in formatters:
+                    get_formatter_by_name(name)
+            elif opt == '-n':
+                repeat = int(val)
+                if repeat < 1:
+                    raise ValueError('-n must be at least 1')
+            elif opt == '-w':
+                warmup = int(val)
+                if warmup < 0:
+                    raise ValueError('-w must not be negative')
+            elif opt == '-o':
+                outfn = val
+            elif opt == '-c':
+                baselinefn = val
+            elif opt == '-t':
+                threshold = float(val) / 100
+            elif opt == '-v':
+                verbose = True
+            elif opt == '-h':
+                print_help()
+                return 0
+    except ClassNotFound as err:
+        print('Error:', err, file=sys.stderr)
+        return 1
+    except ValueError as err:
+        print('Error:', err, file=sys.stderr)
+        print_help(sys.stderr)
+        return 2
+
+    baseline = None
+    if baselinefn:
+        with open(baselinefn) as fp:
+            baseline = json.load(fp)
+
+    results = run(find_files(args or [EXAMPLEDIR]), formatters, lexername,
+                  repeat, warmup, verbose)
+
+    if outfn == '-':
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+    else:
+        if outfn:
+            with open(outfn, 'w') as fp:
+                json.dump(results, fp, indent=2, sort_keys=True)
+        print_results(results, baseline)
+
+    if baseline:
+        regressions = compare(baseline, results, threshold)
+        if regressions:
+            print('\nSlower by more than %d%% than the baseline:' %
+                  (threshold * 100), file=sys.stderr)
+            for kind, name, old, new in regressions:
+                print('    %s %s: %.0f -> %.0f chars/s' %
+                      (kind[:-1], name, old, new), file=sys.stderr)
+            return 1
+    return 0
+
+
+def print_help(file=sys.stdout):
+    print('''\
+Pygments development helper to measure the speed of lexers and formatters.
+
+    scripts/benchmark.py [options] [file or directory ...]
+
+Lexes every given file (default: all files in tests/examplefiles) with
+its lexer and formats the tokens with each formatter, and reports the
+chars and tokens per second for each lexer and formatter.  Each run is
+repeated and the fastest one is counted.
+
+    -l NAME         use lexer named NAME for all files (default is to
+                    find it like the example file tests do)
+    -f NAMES        comma separated formatters to benchmark (default
+                    html,terminal,null; give '' for none)
+    -n N            time N runs of each file (default 3)
+    -w N            do N untimed runs before (default 1)
+    -v              show the lexing time of each file
+
+Saving and comparing results:
+
+    -o FILE         write the results as JSON to FILE ('-' for stdout)
+    -c FILE         compare to the results saved in FILE, and exit with
+                    status 1 if a lexer or formatter got slower
+    -t PERCENT      tolerated slowdown for -c (default 10)
+''', file=file)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -23,8 +23,8 @@ if os.path.isdir(os.path.join(srcpath, 'pygments')):
     sys.path.insert(0, srcpath)
 
 
-from pygments.lexer import RegexLexer, ExtendedRegexLexer, LexerContext, \
-    ProfilingRegexLexer, ProfilingRegexLexerMeta
+from pygments.lexer import RegexLexer, ExtendedRegexLexer, LexerContext
+from pygments.regexprofile import RegexProfile
 from pygments.lexers import get_lexer_by_name, find_lexer_class, \
     find_lexer_class_for_filename
 from pygments.token import Error, Text, _TokenType
@@ -112,13 +112,15 @@ def main(fn, lexer=None, options={}):
         print('Using lexer: %s (%s.%s)' % (lxcls.name, lxcls.__module__,
                                            lxcls.__name__))
     debug_lexer = False
-    # if profile:
-    #     # does not work for e.g. ExtendedRegexLexers
-    #     if lxcls.__bases__ == (RegexLexer,):
-    #         # yes we can!  (change the metaclass)
-    #         lxcls.__class__ = ProfilingRegexLexerMeta
-    #         lxcls.__bases__ = (ProfilingRegexLexer,)
-    #         lxcls._prof_sort_index = profsort
+    if profile:
+        if not issubclass(lxcls, RegexLexer):
+            raise AssertionError('lexer %s is not regex based' % lxcls.name)
+        regex_profile = RegexProfile()
+        with regex_profile.enabled(lxcls):
+            ret = lex(fn, lxcls, options, debug_lexer)
+        regex_profile.report(sort=('state', 'regex', 'attempts', 'time',
+                                   'percall')[profsort])
+        return ret
     # else:
     #     if lxcls.__bases__ == (RegexLexer,):
     #         lxcls.__bases__ = (DebuggingRegexLexer,)
@@ -130,7 +132,10 @@ def main(fn, lexer=None, options={}):
     #         # HACK: ExtendedRegexLexer subclasses will only partially work here.
     #         lxcls.__bases__ = (DebuggingRegexLexer,)
     #         debug_lexer = True
+    return lex(fn, lxcls, options, debug_lexer)
+
 
+def lex(fn, lxcls, options, debug_lexer):
     lx = lxcls(**options)
     lno = 1
     if fn == '-':
@@ -203,8 +208,8 @@ Debugging lexing errors:
 
 Profiling:
 
-    -p              use the ProfilingRegexLexer to profile regexes
-                    instead of the debugging lexer
+    -p              profile the regexes of the lexer
+                    instead of using the debugging lexer
     -s N            sort profiling output by column N (default is
                     column 4, the time per call)
 ''')
@@ -14,7 +14,7 @@ import unittest
 
 from pygments import lexers, formatters, lex, format
 from pygments.token import _TokenType, Text
-from pygments.lexer import RegexLexer
+from pygments.lexer import Lexer, RegexLexer
 from pygments.formatters.img import FontNotFound
 from pygments.util import text_type, StringIO, BytesIO, xrange, ClassNotFound
 
@@ -50,6 +50,11 @@ def test_lexer_classes():
 
         assert all(al.lower() == al for al in cls.aliases)
 
+        # only lexers listed as analysers are tried by guess_lexer
+        assert (cls.__name__ in lexers.ANALYSERS) == \
+            (cls.analyse_text is not Lexer.analyse_text), \
+            '%s: ANALYSERS out of date' % cls
+
         inst = cls(opt1="val1", opt2="val2")
         if issubclass(cls, RegexLexer):
             if not hasattr(cls, '_tokens'):
@@ -64,6 +69,9 @@ def test_lexer_classes():
 
         if cls.name in ['XQuery', 'Opa']:   # XXX temporary
             return
+        if cls.__name__ == 'BinaryTokenLexer':
+            # only accepts binary token files
+            return
 
         try:
             tokens = list(inst.get_tokens(test_content))
@@ -108,7 +116,7 @@ def test_lexer_options():
             ensure(inst.get_tokens('a\nb\n\n'), 'a\nb')
 
     for lexer in lexers._iter_lexerclasses(plugins=False):
-        if lexer.__name__ == 'RawTokenLexer':
+        if lexer.__name__ in ('RawTokenLexer', 'BinaryTokenLexer'):
             # this one is special
             continue
         yield verify, lexer
@@ -138,6 +146,19 @@ def test_get_lexers():
         for mimetype in mimetypes:
             assert cls == lexers.get_lexer_for_mimetype(mimetype).__class__.__name__
 
+    # every file name pattern is in one of the indexes
+    for cls, (_, _, _, filenames, _) in lexers.LEXERS.items():
+        for filename in filenames:
+            assert (cls in lexers.FILENAMES.get(filename, ()) or
+                    cls in lexers.SUFFIXES.get(filename[1:], ()) or
+                    (cls, filename) in lexers.PATTERNS), \
+                '%s: %s not indexed' % (cls, filename)
+    assert lexers.find_lexer_class_for_filename('Makefile') is \
+        lexers.find_lexer_class_for_filename('foo.mak')
+    assert lexers.find_lexer_class_for_filename('Makefile.am') is \
+        lexers.find_lexer_class_for_filename('Makefile')
+    assert lexers.find_lexer_class_for_filename('foo.unknown') is None
+
     try:
         lexers.get_lexer_by_name(None)
     except ClassNotFound:
@@ -201,6 +222,39 @@ def test_formatter_encodings():
     assert u"ä".encode("utf8") in format(tokens, fmt)
 
 
+def test_formatter_buffered_output():
+    from pygments.formatter import BufferedOutput
+    from pygments.formatters import NullFormatter
+
+    class Output(BytesIO):
+        def __init__(self):
+            BytesIO.__init__(self)
+            self.writes = 0
+            self.name = 'out.txt'
+
+        def write(self, data):
+            self.writes += 1
+            BytesIO.write(self, data)
+
+    # the text is encoded as a whole, with a single BOM
+    tokens = [(Text, u"ä")] * 1000
+    out = Output()
+    format(tokens, NullFormatter(encoding="utf-16"), out)
+    assert out.getvalue().decode("utf-16") == u"ä" * 1000
+    assert out.writes == 1
+
+    # it is written out in blocks when the buffer is full
+    out = Output()
+    output = BufferedOutput(out, "utf-8", bufsize=100)
+    for ttype, value in output.tokens(tokens, chunksize=10):
+        output.write(value)
+    assert out.writes == 10
+    output.drain()
+    assert out.getvalue() == u"ä".encode("utf-8") * 1000
+    assert out.writes == 10
+    assert output.name == 'out.txt'
+
+
 def test_formatter_unicode_handling():
     # test that the formatter supports encoding and Unicode
     tokens = list(lexers.PythonLexer(encoding='utf-8').
@@ -213,7 +267,7 @@ def test_formatter_unicode_handling():
             # some dependency or font not installed
             raise support.SkipTest(e)
 
-        if formatter.name != 'Raw tokens':
+        if formatter.name not in ('Raw tokens', 'Binary tokens'):
             out = format(tokens, inst)
             if formatter.unicodeoutput:
                 assert type(out) is text_type, '%s: %r' % (formatter, out)
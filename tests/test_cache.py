@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+    Pygments highlight cache tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2006-2017 by the Pygments team, see AUTHORS.
+    :license: BSD, see LICENSE for details.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pygments import highlight
+from pygments.cache import HighlightCache
+from pygments.lexers import PythonLexer
+from pygments.formatters import HtmlFormatter
+from pygments.style import Style
+from pygments.token import Keyword
+from pygments.util import BytesIO
+
+
+CODE = u'def f(x):\n    return "ä"\n'
+
+
+class HighlightCacheTest(unittest.TestCase):
+    def test_memory(self):
+        cache = HighlightCache()
+        expected = highlight(CODE, PythonLexer(), HtmlFormatter())
+        for _ in range(3):
+            self.assertEqual(
+                cache.highlight(CODE, PythonLexer(), HtmlFormatter()),
+                expected)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+        # different code, options, filters or style are cached separately
+        cache.highlight(CODE + u'\n', PythonLexer(), HtmlFormatter())
+        cache.highlight(CODE, PythonLexer(stripnl=False), HtmlFormatter())
+        lexer = PythonLexer()
+        lexer.add_filter('keywordcase')
+        cache.highlight(CODE, lexer, HtmlFormatter())
+        cache.highlight(CODE, PythonLexer(), HtmlFormatter(style='emacs'))
+        self.assertEqual((cache.hits, cache.misses), (2, 5))
+        self.assertEqual(cache.size, sum(map(len, cache._outputs.values())))
+
+    def test_eviction(self):
+        output = highlight(CODE, PythonLexer(), HtmlFormatter())
+        cache = HighlightCache(maxsize=2 * len(output) + 10)
+        codes = [CODE.replace(u'f', name) for name in u'fgh']
+        for code in codes + codes[-1:]:
+            cache.highlight(code, PythonLexer(), HtmlFormatter())
+        self.assertEqual(len(cache._outputs), 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+        cache.highlight(codes[0], PythonLexer(), HtmlFormatter())
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+        cache.clear()
+        self.assertEqual(cache.size, 0)
+
+    def test_directory(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            formatter = HtmlFormatter(encoding='utf-8')
+            expected = highlight(CODE, PythonLexer(), formatter)
+            HighlightCache(directory=tmpdir).highlight(
+                CODE, PythonLexer(), formatter)
+            cache = HighlightCache(directory=tmpdir)
+            outfile = BytesIO()
+            cache.highlight(CODE, PythonLexer(), formatter, outfile)
+            self.assertEqual(outfile.getvalue(), expected)
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_fingerprint(self):
+        def make_style(color):
+            class TestStyle(Style):
+                styles = {Keyword: color}
+            return TestStyle
+
+        # styles with the same name but other colors have other keys
+        cache = HighlightCache()
+        keys = [cache.get_key(CODE, PythonLexer(),
+                              HtmlFormatter(style=make_style(color)))
+                for color in ('#f00', '#00f')]
+        self.assertNotEqual(keys[0], keys[1])
+
+        # classes from modules without readable source aren't stored on disk
+        lexer_class = type('PythonLexer', (PythonLexer,),
+                           {'__module__': 'nonexistent'})
+        tmpdir = tempfile.mkdtemp()
+        try:
+            cache = HighlightCache(directory=tmpdir)
+            cache.highlight(CODE, lexer_class(), HtmlFormatter())
+            self.assertEqual(os.listdir(tmpdir), [])
+            cache.highlight(CODE, PythonLexer(), HtmlFormatter())
+            self.assertEqual(len(os.listdir(tmpdir)), 1)
+        finally:
+            shutil.rmtree(tmpdir)
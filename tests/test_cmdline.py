@@ -110,6 +110,25 @@ class CmdLineTest(unittest.TestCase):
             finally:
                 os.unlink(name)
 
+    def test_binarytokens(self):
+        from pygments.lexers import PythonLexer
+        from pygments.formatters import BinaryTokenFormatter, HtmlFormatter
+        # a long non-ASCII token that guessing would take for latin-1
+        code = u's = "%s"\n' % (u'\u20ac' * 300)
+        expected = highlight(code, PythonLexer(), HtmlFormatter())
+        tmpdir = tempfile.mkdtemp()
+        try:
+            infn = os.path.join(tmpdir, 'in.bin')
+            with open(infn, 'wb') as fp:
+                highlight(code, PythonLexer(), BinaryTokenFormatter(), fp)
+            outfn = os.path.join(tmpdir, 'out.html')
+            self.check_success('-lbinarytokens', '-fhtml', '-o', outfn, infn)
+            with io.open(outfn, encoding='utf-8') as fp:
+                self.assertEqual(fp.read(), expected)
+        finally:
+            import shutil
+            shutil.rmtree(tmpdir)
+
     def test_load_from_file(self):
         lexer_file = os.path.join(TESTDIR, 'support', 'python_lexer.py')
         formatter_file = os.path.join(TESTDIR, 'support', 'html_formatter.py')
@@ -283,6 +302,69 @@ class CmdLineTest(unittest.TestCase):
         e = self.check_failure('-F', 'foo', TESTFILE)
         self.assertTrue('Error: filter \'foo\' not found' in e)
 
+    def test_batch(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            pyfile = os.path.join(tmpdir, 'a.py')
+            with open(pyfile, 'w') as fp:
+                fp.write(TESTCODE)
+            manifest = os.path.join(tmpdir, 'manifest')
+            with open(manifest, 'w') as fp:
+                fp.write(pyfile + '\n\n' + TESTFILE + '\n')
+            outdir = os.path.join(tmpdir, 'out')
+            for jobs in ('1', '2'):
+                self.check_success('-b', '-j', jobs, '-fhtml', '-o', outdir,
+                                   '@' + manifest)
+                with open(os.path.join(outdir, 'a.py.html')) as fp:
+                    o = re.sub('<[^>]*>', '', fp.read())
+                self.assertEqual(o.rstrip(), TESTCODE.rstrip())
+                self.assertTrue(os.path.isfile(os.path.join(
+                    outdir, os.path.basename(TESTFILE) + '.html')))
+
+            # output file name template, formatter guessed from it
+            template = os.path.join(outdir, '%(base)s.tex')
+            self.check_success('-b', '-o', template, pyfile)
+            with open(os.path.join(outdir, 'a.tex')) as fp:
+                self.assertTrue('\\PY{k}{def}' in fp.read())
+
+            # failures don't stop the other files
+            e = self.check_failure('-b', '-fhtml', '-o', outdir,
+                                   'nonexistent.py', 'foo.unknownext', pyfile)
+            self.assertTrue('Error: nonexistent.py:' in e)
+            self.assertTrue('Error: foo.unknownext:' in e)
+            self.assertTrue('2 of 3 files' in e)
+            self.assertFalse(pyfile in e)
+
+            # two inputs for the same output file
+            subdir = os.path.join(tmpdir, 'sub')
+            os.mkdir(subdir)
+            otherfile = os.path.join(subdir, 'a.py')
+            with open(otherfile, 'w') as fp:
+                fp.write(TESTCODE)
+            e = self.check_failure('-b', '-fhtml', '-o', outdir, pyfile,
+                                   otherfile)
+            self.assertTrue('would both be written to' in e)
+            self.check_success('-b', '-fhtml', '-o', outdir, pyfile, pyfile)
+
+            # invalid templates
+            e = self.check_failure('-b', '-fhtml', '-o',
+                                   os.path.join(outdir, '%(nam)s.html'), pyfile)
+            self.assertTrue('unknown placeholder' in e)
+            for template in ('50%.html', '%(name)d.html'):
+                e = self.check_failure('-b', '-fhtml', '-o',
+                                       os.path.join(outdir, template), pyfile)
+                self.assertTrue('invalid output file name template' in e)
+
+            for opts in [('-b', pyfile),
+                         ('-b', '-o', outdir, pyfile),
+                         ('-b', '-j', '0', '-fhtml', '-o', outdir, pyfile),
+                         ('-b', '-s', '-fhtml', '-o', outdir, pyfile),
+                         ('-j', '2', pyfile)]:
+                self.check_failure(*opts, code=2)
+        finally:
+            import shutil
+            shutil.rmtree(tmpdir)
+
     def test_exception(self):
         cmdline.highlight = None  # override callable to provoke TypeError
         try:
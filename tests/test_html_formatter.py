@@ -200,3 +200,16 @@ class HtmlFormatterTest(unittest.TestCase):
         fmt.format(tokensource, outfile)
         html = outfile.getvalue()
         self.assertTrue(re.search("<span class=\"filename\">test.py</span><pre>", html))
+
+    def test_span_lookup(self):
+        from pygments.token import Token, Keyword, Name
+        for noclasses in (False, True):
+            fmt = HtmlFormatter(noclasses=noclasses, nowrap=True)
+            self.assertTrue(Keyword in fmt.ttype2span)
+            self.assertFalse(Name.Function.Unknown in fmt.ttype2span)
+            outfile = StringIO()
+            fmt.format([(Name.Function.Unknown, u'f'), (Token, u' ')], outfile)
+            span = fmt._get_css_span(Name.Function.Unknown)
+            self.assertEqual(fmt.ttype2span[Name.Function.Unknown], span)
+            self.assertEqual(outfile.getvalue(), span + 'f</span> \n')
+        self.assertEqual(span, fmt._get_css_span(Name.Function))
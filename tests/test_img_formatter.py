@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+    Pygments image formatter tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2006-2017 by the Pygments team, see AUTHORS.
+    :license: BSD, see LICENSE for details.
+"""
+
+import io
+import struct
+import unittest
+import zlib
+
+from pygments import highlight
+from pygments.formatters import img
+from pygments.lexers import PythonLexer
+
+import support
+
+
+FC_LIST_OUTPUT = b'''\
+/fonts/DejaVuSansMono.ttf\tDejaVu Sans Mono,DejaVu Sans Mono Book\tBook,Regular
+/fonts/DejaVuSansMono-Bold.ttf\tDejaVu Sans Mono\tBold
+/fonts/Other.ttf\tDejaVu Sans Mono\tBook
+/fonts/Escaped.ttf\tFoo\\, Inc\\-Mono\tRegular
+Fontconfig warning: ignoring UTF-8: not a valid region tag
+'''
+
+
+class FontIndexTest(unittest.TestCase):
+
+    def test_parse_fc_list(self):
+        index = img._parse_fc_list(FC_LIST_OUTPUT)
+        self.assertEqual(index['dejavusansmono', 'book'],
+                         '/fonts/DejaVuSansMono.ttf')
+        self.assertEqual(index['dejavusansmonobook', 'regular'],
+                         '/fonts/DejaVuSansMono.ttf')
+        self.assertEqual(index['dejavusansmono', 'bold'],
+                         '/fonts/DejaVuSansMono-Bold.ttf')
+        self.assertEqual(index['foo,inc-mono', 'regular'],
+                         '/fonts/Escaped.ttf')
+        self.assertEqual(len(index), 6)
+
+
+class PngWriterTest(unittest.TestCase):
+
+    def test_bands(self):
+        out = io.BytesIO()
+        writer = img._PngWriter(out, (3, 4))
+        rows = [bytearray(range(i, i + 9)) for i in range(0, 36, 9)]
+        writer.write(bytes(rows[0] + rows[1]))
+        writer.write(bytes(rows[2] + rows[3]))
+        writer.close()
+        data = out.getvalue()
+        self.assertEqual(data[:8], b'\x89PNG\r\n\x1a\n')
+        pos = 8
+        chunks = []
+        while pos < len(data):
+            length, = struct.unpack('>I', data[pos:pos + 4])
+            tag = data[pos + 4:pos + 8]
+            body = data[pos + 8:pos + 8 + length]
+            crc, = struct.unpack('>I', data[pos + 8 + length:pos + 12 + length])
+            self.assertEqual(crc, zlib.crc32(tag + body) & 0xffffffff)
+            chunks.append((tag, body))
+            pos += 12 + length
+        self.assertEqual(chunks[0], (b'IHDR', struct.pack('>IIBBBBB', 3, 4,
+                                                          8, 2, 0, 0, 0)))
+        self.assertEqual(chunks[-1], (b'IEND', b''))
+        pixels = zlib.decompress(b''.join(body for tag, body in chunks
+                                          if tag == b'IDAT'))
+        self.assertEqual(pixels, b''.join(b'\x00' + bytes(row)
+                                          for row in rows))
+
+
+class ImageFormatterTest(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            from PIL import Image
+            img.ImageFormatter()
+        except (ImportError, img.FontNotFound) as e:
+            raise support.SkipTest(e)
+        self.Image = Image
+
+    def pixels(self, data):
+        return self.Image.open(io.BytesIO(data)).convert('RGB').tobytes()
+
+    def test_bands(self):
+        code = 'def f(x):\n    """doc"""\n    return x + 1\n' * 40
+        lexer = PythonLexer()
+        formatter = img.ImageFormatter(hl_lines=[3, 50])
+        expected = self.pixels(highlight(
+            code, lexer, img.BmpImageFormatter(hl_lines=[3, 50])))
+        formatter.band_height = 7
+        self.assertEqual(self.pixels(highlight(code, lexer, formatter)),
+                         expected)
+        formatter = img.ImageFormatter(hl_lines=[3, 50], render_processes=2)
+        self.assertEqual(self.pixels(highlight(code, lexer, formatter)),
+                         expected)
+
+    def test_pool_fallback(self):
+        code = 'def f(x):\n    return x + 1\n' * 40
+        expected = highlight(code, PythonLexer(), img.ImageFormatter())
+
+        def no_pool(*args):
+            raise RuntimeError('cannot start processes')
+        saved = img.multiprocessing.Pool
+        img.multiprocessing.Pool = no_pool
+        try:
+            formatter = img.ImageFormatter(render_processes=2)
+            self.assertEqual(highlight(code, PythonLexer(), formatter),
+                             expected)
+        finally:
+            img.multiprocessing.Pool = saved
+
+    def test_style_font(self):
+        formatter = img.ImageFormatter()
+        style = {'bold': True, 'italic': False}
+        self.assertTrue(formatter._get_style_font(style) is
+                        formatter.fonts.get_font(True, False))
+        self.assertEqual(formatter._get_style_font_flags(style),
+                         (True, False))
+
+        # subclasses may still draw with font objects
+        class FontFormatter(img.ImageFormatter):
+            def _draw_linenumber(self, posno, lineno):
+                self._draw_text(self._get_linenumber_pos(posno),
+                                str(lineno).rjust(self.line_number_chars),
+                                font=self.fonts.get_font(False, False),
+                                fill=self.line_number_fg)
+
+        code = 'x = 1\n' * 3
+        self.assertEqual(self.pixels(highlight(code, PythonLexer(),
+                                               FontFormatter())),
+                         self.pixels(highlight(code, PythonLexer(),
+                                               img.ImageFormatter())))
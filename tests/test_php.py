@@ -34,3 +34,15 @@ class PhpTest(unittest.TestCase):
             (Token.Other, '\n'),
         ]
         self.assertEqual(tokens, list(self.lexer.get_tokens(fragment)))
+
+    def testSharedFunctions(self):
+        self.assertTrue(PhpLexer()._functions is self.lexer._functions)
+        self.assertTrue('mysql_query' in self.lexer._functions)
+        disabled = PhpLexer(disabledmodules=['MySQL'])._functions
+        self.assertTrue(disabled is not self.lexer._functions)
+        self.assertTrue('mysql_query' not in disabled)
+        self.assertTrue('strlen' in disabled)
+        self.assertTrue(
+            PhpLexer(disabledmodules=('MySQL',))._functions is disabled)
+        self.assertEqual(PhpLexer(funcnamehighlighting=False)._functions,
+                         frozenset())
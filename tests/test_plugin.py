@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+    Pygments plugin discovery tests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2006-2017 by the Pygments team, see AUTHORS.
+    :license: BSD, see LICENSE for details.
+"""
+
+import unittest
+
+from pygments import plugin
+from pygments.lexers import get_lexer_by_name
+from pygments.lexers.python import PythonLexer
+from pygments.util import ClassNotFound
+
+
+class FakeEntryPoint(object):
+    def __init__(self, name, obj):
+        self.name = name
+        self.obj = obj
+
+    def load(self):
+        return self.obj
+
+
+class PluginLexer(PythonLexer):
+    name = 'Plugin'
+    aliases = ['pluginlexer']
+
+
+class PluginCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.scans = []
+        self.entry_points = [FakeEntryPoint('plugin', PluginLexer)]
+        self.saved = plugin.iter_entry_points
+        plugin.iter_entry_points = self.iter_entry_points
+        plugin.clear_plugin_cache()
+
+    def tearDown(self):
+        plugin.iter_entry_points = self.saved
+        plugin.clear_plugin_cache()
+
+    def iter_entry_points(self, group_name):
+        self.scans.append(group_name)
+        if group_name == plugin.LEXER_ENTRY_POINT:
+            return list(self.entry_points)
+        return []
+
+    def test_cache(self):
+        for _ in range(3):
+            self.assertTrue(isinstance(get_lexer_by_name('pluginlexer'),
+                                       PluginLexer))
+            self.assertRaises(ClassNotFound, get_lexer_by_name, 'nolexer')
+        self.assertEqual(list(plugin.find_plugin_styles()), [])
+        self.assertEqual(self.scans, [plugin.LEXER_ENTRY_POINT,
+                                      plugin.STYLE_ENTRY_POINT])
+
+        # new plugins are only found after clearing the cache
+        self.entry_points = []
+        self.assertEqual(list(plugin.find_plugin_lexers()), [PluginLexer])
+        plugin.clear_plugin_cache()
+        self.assertEqual(list(plugin.find_plugin_lexers()), [])
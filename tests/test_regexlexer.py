@@ -7,12 +7,28 @@
     :license: BSD, see LICENSE for details.
 """
 
+import io
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import tempfile
+import time
 import unittest
 
-from pygments.token import Text
-from pygments.lexer import RegexLexer
+from pygments import lexer, __version__
+from pygments.token import Text, Name
+from pygments.lexer import RegexLexer, ExtendedRegexLexer
+from pygments.lexer import LexedText, LexedStream
 from pygments.lexer import bygroups
 from pygments.lexer import default
+from pygments.lexer import words
+from pygments.lexers import CLexer, PythonLexer, RubyLexer, Perl6Lexer
+from pygments.lexers import CssLexer, JavaLexer, JavascriptLexer
+from pygments.lexers.templates import HtmlPhpLexer, HtmlDjangoLexer
+from pygments.util import LexerTimeout
 
 
 class TestLexer(RegexLexer):
@@ -52,3 +68,329 @@ class TupleTransTest(unittest.TestCase):
         lx = TestLexer()
         toks = list(lx.get_tokens_unprocessed('d'))
         self.assertEqual(toks, [(0, Text.Beer, 'd')])
+
+
+class TestCombinedLexer(RegexLexer):
+    """Test rules that cannot be merged into one regex or dispatched."""
+    tokens = {
+        'root': [
+            (r'(["\'])(.*?)(\1)', Text.String),
+            (r'(x)(y)', bygroups(Text.X, Text.Y)),
+            (r'x', Text.X),
+            (r'(?i)z+', Text.Z),
+            (r'(?=\d)\w+|[^\s\w"\']', Text.Other),
+            (r'\s+', Text),
+            default('other'),
+        ],
+        'other': [
+            (r'[a-z]+', Text.Word, '#pop'),
+        ],
+    }
+
+
+class RuleMatchingTest(unittest.TestCase):
+    modes = ('combined', 'firstchar')
+    texts = ('abcde', 'a\ne', 'd', 'xy "x" \'y" xz ZzZ foo', '1a2 +-b')
+
+    def test_modes(self):
+        for lexer in (TestLexer, TestCombinedLexer):
+            for text in self.texts:
+                expected = list(lexer().get_tokens_unprocessed(text))
+                for mode in self.modes:
+                    self.assertEqual(
+                        list(lexer(rulematching=mode)
+                             .get_tokens_unprocessed(text)), expected)
+
+    def test_tokens(self):
+        for mode in self.modes:
+            lx = TestCombinedLexer(rulematching=mode)
+            toks = list(lx.get_tokens_unprocessed('"a\' b" xyx ZZ 1a'))
+            self.assertEqual(toks,
+               [(0, Text.String, '"a\' b"'), (6, Text, ' '),
+                (7, Text.X, 'x'), (8, Text.Y, 'y'), (9, Text.X, 'x'),
+                (10, Text, ' '), (11, Text.Z, 'ZZ'), (13, Text, ' '),
+                (14, Text.Other, '1a')])
+
+
+class LexedTextTest(unittest.TestCase):
+    def check_edits(self, lexer, text, edits):
+        lexed = LexedText(lexer, text)
+        for start, end, replacement in edits:
+            old = list(lexed.tokens)
+            first, last, tokens = lexed.update(start, end, replacement)
+            expected = [(t, v) for _, t, v in
+                        lexer.get_tokens_unprocessed(lexed.text)]
+            self.assertEqual(lexed.tokens, expected)
+            self.assertEqual(old[:first] + tokens + old[last:], expected)
+        return lexed
+
+    def test_regexlexer(self):
+        text = 'def f():\n    """doc"""\n    return 1\n' * 50
+        self.check_edits(PythonLexer(), text, [
+            (13, 16, ''), (13, 13, '"""'), (0, 3, 'class'),
+            (len(text) - 5, len(text) - 5, '"""'), (10, 40, ''),
+            (0, len(text), 'x = 1\n'), (0, 0, text)])
+
+    def test_changed_span(self):
+        text = 'x = 1\n' * 200
+        lexed = LexedText(PythonLexer(), text)
+        # each line has six tokens
+        self.assertEqual(lexed.update(306, 307, 'foo'),
+                         (306, 307, [(Name, 'foo')]))
+        # an unterminated string changes all following tokens...
+        first, last, tokens = lexed.update(602, 602, '"""')
+        self.assertEqual((first, last), (600, 1200))
+
+    def test_extendedregexlexer(self):
+        text = 'x = <<EOS\nfoo\nEOS\nputs "#{x}"\n' * 20
+        self.check_edits(RubyLexer(), text, [
+            (13, 13, 'o'), (18, 18, '\n'), (6, 9, 'EOT'), (4, 5, ''),
+            (len(text) - 2, len(text), '')])
+
+    def test_pos_past_end(self):
+        # the callback of the unterminated comment moves past the end
+        self.check_edits(Perl6Lexer(), u'#`{\n', [(0, 0, u'say 1;\n')])
+
+    def test_other_lexers(self):
+        text = 'int main() {\n  /* comment */\n  return 0;\n}\n'
+        self.check_edits(CLexer(), text, [(17, 17, ' '), (15, 17, '')])
+
+    def test_unterminated_comment(self):
+        # closing a comment started on an earlier line changes the tokens
+        # from where the comment starts
+        for lexer, text, after in [
+                (JavascriptLexer(),
+                 u'var a = 1; /* comment\nvar b = 2;\nvar c = 3;\n',
+                 u'var b = 2;'),
+                (CssLexer(),
+                 u'a { x: y; } /* x\nb { color: blue; }\nc { x: y; }\n',
+                 u'blue; }'),
+                (JavaLexer(),
+                 u'class A {\n  /* doc\n  int x;\n  int y;\n}\n',
+                 u'int x;')]:
+            pos = text.index(after) + len(after)
+            lexed = self.check_edits(lexer, text, [(pos, pos, u' */')])
+            self.check_edits(lexer, lexed.text, [(pos, pos + 3, u'')])
+
+    def test_greedy_match(self):
+        class GreedyLexer(RegexLexer):
+            flags = re.DOTALL
+            tokens = {
+                'root': [
+                    (r'".*"', Text.String),
+                    (r'[^"]+', Text),
+                ]
+            }
+        text = u'x = "a"\ny = 1\nz = 2\n'
+        self.check_edits(GreedyLexer(), text, [
+            (11, 11, u'"'), (11, 12, u''), (len(text), len(text), u'"')])
+
+
+class LexedStreamTest(unittest.TestCase):
+    def lex_lines(self, lexer, lines):
+        stream = LexedStream(lexer)
+        tokens = []
+        for line in lines:
+            tokens.extend(stream.feed(line))
+        return tokens + stream.close()
+
+    def check_lines(self, lexer, text):
+        expected = list(lexer.get_tokens(text))
+        tokens = self.lex_lines(lexer, text.splitlines(True))
+        self.assertEqual(''.join(v for _, v in tokens), text)
+        self.assertEqual(tokens, expected)
+
+    def test_state_across_lines(self):
+        self.check_lines(PythonLexer(),
+                         'x = """foo\n  bar\n"""\ny = \'\\\n\'\n' * 5)
+        self.check_lines(RubyLexer(), 'puts "a\n#{x +\n1}"\n')
+        # callbacks can look beyond the lines fed so far, and move past them
+        text = u'say 1;\n#`{\nfoo\n}\n'
+        tokens = self.lex_lines(Perl6Lexer(), text.splitlines(True))
+        self.assertEqual(u''.join(v for _, v in tokens), text)
+
+    def test_partial_lines(self):
+        lexer = PythonLexer(tabsize=4)
+        stream = LexedStream(lexer)
+        self.assertEqual(stream.feed('x ='), [])
+        self.assertEqual(stream.feed(' 1\r'), [])
+        tokens = stream.feed('\n\tz')
+        self.assertEqual(''.join(v for _, v in tokens), 'x = 1\n')
+        tokens = stream.close()
+        self.assertEqual(tokens, list(lexer.get_tokens('    z\n')))
+        self.assertEqual(stream.close(), [])
+
+    def test_other_lexers(self):
+        # lines fed together are lexed together
+        text = '<?php\n$x = 1;\n?>\n<b>x</b>\n'
+        self.assertEqual(self.lex_lines(HtmlPhpLexer(), [text]),
+                         list(HtmlPhpLexer().get_tokens(text)))
+
+
+class TokensFromFileTest(unittest.TestCase):
+    def check_file(self, lexer, data, chunksize=64):
+        expected = list(lexer.get_tokens(data))
+        infile = io.BytesIO(data) if isinstance(data, bytes) \
+            else io.StringIO(data)
+        tokens = list(lexer.get_tokens_from_file(infile, chunksize=chunksize))
+        self.assertEqual(tokens, expected)
+
+    def test_regexlexer(self):
+        data = b'def f():\r\n\t"""doc"""\r\n\treturn 1\r\n' * 50
+        self.check_file(PythonLexer(), data)
+        self.check_file(PythonLexer(tabsize=4), data, chunksize=17)
+        self.check_file(PythonLexer(), u'\ufeff\n\nx = "\xe9"\n' * 40)
+        self.check_file(PythonLexer(encoding='utf-8'),
+                        b'\xef\xbb\xbf' + u'# \xe9\n'.encode('utf-8') * 40,
+                        chunksize=7)
+
+    def test_stripping(self):
+        data = b'\n\n  x = 1  \n\n' + b'\n' * 200
+        for options in ({}, {'stripnl': False}, {'stripall': True},
+                        {'ensurenl': False}):
+            self.check_file(PythonLexer(**options), data)
+            self.check_file(PythonLexer(**options), b'')
+            self.check_file(PythonLexer(**options), b'\n' * 200)
+
+    def test_extendedregexlexer(self):
+        self.check_file(RubyLexer(),
+                        b'x = <<EOS\nfoo\nEOS\nputs "#{x}"\n' * 20)
+        self.check_file(Perl6Lexer(), u'say 1;\n#`{\n', chunksize=4)
+
+    def test_other_lexers(self):
+        self.check_file(HtmlPhpLexer(), b'<p><?php echo 1; ?></p>\n' * 20)
+
+
+class DelegatingLexerTest(unittest.TestCase):
+    def check_windows(self, lexer, text):
+        expected = list(lexer.get_tokens(text))
+        lexer._root_chunksize = 64
+        self.assertEqual(list(lexer.get_tokens(text)), expected)
+
+    def test_windows(self):
+        text = '<p>{{ a }}</p>\n<p>{% if b %}c{% endif %}</p>\n' * 50
+        self.check_windows(HtmlDjangoLexer(), text)
+        self.check_windows(HtmlDjangoLexer(), '{{ a }}' + text + '{{ b }}')
+        self.check_windows(HtmlPhpLexer(), '<?php echo 1; ?>' * 100)
+        self.check_windows(HtmlPhpLexer(), '<p>x</p>\n' * 100)
+
+
+def slow_callback(lexer, match, ctx=None):
+    time.sleep(0.02)
+    yield match.start(), Name, match.group()
+    if ctx:
+        ctx.pos = match.end()
+
+
+class SlowLexer(RegexLexer):
+    tokens = {
+        'root': [
+            (r'slow', slow_callback, 'after'),
+            (r'\w+', Name),
+            (r'\s+', Text),
+        ],
+        'after': [
+            (r'\s+', Text),
+            (r'\w+', Name, '#pop'),
+        ],
+    }
+
+
+class SlowExtendedLexer(ExtendedRegexLexer):
+    tokens = SlowLexer.tokens
+
+
+class TimeoutTest(unittest.TestCase):
+    text = u'fast slow next\nmore\n'
+
+    def test_text(self):
+        for cls in SlowLexer, SlowExtendedLexer:
+            lx = cls(timeout=0.01)
+            tokens = list(lx.get_tokens(self.text))
+            self.assertEqual(tokens, [(Name, 'fast'), (Text, ' '),
+                                      (Name, 'slow'), (Text, ' next\nmore\n')])
+            self.assertEqual(lx.last_timeout.pos, 9)
+            self.assertEqual(lx.last_timeout.state, ('root', 'after'))
+            self.assertEqual(lx.last_timeout.rule, 'slow')
+            list(lx.get_tokens('fast\n'))
+            self.assertEqual(lx.last_timeout, None)
+
+    def test_raise(self):
+        lx = SlowLexer(timeout=0.01, ontimeout='raise')
+        try:
+            list(lx.get_tokens(self.text))
+        except LexerTimeout as err:
+            self.assertEqual(err.pos, 9)
+            self.assertTrue(err is lx.last_timeout)
+        else:
+            self.fail('no LexerTimeout raised')
+
+    def test_no_timeout(self):
+        expected = list(SlowLexer().get_tokens(self.text))
+        self.assertEqual(list(SlowLexer(timeout=10).get_tokens(self.text)),
+                         expected)
+        self.assertEqual(len(expected), 8)
+
+    def test_from_file(self):
+        lx = SlowLexer(timeout=0.01)
+        text = u'fast\n' * 100 + self.text * 20
+        tokens = list(lx.get_tokens_from_file(io.StringIO(text), chunksize=32))
+        self.assertEqual(u''.join(v for t, v in tokens), text)
+        self.assertEqual(lx.last_timeout.pos, 509)
+
+
+class RegexCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        lexer.regex_cache_dir = os.path.join(self.tmpdir, 'cache')
+
+    def tearDown(self):
+        lexer.regex_cache_dir = None
+        shutil.rmtree(self.tmpdir)
+
+    def make_lexer(self, names):
+        class WordsLexer(RegexLexer):
+            tokens = {
+                'root': [
+                    (words(names, suffix=r'\b'), Name.Builtin),
+                    (r'\w+', Name),
+                    (r'\s+', Text),
+                ],
+            }
+        return WordsLexer()
+
+    def test_cache(self):
+        text = 'foo bar baz'
+        expected = list(self.make_lexer(('foo', 'bar')).get_tokens(text))
+        filenames = os.listdir(lexer.regex_cache_dir)
+        self.assertEqual(len(filenames), 1)
+        self.assertEqual(
+            list(self.make_lexer(('foo', 'bar')).get_tokens(text)), expected)
+        # a changed word list isn't taken from the cache
+        self.assertEqual(list(self.make_lexer(('baz',)).get_tokens(text)),
+                         [(Name, 'foo'), (Text, ' '), (Name, 'bar'),
+                          (Text, ' '), (Name.Builtin, 'baz'), (Text, '\n')])
+
+    def test_broken_cache(self):
+        os.mkdir(lexer.regex_cache_dir)
+        filename = os.path.join(lexer.regex_cache_dir,
+                                '%s.WordsLexer.json' % __name__)
+        with open(filename, 'w') as fp:
+            fp.write('{"version": ')
+        tokens = list(self.make_lexer(('foo',)).get_tokens('foo'))
+        self.assertEqual(tokens, [(Name.Builtin, 'foo'), (Text, '\n')])
+
+    def test_version(self):
+        os.mkdir(lexer.regex_cache_dir)
+        filename = os.path.join(lexer.regex_cache_dir,
+                                '%s.WordsLexer.json' % __name__)
+        key = hashlib.sha1(json.dumps([['foo'], '', r'\b']).encode('utf-8'))
+        for version, expected in [
+                (lexer._RegexSourceCache.version, Name),
+                # regexes generated by an older regex_opt aren't used
+                ('%s-%d' % (__version__, sys.version_info[0]), Name.Builtin)]:
+            with open(filename, 'w') as fp:
+                json.dump({'version': version,
+                           'sources': {key.hexdigest(): 'nomatch'}}, fp)
+            tokens = list(self.make_lexer(('foo',)).get_tokens('foo'))
+            self.assertEqual(tokens, [(expected, 'foo'), (Text, '\n')])
@@ -108,3 +108,21 @@ class RegexOptTestCase(unittest.TestCase):
         self.assertEqual(2, rex.groups)
         groups = rex.match('am').groups()
         self.assertEqual(('a', 'm'), groups)
+
+    def test_longest_first(self):
+        # longer strings are preferred, shorter ones are found by backtracking
+        rex = re.compile(regex_opt(('if', 'ifdef', 'ifndef')) + r'\b')
+        self.assertEqual(rex.match('ifdef x').group(), 'ifdef')
+        self.assertEqual(rex.match('if x').group(), 'if')
+        self.assertFalse(rex.match('ifd x'))
+
+    def test_charset_collapsing(self):
+        # branches with the same continuation share a charset
+        self.assertEqual(regex_opt(('abc', 'abd', 'xbc', 'xbd')), '([ax]b[cd])')
+        self.assertEqual(regex_opt(('', 'a')), '(a?)')
+        self.assertEqual(regex_opt(('-', ']', 'x')), r'([\-\]x])')
+
+    def test_memoized(self):
+        opt = regex_opt(['b', 'a', 'c'])
+        self.assertTrue(regex_opt(('a', 'b', 'c', 'a')) is opt)
+        self.assertFalse(regex_opt(('a', 'b', 'c'), suffix=r'\b') is opt)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+    Regex profiling tests
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2006-2017 by the Pygments team, see AUTHORS.
+    :license: BSD, see LICENSE for details.
+"""
+
+import json
+import unittest
+
+from pygments.lexer import RegexLexer, ExtendedRegexLexer, bygroups
+from pygments.lexers import PythonLexer
+from pygments.regexprofile import RegexProfile, get_profile
+from pygments.token import Name, Text, Punctuation
+from pygments.util import StringIO
+
+
+class ProfiledLexer(RegexLexer):
+    tokens = {
+        'root': [
+            (r'(\w+)(\()', bygroups(Name.Function, Punctuation), 'args'),
+            (r'\w+', Name),
+            (r'\s+', Text),
+        ],
+        'args': [
+            (r'\)', Punctuation, '#pop'),
+            (r'\w+', Name.Variable),
+        ],
+    }
+
+
+class ProfiledExtendedLexer(ExtendedRegexLexer):
+    tokens = ProfiledLexer.tokens
+
+
+NAME = '%s.ProfiledLexer' % __name__
+TEXT = 'foo bar(baz)\n'
+
+
+class RegexProfileTest(unittest.TestCase):
+
+    def test_statistics(self):
+        lx = ProfiledLexer()
+        expected = list(lx.get_tokens(TEXT))
+        profile = RegexProfile()
+        with profile.enabled(ProfiledLexer):
+            self.assertTrue(get_profile(ProfiledLexer) is profile)
+            self.assertEqual(list(lx.get_tokens(TEXT)), expected)
+        self.assertTrue(get_profile(ProfiledLexer) is None)
+        stats = profile.rules[NAME, 'root', r'(\w+)(\()']
+        self.assertEqual((stats.attempts, stats.hits), (5, 1))
+        self.assertTrue(stats.callback_time > 0)
+        stats = profile.rules[NAME, 'root', r'\w+']
+        self.assertEqual((stats.attempts, stats.hits), (4, 1))
+        self.assertEqual(stats.callback_time, 0)
+        stats = profile.rules[NAME, 'args', r'\)']
+        self.assertEqual((stats.attempts, stats.hits), (2, 1))
+        self.assertTrue(profile.total_time() > 0)
+
+        # the rules are restored afterwards
+        list(lx.get_tokens(TEXT))
+        self.assertEqual(stats.attempts, 2)
+
+    def test_extended(self):
+        profile = RegexProfile()
+        with profile.enabled(ProfiledExtendedLexer):
+            tokens = list(ProfiledExtendedLexer().get_tokens(TEXT))
+        self.assertEqual(tokens, list(ProfiledLexer().get_tokens(TEXT)))
+        stats = profile.rules['%s.ProfiledExtendedLexer' % __name__,
+                              'args', r'\w+']
+        self.assertEqual((stats.attempts, stats.hits), (1, 1))
+
+    def test_nesting(self):
+        profile = RegexProfile()
+        with profile.enabled(ProfiledLexer):
+            with profile.enabled(ProfiledLexer):
+                list(ProfiledLexer().get_tokens(TEXT))
+            list(ProfiledLexer().get_tokens(TEXT))
+            self.assertRaises(ValueError, RegexProfile().enable,
+                              ProfiledLexer)
+        self.assertEqual(profile.rules[NAME, 'args', r'\)'].hits, 2)
+        self.assertRaises(ValueError, profile.disable, ProfiledLexer)
+        self.assertRaises(TypeError, profile.enable, object)
+
+    def test_rulematching(self):
+        profile = RegexProfile()
+        expected = list(ProfiledLexer().get_tokens(TEXT))
+        for mode in ('combined', 'firstchar'):
+            ProfiledLexer(rulematching=mode)  # caches the rule selectors
+            with profile.enabled(ProfiledLexer):
+                lx = ProfiledLexer(rulematching=mode)
+                self.assertEqual(list(lx.get_tokens(TEXT)), expected)
+            rules = profile.to_dict()
+            self.assertTrue(profile.rules[NAME, 'args', r'\)'].hits)
+            # neither new instances nor the one created while profiling
+            # change the statistics afterwards
+            self.assertEqual(list(ProfiledLexer(rulematching=mode)
+                                  .get_tokens(TEXT)), expected)
+            self.assertEqual(list(lx.get_tokens(TEXT)), expected)
+            self.assertEqual(profile.to_dict(), rules)
+
+    def test_export(self):
+        profile = RegexProfile()
+        with profile.enabled(ProfiledLexer, PythonLexer):
+            list(ProfiledLexer().get_tokens(TEXT))
+            list(PythonLexer().get_tokens('def f(x):\n    return x\n'))
+        copy = RegexProfile.from_dict(json.loads(json.dumps(profile.to_dict())))
+        self.assertEqual(copy.to_dict(), profile.to_dict())
+        copy.merge(profile)
+        self.assertEqual(copy.rules[NAME, 'root', r'\w+'].attempts, 8)
+
+        out = StringIO()
+        profile.report(out, sort='attempts', limit=3)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 7)
+        self.assertTrue(lines[1].startswith('lexer'))
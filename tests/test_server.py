@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+    Highlight server tests
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2006-2017 by the Pygments team, see AUTHORS.
+    :license: BSD, see LICENSE for details.
+"""
+
+import os
+import re
+import json
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+import unittest
+
+from pygments import highlight
+from pygments.lexers import PythonLexer
+from pygments.formatters import HtmlFormatter
+from pygments.server import HighlightServer, HighlightClient, ServerError, \
+    parse_address, _read_frame
+from pygments.util import BytesIO
+
+from test_cmdline import run_cmdline
+
+TESTCODE = b'''\
+def func(args):
+    pass
+'''
+
+
+class ServerTest(unittest.TestCase):
+
+    def start_server(self, address):
+        server = HighlightServer(address)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def start_tcp_server(self):
+        server = self.start_server('127.0.0.1:0')
+        return '127.0.0.1:%d' % server.server_address[1]
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address('localhost:8080'),
+                         (socket.AF_INET, ('localhost', 8080)))
+        self.assertEqual(parse_address(':8080'),
+                         (socket.AF_INET, ('localhost', 8080)))
+        if hasattr(socket, 'AF_UNIX'):
+            path = os.path.join('some', 'dir:1')
+            self.assertEqual(parse_address(path), (socket.AF_UNIX, path))
+
+    def test_client(self):
+        address = self.start_tcp_server()
+        expected = highlight(TESTCODE.decode('utf-8'), PythonLexer(),
+                             HtmlFormatter(encoding='utf-8'))
+        with HighlightClient(address) as client:
+            for i in range(3):
+                self.assertEqual(
+                    client.highlight(TESTCODE, lexer='python',
+                                     formatter='html'), expected)
+            self.assertEqual(
+                client.highlight(TESTCODE, filename='test.py',
+                                 outfilename='test.html'), expected)
+            output = client.highlight(TESTCODE, lexer='python',
+                                      formatter='html',
+                                      options={'linenos': 'table'})
+            self.assertTrue('linenos' in output.decode('utf-8'))
+            self.assertRaises(ServerError, client.highlight, TESTCODE,
+                              lexer='nonexistent', formatter='html')
+            self.assertRaises(ServerError, client.highlight, TESTCODE,
+                              filename='test.unknownext', formatter='html')
+            # the connection is still usable after errors
+            self.assertEqual(
+                client.highlight(TESTCODE, lexer='python', formatter='html'),
+                expected)
+            # output larger than one frame
+            self.assertEqual(len(client.highlight(b'x' * 200000, lexer='text',
+                                                  formatter='text')), 200001)
+
+    def test_file_options(self):
+        address = self.start_tcp_server()
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        cssfile = os.path.join(tmpdir, 'style.css')
+        with HighlightClient(address) as client:
+            for name in ('cssfile', 'tagsfile'):
+                self.assertRaises(ServerError, client.highlight, TESTCODE,
+                                  lexer='python', formatter='html',
+                                  options={'full': True, name: cssfile})
+            self.assertFalse(os.path.exists(cssfile))
+            self.assertTrue(client.highlight(TESTCODE, lexer='python',
+                                             formatter='html',
+                                             options={'full': True}))
+
+    def test_max_frame_size(self):
+        server = self.start_server('127.0.0.1:0')
+        server.max_frame_size = 1000
+        address = '127.0.0.1:%d' % server.server_address[1]
+        with HighlightClient(address) as client:
+            self.assertEqual(client.highlight(b'x' * 1000, lexer='text',
+                                              formatter='text'),
+                             b'x' * 1000 + b'\n')
+            try:
+                client.highlight(b'x' * 1001, lexer='text', formatter='text')
+            except ServerError as err:
+                self.assertTrue('exceeds the maximum size' in str(err))
+            else:
+                self.fail('ServerError not raised')
+        # only the header of a huge frame is read
+        with HighlightClient(address) as client:
+            client.wfile.write(struct.pack('>I', 0xffffffff))
+            client.wfile.flush()
+            response = json.loads(_read_frame(client.rfile).decode('utf-8'))
+            self.assertTrue('exceeds the maximum size' in response['error'])
+            self.assertEqual(_read_frame(client.rfile), b'')
+            self.assertEqual(_read_frame(client.rfile), None)
+
+    def test_connection_closed(self):
+        address = self.start_tcp_server()
+        response = json.dumps({'error': None}).encode('utf-8')
+        for data in (b'', struct.pack('>I', len(response)) + response):
+            with HighlightClient(address) as client:
+                client.rfile.close()
+                # the server closed the connection before the end of the
+                # response
+                client.rfile = BytesIO(data)
+                self.assertRaises(EOFError, client.highlight, TESTCODE,
+                                  lexer='text', formatter='text')
+
+    @unittest.skipIf(not hasattr(socket, 'AF_UNIX'), 'no Unix sockets')
+    def test_unix_socket(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        address = os.path.join(tmpdir, 'socket')
+        self.start_server(address)
+        with HighlightClient(address) as client:
+            self.assertEqual(client.highlight(TESTCODE, lexer='text',
+                                              formatter='text'), TESTCODE)
+
+    def test_cmdline(self):
+        address = self.start_tcp_server()
+        code, out, err = run_cmdline('--connect', address, '-lpython',
+                                     '-fhtml', stdin=TESTCODE.decode('utf-8'))
+        self.assertEqual((code, err), (0, ''))
+        self.assertEqual(re.sub('<[^>]*>', '', out).rstrip(),
+                         TESTCODE.decode('utf-8').rstrip())
+
+        code, out, err = run_cmdline('--connect', address, '-lfooo',
+                                     stdin='x')
+        self.assertEqual(code, 1)
+        self.assertTrue('Error: no lexer for alias' in err)
+
+        code, out, err = run_cmdline('--connect', address, '-s', stdin='x')
+        self.assertEqual(code, 2)
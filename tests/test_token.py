@@ -52,3 +52,53 @@ class TokenTest(unittest.TestCase):
         t = token.String
         self.assertIs(t, copy.copy(t))
         self.assertIs(t, copy.deepcopy(t))
+
+    def test_ids(self):
+        t = token.Name.Some.New.Type
+        self.assertIs(token.id_to_tokentype(t.id), t)
+        self.assertIs(token.id_to_tokentype(token.Token.id), token.Token)
+        self.assertNotEqual(t.id, t.parent.id)
+
+
+class TokenBufferTest(unittest.TestCase):
+
+    def test_buffer(self):
+        from pygments.lexers import PythonLexer
+        text = u'def f(x):\n    return x  # \xe4\n'
+        lexer = PythonLexer()
+        tokens = lexer.get_token_buffer(text)
+        self.assertEqual(list(tokens), list(lexer.get_tokens(text)))
+        self.assertEqual(list(tokens.iter_unprocessed()),
+                         list(lexer.get_tokens_unprocessed(text)))
+        self.assertEqual(tokens.text, text)
+        self.assertEqual(len(tokens), len(tokens.ids))
+        self.assertEqual(tokens[0], (token.Keyword, u'def'))
+
+        # filters can change the values
+        lexer.add_filter('keywordcase', case='upper')
+        tokens = lexer.get_token_buffer(text)
+        self.assertEqual(list(tokens), list(lexer.get_tokens(text)))
+        self.assertEqual(tokens.text, text + u'DEFRETURN')
+
+    def test_append(self):
+        tokens = token.TokenBuffer(u'ab')
+        tokens.append(token.Name, u'a', 0)
+        tokens.append(token.Text, u'c', 1)
+        tokens.append(token.Name, u'd')
+        tokens.append(token.Text, u'b', 1)
+        self.assertEqual(tokens[2], (token.Name, u'd'))
+        self.assertEqual(list(tokens), [(token.Name, u'a'), (token.Text, u'c'),
+                                        (token.Name, u'd'), (token.Text, u'b')])
+        self.assertEqual(list(tokens.starts), [0, 2, 3, 1])
+
+    def test_slice(self):
+        tokens = token.TokenBuffer(u'ab')
+        tokens.append(token.Name, u'a', 0)
+        tokens.append(token.Text, u'b', 1)
+        tokens.append(token.Name, u'c')
+        self.assertEqual(tokens[1:3], [(token.Text, u'b'), (token.Name, u'c')])
+        self.assertEqual(tokens[::-2], [(token.Name, u'c'), (token.Name, u'a')])
+        self.assertEqual(tokens[5:], [])
+        self.assertEqual(tokens[-1], (token.Name, u'c'))
+        self.assertRaises(TypeError, tokens.__getitem__, 'a')
+        self.assertRaises(IndexError, tokens.__getitem__, 3)
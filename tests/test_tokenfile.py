@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+    Binary token file tests
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2006-2017 by the Pygments team, see AUTHORS.
+    :license: BSD, see LICENSE for details.
+"""
+
+import io
+import os
+import tempfile
+import unittest
+
+from pygments import highlight, lex
+from pygments.formatters import BinaryTokenFormatter
+from pygments.lexers import PythonLexer, BinaryTokenLexer
+from pygments.token import Name, Text
+from pygments.tokenfile import TokenFileWriter, iter_token_file
+
+
+CODE = u'def f(x):\n    return u"\xe4€" * x  # \U0001d11e\n'
+
+
+class BinaryTokenTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tokens = list(PythonLexer().get_tokens(CODE))
+
+    def test_roundtrip(self):
+        data = highlight(CODE, PythonLexer(), BinaryTokenFormatter())
+        self.assertTrue(isinstance(data, bytes))
+        self.assertEqual(list(BinaryTokenLexer().get_tokens(data)),
+                         self.tokens)
+
+    def test_small_buffer(self):
+        out = io.BytesIO()
+        writer = TokenFileWriter(out, bufsize=1)
+        for ttype, value in self.tokens:
+            writer.write(ttype, value)
+        writer.close()
+        self.assertEqual(list(iter_token_file(out.getvalue())), self.tokens)
+
+    def test_empty(self):
+        out = io.BytesIO()
+        TokenFileWriter(out).close()
+        self.assertEqual(list(iter_token_file(out.getvalue())), [])
+
+    def test_from_file(self):
+        fd, filename = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                highlight(CODE, PythonLexer(), BinaryTokenFormatter(), fp)
+            with io.open(filename, 'rb') as fp:
+                self.assertEqual(list(lex(fp, BinaryTokenLexer())),
+                                 self.tokens)
+        finally:
+            os.remove(filename)
+
+    def test_filters(self):
+        data = highlight(CODE, PythonLexer(), BinaryTokenFormatter())
+        lexer = BinaryTokenLexer()
+        lexer.add_filter('highlight', names=['x'])
+        tokens = list(lexer.get_tokens(data))
+        self.assertTrue((Name.Function, u'x') in tokens)
+        self.assertEqual(list(lexer.get_tokens(data, unfiltered=True)),
+                         self.tokens)
+
+    def test_malformed(self):
+        data = highlight(CODE, PythonLexer(), BinaryTokenFormatter())
+        lexer = BinaryTokenLexer()
+        for bad in (b'', b'def f(x): pass\n', data[:-1], data[:-9] + data[-8:],
+                    data[:7] + b'\xff' * 8):
+            self.assertRaises(ValueError, list, lexer.get_tokens(bad))
+
+    def test_text_formatter_output(self):
+        # tokens not from a lexer, with a type never seen before
+        tokens = [(Text, u'a'), (Name.Foo.Bar, u''), (Text, u'b')]
+        out = io.BytesIO()
+        BinaryTokenFormatter().format(tokens, out)
+        self.assertEqual(list(iter_token_file(out.getvalue())), tokens)
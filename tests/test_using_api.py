@@ -10,7 +10,7 @@
 import unittest
 
 from pygments.lexer import using, bygroups, this, RegexLexer
-from pygments.token import String, Text, Keyword
+from pygments.token import String, Text, Keyword, Punctuation
 
 class TestLexer(RegexLexer):
     tokens = {
@@ -27,6 +27,31 @@ class TestLexer(RegexLexer):
     }
 
 
+class CountingLexer(RegexLexer):
+    instances = []
+
+    tokens = {
+        'root': [
+            (r'(\()(.*)(\))',
+             bygroups(Punctuation, using(this, nested=True), Punctuation)),
+            (r'[^()]+', Keyword),
+        ],
+    }
+
+    def __init__(self, **options):
+        RegexLexer.__init__(self, **options)
+        self.instances.append(self)
+
+
+class PoolTestLexer(RegexLexer):
+    tokens = {
+        'root': [
+            (r'"[^"]*"', using(CountingLexer)),
+            (r'\s+', Text),
+        ],
+    }
+
+
 class UsingStateTest(unittest.TestCase):
     def test_basic(self):
         expected = [(Text, 'a'), (String, '"'), (Keyword, 'bcd'),
@@ -38,3 +63,26 @@ class UsingStateTest(unittest.TestCase):
         def gen():
             return list(TestLexer().get_tokens('#a'))
         self.assertRaises(KeyError, gen)
+
+
+class UsingPoolTest(unittest.TestCase):
+    def setUp(self):
+        del CountingLexer.instances[:]
+
+    def test_reuse(self):
+        lx = PoolTestLexer()
+        expected = [(Keyword, '"a"'), (Text, ' '), (Keyword, '"b"'),
+                    (Text, '\n')]
+        self.assertEqual(list(lx.get_tokens('"a" "b"')), expected)
+        self.assertEqual(list(PoolTestLexer().get_tokens('"a" "b"')),
+                         expected)
+        self.assertEqual(len(CountingLexer.instances), 1)
+
+    def test_nested(self):
+        tokens = list(CountingLexer().get_tokens('a(b(c(d)))'))
+        self.assertEqual(''.join(value for _, value in tokens), 'a(b(c(d)))\n')
+        # every level of nesting needs its own instance
+        self.assertEqual(len(CountingLexer.instances), 4)
+        del CountingLexer.instances[:]
+        list(CountingLexer().get_tokens('(x(y))'))
+        self.assertEqual(len(CountingLexer.instances), 1)
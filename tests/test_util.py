@@ -7,7 +7,10 @@
     :license: BSD, see LICENSE for details.
 """
 
+import os
 import re
+import shutil
+import tempfile
 import unittest
 
 from pygments import util, console
@@ -195,6 +198,21 @@ class UtilTest(unittest.TestCase):
 
         self.assertEqual(type(Cls), Meta)
 
+    def test_replace_file(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            src = os.path.join(tmpdir, 'src')
+            dst = os.path.join(tmpdir, 'dst')
+            for data in ('old', 'new'):
+                with open(src, 'w') as fp:
+                    fp.write(data)
+                util.replace_file(src, dst)
+                self.assertFalse(os.path.exists(src))
+                with open(dst) as fp:
+                    self.assertEqual(fp.read(), data)
+        finally:
+            shutil.rmtree(tmpdir)
+
 
 class ConsoleTest(unittest.TestCase):
 